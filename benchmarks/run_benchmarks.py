@@ -0,0 +1,174 @@
+"""
+Benchmarks of the wind resource pipeline on synthetic ERA5-like data.
+
+Every stage (nc_reader, wind_speed_df, nc_sorter, interpolation,
+compute_power_law, fit_weibull, compute_aep) is timed at several scales and
+its peak traced memory is recorded. Results are written to a JSON file so
+runs of different versions can be compared with compare().
+
+    python benchmarks/run_benchmarks.py --scales small medium --output outputs/bench.json
+    python benchmarks/run_benchmarks.py --compare old.json new.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import src.__init__ as init
+from synthetic import write_era5, write_power_curve
+
+# (hourly steps, latitudes, longitudes, files)
+SCALES = {
+    "tiny": (24 * 30, 2, 2, 2),
+    "small": (8760, 2, 2, 2),
+    "medium": (8760 * 4, 2, 2, 4),
+    "large": (8760 * 12, 2, 2, 4),
+    "wide": (8760, 8, 8, 2),
+}
+
+
+def measure(func, *args, repeat=3):
+    """
+    Run func(*args) `repeat` times and once more under tracemalloc.
+    Returns (result, best wall time [s], peak traced memory [bytes]).
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, min(times), peak
+
+
+def run_scale(name, data_dir, height=90, repeat=3):
+    """
+    Benchmark every pipeline stage at one scale. Returns a list of records.
+    """
+    n_times, n_lat, n_lon, n_files = SCALES[name]
+    paths = write_era5(os.path.join(data_dir, name), n_times, n_lat, n_lon, n_files)
+    curve = write_power_curve(os.path.join(data_dir, "power_curve.csv"))
+    curve_data = np.loadtxt(curve, delimiter=",", skiprows=1)[:, :2]
+    turbine = init.WindTurbine(126, height, 5000, 3.0, 11.4, 25.0, curve_data)
+
+    # the site in the middle of the grid
+    lat = 8.0 - 0.25 * (n_lat - 1) / 2
+    lon = 55.5 + 0.25 * (n_lon - 1) / 2
+
+    stages = []
+    df2, *timing = measure(init.nc_reader, paths, repeat=repeat)
+    stages.append(("nc_reader", timing, len(df2)))
+    df, *timing = measure(lambda d: init.wind_speed_df(d.copy()), df2, repeat=repeat)
+    stages.append(("wind_speed_df", timing, len(df)))
+    tables, *timing = measure(init.nc_sorter, df, repeat=repeat)
+    stages.append(("nc_sorter", timing, len(df)))
+    table, *timing = measure(init.interpolation, lat, lon, tables, repeat=repeat)
+    stages.append(("interpolation", timing, len(table)))
+    height_speed, *timing = measure(init.compute_power_law, table, height, repeat=repeat)
+    stages.append(("compute_power_law", timing, len(height_speed)))
+    speeds = height_speed[f"wind_speed_at_{height}[m/s]"].to_numpy()
+    (k, a), *timing = measure(init.fit_weibull, speeds, repeat=repeat)
+    stages.append(("fit_weibull", timing, speeds.size))
+    _, *timing = measure(init.compute_aep, turbine, k, a, 3.0, 25.0, repeat=repeat)
+    stages.append(("compute_aep", timing, 1))
+
+    return [{"scale": name, "stage": stage, "time [s]": seconds,
+             "peak memory [MB]": peak / 2**20, "rows": rows,
+             "shape": [n_times, n_lat, n_lon], "files": n_files}
+            for stage, (seconds, peak), rows in stages]
+
+
+def environment():
+    """
+    Versions and machine the results were measured with.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    import pandas
+    import xarray
+    return {"commit": commit, "python": platform.python_version(),
+            "numpy": np.__version__, "pandas": pandas.__version__,
+            "xarray": xarray.__version__, "machine": platform.machine(),
+            "processor": platform.processor(), "cpus": os.cpu_count(),
+            "date": datetime.datetime.now().isoformat(timespec="seconds")}
+
+
+def run(scales, output=None, repeat=3, data_dir=None):
+    """
+    Benchmark the given scales and write the results to `output` (JSON).
+    Returns the results dict.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {"environment": environment(), "repeat": repeat, "results": []}
+        for name in scales:
+            results["results"] += run_scale(name, data_dir or tmp, repeat=repeat)
+
+    if output:
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return results
+
+
+def compare(old, new):
+    """
+    Ratio new / old of time and peak memory for every (scale, stage) found
+    in both result files. Below 1 is an improvement.
+    """
+    with open(old, encoding="utf-8") as f:
+        before = {(r["scale"], r["stage"]): r for r in json.load(f)["results"]}
+    with open(new, encoding="utf-8") as f:
+        after = {(r["scale"], r["stage"]): r for r in json.load(f)["results"]}
+    rows = []
+    for key in before.keys() & after.keys():
+        rows.append({"scale": key[0], "stage": key[1],
+                     "time ratio": after[key]["time [s]"] / before[key]["time [s]"],
+                     "memory ratio": (after[key]["peak memory [MB]"]
+                                      / max(before[key]["peak memory [MB]"], 1e-9))})
+    return sorted(rows, key=lambda r: (r["scale"], r["stage"]))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", nargs="+", default=["tiny", "small", "medium"],
+                        choices=list(SCALES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", default="outputs/benchmarks.json")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        for row in compare(*args.compare):
+            print(f"{row['scale']:>8} {row['stage']:>18}  time x{row['time ratio']:.2f}"
+                  f"  memory x{row['memory ratio']:.2f}")
+        return
+
+    results = run(args.scales, args.output, args.repeat)
+    for row in results["results"]:
+        print(f"{row['scale']:>8} {row['stage']:>18} {row['time [s]'] * 1e3:10.2f} ms"
+              f" {row['peak memory [MB]']:10.2f} MB")
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
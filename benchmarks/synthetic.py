@@ -0,0 +1,76 @@
+"""
+Synthetic ERA5-like inputs for the benchmarks.
+
+write_era5 writes NetCDF files laid out like the files in inputs/
+(u10, v10, u100, v100 on valid_time x latitude x longitude, float32,
+latitude descending), and write_power_curve a power-curve CSV with the
+columns of the NREL reference files.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+
+def era5_dataset(n_times, n_lat=2, n_lon=2, start="2000-01-01", seed=0,
+                 lat0=8.0, lon0=55.5, step=0.25):
+    """
+    ERA5-like Dataset with n_times hourly steps on an n_lat x n_lon grid.
+    Speeds are Weibull distributed (mean about 8 m/s at 100 m) with a daily
+    cycle; directions have a prevailing westerly component.
+    """
+    rng = np.random.default_rng(seed)
+    shape = (n_times, n_lat, n_lon)
+    hours = np.arange(n_times)[:, None, None]
+
+    speed_100 = 9.0 * rng.weibull(2.1, shape) * (1 + 0.1 * np.sin(2 * np.pi * hours / 24))
+    speed_10 = speed_100 * rng.uniform(0.7, 0.9, shape)
+    direction = np.deg2rad(rng.normal(260, 60, shape))
+    veer = np.deg2rad(rng.normal(5, 3, shape))
+
+    data = {}
+    for name, speed, angle in (("10", speed_10, direction - veer), ("100", speed_100, direction)):
+        # meteorological convention: the direction the wind comes from
+        data["u" + name] = (("valid_time", "latitude", "longitude"),
+                            (-speed * np.sin(angle)).astype(np.float32))
+        data["v" + name] = (("valid_time", "latitude", "longitude"),
+                            (-speed * np.cos(angle)).astype(np.float32))
+
+    coords = {"valid_time": pd.date_range(start, periods=n_times, freq="h"),
+              "latitude": lat0 - step * np.arange(n_lat),
+              "longitude": lon0 + step * np.arange(n_lon)}
+    return xr.Dataset(data, coords=coords)
+
+
+def write_era5(out_dir, n_times, n_lat=2, n_lon=2, n_files=1, seed=0):
+    """
+    Write n_times hourly steps split over n_files consecutive NetCDF files.
+    Returns the list of file paths.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    ds = era5_dataset(n_times, n_lat, n_lon, seed=seed)
+    paths = []
+    for n, part in enumerate(np.array_split(np.arange(n_times), n_files)):
+        path = os.path.join(out_dir, f"era5_{n_times}x{n_lat}x{n_lon}_{n}.nc")
+        ds.isel(valid_time=part).to_netcdf(path)
+        paths.append(path)
+    return paths
+
+
+def write_power_curve(path, rated_power=5000.0, v_in=3.0, v_rated=11.4, v_out=25.0,
+                      rotor_diameter=126.0, step=0.5):
+    """
+    Write a power-curve CSV with the columns of the NREL reference files.
+    Returns the path.
+    """
+    speeds = np.arange(v_in, v_out + step / 2, step)
+    power = rated_power * np.minimum((speeds - v_in) / (v_rated - v_in), 1.0) ** 3
+    area = np.pi * rotor_diameter**2 / 4
+    cp = power * 1e3 / (0.5 * 1.225 * area * speeds**3)
+    ct = np.where(speeds < v_rated, 0.8, 0.8 * (v_rated / speeds) ** 2)
+    thrust = ct * 0.5 * 1.225 * area * speeds**2 / 1e3
+    pd.DataFrame({"Wind Speed [m/s]": speeds, "Power [kW]": power, "Cp [-]": cp,
+                  "Thrust [kN]": thrust, "Ct [-]": ct}).to_csv(path, index=False)
+    return path
@@ -5,12 +5,14 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import src.__init__ as init
-from windrose import WindroseAxes
 from scipy.integrate import quad
 
 # Create outputs/ folder if it doesn't exist
 os.makedirs("outputs", exist_ok=True)
 
+# Record time, CPU and memory of every pipeline stage (report written at the end)
+profiler = init.StageProfiler().start()
+
 # Defining data file paths
 # this makes path in [0] the MW5 and [1] the MW8
 MW5 = "inputs/NREL_Reference_5MW_126.csv"
@@ -45,13 +47,10 @@ init.plot_power_curve(wind_speeds, rotor_diameter, hub_height, rated_power, v_in
 # Defining the file paths for the wind data
 file_path = ["inputs/1997-1999.nc", "inputs/2000-2002.nc", "inputs/2003-2005.nc", "inputs/2006-2008.nc"]
 
-df2 = init.nc_reader(file_path)
-
-df = init.wind_speed_df(df2)
-
-tables = init.nc_sorter(df)
+# Wind speed and direction on the ERA5 grid; cached in outputs/cache after the first run
+grid = init.load_wind_grid(file_path, cache_dir="outputs/cache")
 
-interpolated_table = init.interpolation(7.93, 55.65, tables)
+interpolated_table = init.interpolation(7.93, 55.65, grid)
 print(interpolated_table)
 
 # Give the height to be computed
@@ -59,6 +58,9 @@ height = 90
 height_speed = init.compute_power_law(interpolated_table, height) 
 print(height_speed)
 
+# Memory held by the result of each stage
+print(init.memory_report(wind_grid=grid, interpolation=interpolated_table, power_law=height_speed))
+
 col_name = f"wind_speed_at_{height}[m/s]"
 
 # Weibull
@@ -85,12 +87,54 @@ aep = init.compute_aep(chosen_turbine, k, A, chosen_turbine.v_in, chosen_turbine
 
 print(f"AEP for {chosen_turbine.name} at {height} m = {aep/1e6:.2f} MWh/year")
 
+# AEP directly from the hourly series, without the Weibull fit
+summary, yearly, monthly = init.timeseries_aep(chosen_turbine, height_speed["valid_time"], height_speed[col_name])
+print(summary)
+print(yearly)
+
+# Diurnal x monthly profiles, rolling 12-month AEP and year-over-year statistics
+profiles = init.TemporalStatistics.from_series(height_speed["valid_time"], height_speed[col_name], chosen_turbine)
+diurnal_energy = pd.DataFrame(profiles.diurnal_monthly("energy"), index=pd.Index(range(1, 13), name="month"))
+print(diurnal_energy.round(0))
+print(profiles.yearly())
+print(profiles.rolling_aep().describe())
+
+# AEP uncertainty: P50/P75/P90 from 5000 block-bootstrap resamples of whole years
+p_values, _ = init.bootstrap_aep(chosen_turbine, height_speed["valid_time"], height_speed[col_name], n_resamples=5000, seed=0)
+print(p_values)
+
+# Sector-wise Weibull and AEP (12 direction sectors)
+freq, k_sec, A_sec = init.sector_weibull(height_speed[col_name], height_speed[f"direction_at_{height}[degrees]"])
+aep_sectors = init.sector_aep(chosen_turbine, freq, k_sec, A_sec)
+print(f"Sector-wise AEP for {chosen_turbine.name} at {height} m = {aep_sectors/1e6:.2f} GWh/year")
+
+# Multi-site screening: Weibull and AEP for a grid of candidate sites in one call
+site_lats, site_lons = np.meshgrid(np.linspace(7.8, 7.95, 4), np.linspace(55.55, 55.7, 4))
+sites = np.column_stack((site_lats.ravel(), site_lons.ravel()))
+site_map = init.assess_sites(grid, sites, [90, 120], [chosen_turbine])
+print(site_map)
+
+# Wind farm: 4 x 4 layout with 7 rotor diameters spacing, Jensen wake model with the Ct curve
+spacing = 7 * rotor_diameter
+farm_x, farm_y = np.meshgrid(np.arange(4) * spacing, np.arange(4) * spacing)
+thrust_curve = init.read_thrust_curve(MW5)
+farm = init.WindFarm(farm_x.ravel(), farm_y.ravel(), chosen_turbine, thrust_curve)
+farm_summary, farm_turbines = farm.aep(height_speed[col_name], height_speed[f"direction_at_{height}[degrees]"])
+print(farm_summary)
 
 # Save in the outputs folder the results
 # Save the interpolated data and height-adjusted speeds
-interpolated_table.to_csv("outputs/interpolated_data.csv", index=False)
-height_speed.to_csv(f"outputs/wind_data_{height}m.csv", index=False)
+# (compressed NetCDF with the site and height as metadata; reload with init.read_table)
+init.write_table("outputs/interpolated_data.nc", interpolated_table, latitude=7.93, longitude=55.65)
+init.write_table(f"outputs/wind_data_{height}m.nc", height_speed, latitude=7.93, longitude=55.65, height=height)
+init.write_table("outputs/site_aep_map.nc", site_map, turbine=chosen_turbine.name)
+init.write_table("outputs/farm_aep.nc", farm_turbines, turbine=chosen_turbine.name, height=height)
 
 # Save AEP result to a text file
 with open("outputs/aep_result.txt", "w") as f:
     f.write(f"AEP for {chosen_turbine.name} at {height} m = {aep/1e6:.2f} MWh/year\n")
+
+# Stage profile of this run
+profiler.stop()
+print(profiler.summary())
+profiler.to_json("outputs/profile.json")
@@ -3,40 +3,169 @@ This module provides functions to read NetCDF files,
 process wind data, and perform various analyses related to wind energy.
 """
 
+import sys
+
 import numpy as np
 import pandas as pd
-import xarray as xr
-import matplotlib.pyplot as plt
-from scipy.stats import weibull_min
-from scipy.integrate import quad
-from windrose import WindroseAxes
-
 
-def nc_reader(file_paths):
+from .grid import WindGrid, bilinear_weights, site_window, wind_direction
+from .cache import WindCache
+from .ingest import ingest_files
+from .shear import direction_profile, vertical_profile
+from .weibull import (fit_weibull_batch, fit_weibull_grouped, weibull_from_energy,
+                      weibull_from_moments)
+from .aep import timeseries_aep, weibull_aep
+from .batch import assess_sites
+from .sectors import sector_aep, sector_index, sector_weibull
+from .incremental import WindStatistics
+from .histogram import JointHistogram
+from .temporal import TemporalStatistics
+from .farm import WindFarm, read_thrust_curve
+from .turbines import CurveTable, TurbineRegistry, read_curve_csv
+from .uncertainty import bootstrap_aep
+from .service import WindService
+from .export import read_table, write_table
+from .profiling import StageProfiler, profiled
+
+
+@profiled("nc_reader")
+def nc_reader(file_paths, lazy=False, site=None,
+              variables=("u10", "v10", "u100", "v100"), margin=0, time_chunk=8760):
     """
     Læser én eller flere NetCDF-filer og returnerer en samlet pandas DataFrame.
+
+    With lazy=True the files are instead read into an xarray Dataset that keeps
+    the (valid_time, latitude, longitude) layout:
+    - site: (lat, lon) of the site; only the grid cell enclosing it, widened by
+      `margin` cells on every side, is read. None reads the whole grid.
+    - variables: data variables to read, everything else is skipped.
+    - time_chunk: number of time steps read from disk at a time.
+    Peak memory is then the size of the returned cube plus one chunk.
     """
     if isinstance(file_paths, str):
         file_paths = [file_paths]  # Hvis kun én fil er givet
 
+    if lazy:
+        return _read_cube(file_paths, site, list(variables), margin, time_chunk)
+
+    import xarray as xr
     datasets = [xr.open_dataset(path) for path in file_paths]
     combined = xr.concat(datasets, dim="valid_time")
     df2 = combined.to_dataframe().reset_index()
     return df2
 
 
+def _read_cube(file_paths, site, variables, margin, time_chunk):
+    """
+    Read the selected variables and grid window of every file into one
+    preallocated (valid_time, latitude, longitude) array per variable.
+    Files may be given in any order; the cube is ordered by valid_time.
+    """
+    import xarray as xr
+    lat, lon = site if site is not None else (None, None)
+
+    # First pass: only the coordinates, to size the output arrays
+    files = []
+    for path in file_paths:
+        with xr.open_dataset(path) as ds:
+            lat_sel = site_window(ds["latitude"].values, lat, margin)
+            lon_sel = site_window(ds["longitude"].values, lon, margin)
+            first = ds["valid_time"].values[:1]
+            files.append((first[0] if first.size else np.datetime64("NaT"), path,
+                          (lat_sel, lon_sel), ds.sizes["valid_time"]))
+            if len(files) == 1:
+                latitudes = ds["latitude"].values[lat_sel]
+                longitudes = ds["longitude"].values[lon_sel]
+                dtypes = {name: ds[name].dtype for name in variables}
+    # Files in order of their first valid_time, as in ingest_files
+    files.sort(key=lambda item: item[0])
+    file_paths = [item[1] for item in files]
+    windows = [item[2] for item in files]
+    steps = [item[3] for item in files]
+
+    times = np.empty(sum(steps), dtype="datetime64[ns]")
+    cube = {name: np.empty((times.size, latitudes.size, longitudes.size), dtype=dtypes[name])
+            for name in variables}
+
+    # Second pass: copy the data chunk by chunk into the output arrays
+    offset = 0
+    for path, (lat_sel, lon_sel), n_steps in zip(file_paths, windows, steps):
+        with xr.open_dataset(path) as ds:
+            subset = ds[variables].isel(latitude=lat_sel, longitude=lon_sel)
+            times[offset:offset + n_steps] = subset["valid_time"].values
+            for start in range(0, n_steps, time_chunk):
+                stop = min(start + time_chunk, n_steps)
+                chunk = subset.isel(valid_time=slice(start, stop))
+                for name in variables:
+                    cube[name][offset + start:offset + stop] = chunk[name].values
+        offset += n_steps
+
+    dims = ("valid_time", "latitude", "longitude")
+    return xr.Dataset(
+        {name: (dims, values) for name, values in cube.items()},
+        coords={"valid_time": times, "latitude": latitudes, "longitude": longitudes},
+    )
+
+
+
+@profiled("load_wind_grid")
+def load_wind_grid(file_paths, site=None, margin=0, cache_dir=None, time_chunk=8760,
+                   workers=None):
+    """
+    Read NetCDF files into a WindGrid of wind speed and u/v components at
+    10 m and 100 m, optionally only around a site. Directions are derived
+    after interpolation, see WindGrid.interpolate_wind.
+    With cache_dir, the grid is stored there as memory-mappable .npy files
+    keyed by the source paths, sizes and mtimes and the parameters; later
+    calls load it without decoding the NetCDF files again.
+    With workers, the files are decoded by that many processes in parallel
+    (see ingest_files); 0 uses all cores.
+    """
+    if isinstance(file_paths, str):
+        file_paths = [file_paths]
+
+    params = {"site": site, "margin": margin, "fields": "speed_uv_10_100"}
+    cache = WindCache(cache_dir) if cache_dir is not None else None
+    if cache is not None:
+        key = cache.key(file_paths, **params)
+        grid = cache.load(key)
+        if grid is not None:
+            return grid
+
+    staging = None
+    if workers is not None:
+        staging = cache.staging() if cache is not None else None
+        grid = ingest_files(file_paths, site, margin, workers or None, out_dir=staging,
+                            time_chunk=time_chunk)
+    else:
+        cube = nc_reader(file_paths, lazy=True, site=site, margin=margin, time_chunk=time_chunk)
+        grid = WindGrid.from_components(cube)
+
+    if cache is not None:
+        grid = cache.save(key, grid, file_paths, staging=staging, **params)
+    return grid
+
 
-def wind_speed_df(df2):
+
+@profiled("wind_speed_df")
+def wind_speed_df(df2, compact=False):
     """
     calculates wind speed and direction from u and v components at 10m and 100m height.
+    compact=True stores the derived columns as float32 and deletes the raw
+    u/v components and every other unused column from df2 as soon as they
+    have been used. df2 is modified in place; the result is a new frame of
+    its remaining columns in the usual order, which shares their data.
     """
+    if compact:
+        return _wind_speed_df_compact(df2)
+
     df2["wind_speed_10m [m/s]"] = np.sqrt(df2["u10"]**2 + df2["v10"]**2)
 
     df2["wind_speed_100m [m/s]"] = np.sqrt(df2["u100"]**2 + df2["v100"]**2)
 
-    df2["wind_direction_10m [degrees]"] = np.arctan2(df2["u10"], df2["v10"]) * 180 / np.pi + 180
+    df2["wind_direction_10m [degrees]"] = wind_direction(df2["u10"].to_numpy(float), df2["v10"].to_numpy(float))
 
-    df2["wind_direction_100m [degrees]"] = np.arctan2(df2["u100"], df2["v100"]) * 180 / np.pi + 180
+    df2["wind_direction_100m [degrees]"] = wind_direction(df2["u100"].to_numpy(float), df2["v100"].to_numpy(float))
 
     df = df2[["valid_time", "latitude", "longitude", "wind_speed_10m [m/s]",
               "wind_speed_100m [m/s]", "wind_direction_10m [degrees]",
@@ -46,133 +175,170 @@ def wind_speed_df(df2):
 
 
 
-def nc_sorter(df):
+def _wind_speed_df_compact(df2):
     """
-    sorts the DataFrame by latitude and longitude,
-    and creates separate tables for each unique coordinate.
+    Compact variant of wind_speed_df, see there.
     """
-    # Sortér først
-    df_sorted = df.sort_values(by=["latitude", "longitude", "valid_time"]).reset_index(drop=True)
+    keep = ["valid_time", "latitude", "longitude"]
+    for col in [col for col in df2.columns if col not in keep + ["u10", "v10", "u100", "v100"]]:
+        del df2[col]
 
-    # Find unikke koordinater
-    coords = df_sorted[["latitude", "longitude"]].drop_duplicates()
+    for height in (10, 100):
+        u = df2[f"u{height}"].to_numpy(np.float32, copy=True)  # overwritten with the direction
+        v = df2[f"v{height}"].to_numpy(np.float32)
+        df2[f"wind_speed_{height}m [m/s]"] = np.hypot(u, v)
+        df2[f"wind_direction_{height}m [degrees]"] = wind_direction(u, v, out=u)  # reuses u
+        del u, v, df2[f"u{height}"], df2[f"v{height}"]  # release the raw components
 
-    # Opret separate tabeller
-    tables = {}
-    for i, row in coords.iterrows():
-        lat, lon = row["latitude"], row["longitude"]
-        key = f"lat_{lat}_lon_{lon}"
-        tables[key] = df_sorted[(df_sorted["latitude"] == lat)
-        & (df_sorted["longitude"] == lon)].reset_index(drop=True)
+    return df2[keep + ["wind_speed_10m [m/s]", "wind_speed_100m [m/s]",
+                       "wind_direction_10m [degrees]", "wind_direction_100m [degrees]"]]
 
 
-    return tables
-
 
-
-def interpolation(lat, lon, tables):
-    #This only works for kordinates in the sqare
+def memory_usage(obj):
     """
-    Interpoler vindhastighed og retning for givet latitude og longitude.
+    Bytes held by a DataFrame, xarray Dataset, WindGrid, dict of tables
+    (nc_sorter) or array. Memory-mapped grids count their full size.
     """
-    xpercent = (lat-7.75)/0.25
-    ypercent = (lon-55.5)/0.25
-
-    lat_8_lon_55_5 = tables["lat_8.0_lon_55.5"]
-    lat_8_lon_55_75 = tables["lat_8.0_lon_55.75"]
-    lat_7_75_lon_55_5 = tables["lat_7.75_lon_55.5"]
-    lat_7_75_lon_55_75 = tables["lat_7.75_lon_55.75"]
-
-    inter = {}
-
-    inter["latTop10Speed"] = lat_7_75_lon_55_5["wind_speed_10m [m/s]"] + (lat_8_lon_55_5["wind_speed_10m [m/s]"] - lat_7_75_lon_55_5["wind_speed_10m [m/s]"]) * xpercent
-    inter["latBottom10Speed"] = lat_7_75_lon_55_75["wind_speed_10m [m/s]"] + (lat_8_lon_55_75["wind_speed_10m [m/s]"] - lat_7_75_lon_55_75["wind_speed_10m [m/s]"]) * xpercent
-
-    inter["interValue10Speed"] =  inter["latBottom10Speed"] + (inter["latTop10Speed"] - inter["latBottom10Speed"]) * ypercent
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    xr = sys.modules.get("xarray")  # an xarray Dataset implies xarray is imported
+    if xr is not None and isinstance(obj, xr.Dataset):
+        return int(obj.nbytes)
+    if isinstance(obj, WindGrid):
+        return int(obj.values.nbytes + obj.times.nbytes
+                   + obj.latitudes.nbytes + obj.longitudes.nbytes)
+    if isinstance(obj, dict):
+        return sum(memory_usage(value) for value in obj.values())
+    return int(np.asarray(obj).nbytes)
 
 
 
-    inter["latTop100Speed"] = lat_7_75_lon_55_5["wind_speed_100m [m/s]"] + (lat_8_lon_55_5["wind_speed_100m [m/s]"] - lat_7_75_lon_55_5["wind_speed_100m [m/s]"]) * xpercent
-    inter["latBottom100Speed"] = lat_7_75_lon_55_75["wind_speed_100m [m/s]"] + (lat_8_lon_55_75["wind_speed_100m [m/s]"] - lat_7_75_lon_55_75["wind_speed_100m [m/s]"]) * xpercent
-
-    inter["interValue100Speed"] =  inter["latBottom100Speed"] + (inter["latTop100Speed"] - inter["latBottom100Speed"]) * ypercent
+def memory_report(**stages):
+    """
+    Memory of the result of each pipeline stage, e.g.
+    memory_report(nc_reader=df2, wind_speed_df=df, nc_sorter=tables).
+    Returns a DataFrame with one row per stage in MB.
+    """
+    return pd.DataFrame({"memory [MB]": [memory_usage(obj) / 2**20 for obj in stages.values()]},
+                        index=pd.Index(list(stages), name="stage"))
 
 
 
-    inter["latTop10Direction"] = lat_7_75_lon_55_75["wind_direction_10m [degrees]"] + (lat_8_lon_55_75["wind_direction_10m [degrees]"] - lat_7_75_lon_55_75["wind_direction_10m [degrees]"]) * xpercent
-    inter["latBottom10Direction"] = lat_7_75_lon_55_5["wind_direction_10m [degrees]"] + (lat_8_lon_55_5["wind_direction_10m [degrees]"] - lat_7_75_lon_55_5["wind_direction_10m [degrees]"]) * xpercent
+@profiled("nc_sorter")
+def nc_sorter(df):
+    """
+    sorts the DataFrame by latitude and longitude,
+    and creates separate tables for each unique coordinate.
+    For array access without per-coordinate tables, use WindGrid.from_dataframe(df).
+    """
+    # Sortér først
+    df_sorted = df.sort_values(by=["latitude", "longitude", "valid_time"]).reset_index(drop=True)
 
-    inter["interValue10Direction"] =  inter["latBottom10Direction"] + (inter["latTop10Direction"] - inter["latBottom10Direction"]) * ypercent
+    # Find hvor hver koordinat starter i den sorterede tabel
+    lat = df_sorted["latitude"].to_numpy()
+    lon = df_sorted["longitude"].to_numpy()
+    starts = np.flatnonzero(np.r_[True, (lat[1:] != lat[:-1]) | (lon[1:] != lon[:-1])])
+    stops = np.r_[starts[1:], len(df_sorted)]
 
+    # Opret separate tabeller
+    tables = {}
+    for start, stop in zip(starts, stops):
+        key = f"lat_{lat[start]}_lon_{lon[start]}"
+        tables[key] = df_sorted.iloc[start:stop].reset_index(drop=True)
 
 
-    inter["latTop100Direction"] = lat_7_75_lon_55_75["wind_direction_100m [degrees]"] + (lat_8_lon_55_75["wind_direction_100m [degrees]"] - lat_7_75_lon_55_75["wind_direction_100m [degrees]"]) * xpercent
-    inter["latBottom100Direction"] = lat_7_75_lon_55_5["wind_direction_100m [degrees]"] + (lat_8_lon_55_5["wind_direction_100m [degrees]"] - lat_7_75_lon_55_5["wind_direction_100m [degrees]"]) * xpercent
+    return tables
 
-    inter["interValue100Direction"] =  inter["latBottom100Direction"] + (inter["latTop100Direction"] - inter["latBottom100Direction"]) * ypercent
 
 
+@profiled("interpolation")
+def interpolation(lat, lon, tables):
+    """
+    Interpoler vindhastighed og retning for givet latitude og longitude.
+    tables: the dict from nc_sorter or a WindGrid. The enclosing grid cell is
+    found for any regular grid; lat and lon may also be arrays of N sites, in
+    which case the result has one row per (site, valid_time).
+    Directions are interpolated as u/v vectors (or as angles for tables
+    in degrees) and converted to degrees once, see WindGrid.interpolate_wind.
+    """
+    grid = tables if isinstance(tables, WindGrid) else WindGrid.from_tables(tables)
 
-    interpolated_table = pd.DataFrame({
-        "valid_time": lat_7_75_lon_55_5["valid_time"],
-        "wind_speed_10m [m/s]": inter["interValue10Speed"],
-        "wind_speed_100m [m/s]": inter["interValue100Speed"],
-        "wind_direction_10m [degrees]": inter["interValue10Direction"],
-        "wind_direction_100m [degrees]": inter["interValue100Direction"]
-    })
+    columns = ["wind_speed_10m [m/s]", "wind_speed_100m [m/s]",
+               "wind_direction_10m [degrees]", "wind_direction_100m [degrees]"]
+    speeds, directions = grid.interpolate_wind(lat, lon)  # (sites, heights, time)
 
+    interpolated_table = pd.DataFrame({"valid_time": np.tile(grid.times, len(speeds))})
+    if np.ndim(lat) > 0:
+        interpolated_table.insert(0, "latitude", np.repeat(lat, grid.times.size))
+        interpolated_table.insert(1, "longitude", np.repeat(lon, grid.times.size))
+    for col, series in zip(columns, [speeds[:, 0], speeds[:, 1], directions[:, 0], directions[:, 1]]):
+        interpolated_table[col] = series.ravel()
 
     return interpolated_table
 
 
 
-def compute_power_law(interpolated_table, height, z1=10, z2=100):
+@profiled("compute_power_law")
+def compute_power_law(interpolated_table, height, z1=10, z2=100, method="power", shear="time"):
     """
     Compute wind speed at a given height using the power law.
     interpolatedTable: DataFrame with wind data for one location.
     z1: Height corresponding to U1 [m].
     z2: Height corresponding to U2 [m].
-    height: Target height at which wind speed is computed [m].
+    height: Target height at which wind speed is computed [m], or a list of
+    heights, which are all computed from one shear evaluation.
+    method, shear: log law and constant-shear options, see vertical_profile.
     """
-    # Extract the known wind speeds
-    u1 = interpolated_table["wind_speed_10m [m/s]"]
-    u2 = interpolated_table["wind_speed_100m [m/s]"]
+    heights = [height] if np.ndim(height) == 0 else list(height)
 
-    # Calculate the shear exponent alpha
-    alpha = np.log(u2 / u1) / np.log(z2 / z1)
+    # Extract the known wind speeds and directions
+    u1 = interpolated_table["wind_speed_10m [m/s]"].to_numpy()
+    u2 = interpolated_table["wind_speed_100m [m/s]"].to_numpy()
+    d1 = interpolated_table["wind_direction_10m [degrees]"].to_numpy()
+    d2 = interpolated_table["wind_direction_100m [degrees]"].to_numpy()
 
-    # Compute the wind speed at the new height
-    u_z = u2 * (height / z2) ** alpha
-
-    # Computing the interpolated direction
-    y_percent = (height - z1) / (z2 - z1)
-    if height <= 100:
-        direction_z = interpolated_table["wind_direction_10m [degrees]"] + (interpolated_table["wind_direction_100m [degrees]"] - interpolated_table["wind_direction_10m [degrees]"]) * y_percent
-    else:
-        direction_z = interpolated_table["wind_direction_100m [degrees]"]
+    # Speeds and directions at all heights, shape (time, heights)
+    u_z = vertical_profile(u1, u2, heights, z1, z2, method, shear)
+    direction_z = direction_profile(d1, d2, heights, z1, z2)
 
-    interpolated_table_height = pd.DataFrame({
-        "valid_time": interpolated_table["valid_time"],
-        f"wind_speed_at_{height}[m/s]": u_z,
-        f"direction_at_{height}[degrees]": direction_z
-    })
+    columns = {"valid_time": interpolated_table["valid_time"]}
+    for n, h in enumerate(heights):
+        columns[f"wind_speed_at_{h}[m/s]"] = u_z[:, n]
+        columns[f"direction_at_{h}[degrees]"] = direction_z[:, n]
+    interpolated_table_height = pd.DataFrame(columns)
 
     return interpolated_table_height
 
-def fit_weibull(speed_data):
+@profiled("fit_weibull", rows=None)
+def fit_weibull(speed_data, method="mle"):
     """
     Fit a 2-parameter Weibull to the input wind-speed array.
+    method: "mle", "moments" or "wasp", see fit_weibull_batch, which also
+    fits many series at once.
     Returns: k (shape), A (scale).
     """
-    k, loc, a = weibull_min.fit(speed_data, floc=0)
-    return k, a
+    k, a = fit_weibull_batch(speed_data, method)
+    return float(k), float(a)
 
-def plot_weibull(speed_data, k, a, height, bins=30):
+@profiled("plot_weibull", rows=None)
+def plot_weibull(speed_data, k, a, height, bins=30, save_path=None):
     """
     Plot the observed wind-speed histogram (density) and overlay the
     fitted Weibull PDF with parameters k, a.
+    speed_data: wind speeds, or a JointHistogram of one series, whose speed
+    bins are then used instead of `bins`.
+    save_path: write the figure to this file instead of showing it.
     """
-    counts, edges = np.histogram(speed_data, bins=bins, density=True)
+    import matplotlib.pyplot as plt
+    from scipy.stats import weibull_min
+
+    if isinstance(speed_data, JointHistogram):
+        counts, edges = speed_data.speed_histogram(density=True)
+        last = np.flatnonzero(counts)[-1] + 1 if counts.any() else 1
+        counts, edges = counts[:last], edges[:last + 1]  # drop the empty tail
+    else:
+        counts, edges = np.histogram(speed_data, bins=bins, density=True)
     centers = 0.5*(edges[:-1] + edges[1:])
     pdf = weibull_min.pdf(centers, k, loc=0, scale=a)
 
@@ -188,25 +354,48 @@ def plot_weibull(speed_data, k, a, height, bins=30):
     plt.ylabel('Probability Density')
     plt.legend()
     plt.grid(True)
-    plt.show()
+    _show_or_save(plt, save_path)
 
-def wind_rose(height_speed, height):
+@profiled("wind_rose", rows=None)
+def wind_rose(height_speed, height, save_path=None, speed_classes=(0, 5, 10, 15, 20, 25),
+              n_sectors=16):
     """
     Create a wind rose plot for the given height and wind speed data.
+    height_speed: the table of compute_power_law, or a JointHistogram of one
+    series (e.g. merged over several files or collapsed over sites).
+    speed_classes: lower limits of the stacked speed classes [m/s].
+    n_sectors: number of direction sectors of a table (a histogram keeps its own).
+    save_path: write the figure to this file instead of showing it.
     """
+    import matplotlib.pyplot as plt
 
-    # Extract wind direction and speed at given height [m]
-    wind_speed = height_speed[f"wind_speed_at_{height}[m/s]"]
-    wind_dir = height_speed[f"direction_at_{height}[degrees]"]
+    if isinstance(height_speed, JointHistogram):
+        hist = height_speed
+    else:
+        # Extract wind direction and speed at given height [m]
+        hist = JointHistogram.from_series(height_speed[f"wind_speed_at_{height}[m/s]"],
+                                          height_speed[f"direction_at_{height}[degrees]"],
+                                          n_sectors=n_sectors)
+    table = 100 * hist.rose_table(speed_classes)  # (sectors, classes) in %
 
-    # Create a windrose plot
+    # Stacked bars per sector, north up and clockwise
     plt.figure(figsize=(8, 8))
-    ax = WindroseAxes.from_ax()
-    ax.bar(wind_dir, wind_speed, normed=True, opening=0.8,
-           edgecolor='white', bins=np.arange(0, 30, 5))
-    ax.set_legend()
+    ax = plt.subplot(projection="polar")
+    ax.set_theta_zero_location("N")
+    ax.set_theta_direction(-1)
+    theta = np.deg2rad(hist.sector_centres)
+    width = 0.8 * 2 * np.pi / hist.n_sectors
+    colors = plt.cm.viridis(np.linspace(0, 1, len(speed_classes)))
+    bottom = np.zeros(hist.n_sectors)
+    for n, lower in enumerate(speed_classes):
+        label = (f"[{lower} : {speed_classes[n + 1]})" if n + 1 < len(speed_classes)
+                 else f"[{lower} : inf)")
+        ax.bar(theta, table[:, n], width=width, bottom=bottom, color=colors[n],
+               edgecolor='white', label=label)
+        bottom += table[:, n]
+    ax.legend(title="Wind speed [m/s]", loc="lower left", bbox_to_anchor=(-0.1, -0.1))
     plt.title(f"Wind Rose at {height} m")
-    plt.show()
+    _show_or_save(plt, save_path)
 
 
 
@@ -226,14 +415,12 @@ class GeneralWindTurbine:
     def get_power(self, v):
         """
         Calculate the power output of the turbine based on wind speed.
+        v may be a scalar or an array of wind speeds; NaN speeds give NaN.
         """
-        if v < self.v_in or v > self.v_out:
-            p = 0
-        elif self.v_in <= v < self.v_rated:
-            p =self.rated_power * (v/self.v_rated) ** 3
-        elif self.v_rated <= v < self.v_out:
-            p = self.rated_power
-        return p
+        v = np.asarray(v, dtype=float)
+        p = self.rated_power * np.minimum(v / self.v_rated, 1.0) ** 3
+        p = np.where((v < self.v_in) | (v > self.v_out), 0.0, p)
+        return p[()]
 
 
 class WindTurbine(GeneralWindTurbine):
@@ -246,16 +433,14 @@ class WindTurbine(GeneralWindTurbine):
         super().__init__(rotor_diameter, hub_height, rated_power, v_in, v_rated, v_out, name)
 
         self.power_curve_data = np.array(power_curve_data)
+        # Uniform lookup table of the curve, see CurveTable
+        self.lookup = CurveTable(self.power_curve_data[:, 0], self.power_curve_data[:, 1])
 
     def get_power(self, v):
         """
         Calculate the power output of the turbine based on wind speed using interpolation.
         """
-        v = np.array(v)
-        wind_speed = self.power_curve_data[:, 0]
-        power_value = self.power_curve_data[:, 1]
-
-        return np.interp(v, wind_speed, power_value)
+        return self.lookup(v)
 
 
 class TurbineParameters:
@@ -287,10 +472,11 @@ class TurbineParameters:
     def csv_reader(self, file_path):
         """
         Reads the CSV files and returns a list of DataFrames.
+        Every file is read once (see read_curve_csv); the frames are shared.
         """
         mw = []
         for path in file_path:
-            df = pd.read_csv(path)
+            df = read_curve_csv(path)
             mw.append(df)
         return mw
 
@@ -304,11 +490,14 @@ class TurbineParameters:
         return power_curve
 
 
+@profiled("plot_power_curve", rows=None)
 def plot_power_curve(wind_speeds, rotor_diameter, hub_height,
-    rated_power, v_in, v_rated, v_out, power_curve):
+    rated_power, v_in, v_rated, v_out, power_curve, save_path=None):
     """
     Plot the power curve of the wind turbine using both general and detailed models.
+    save_path: write the figure to this file instead of showing it.
     """
+    import matplotlib.pyplot as plt
 
     general_turbine = GeneralWindTurbine(rotor_diameter, hub_height,
     rated_power, v_in, v_rated, v_out, "LEANWIND_5MW_126_General")
@@ -320,9 +509,9 @@ def plot_power_curve(wind_speeds, rotor_diameter, hub_height,
     rated_power, v_in, v_rated, v_out, power_curve[1], "LEANWIND_15MW_240_Detailed")
 
     # Compute power outputs for each wind speed using both turbine models
-    power_general = np.array([general_turbine.get_power(v) for v in wind_speeds])
-    power_detailed_5mw = np.array([detailed_turbine_5mw.get_power(v) for v in wind_speeds])
-    power_detailed_15mw = np.array([detailed_turbine_15mw.get_power(v) for v in wind_speeds])
+    power_general = general_turbine.get_power(wind_speeds)
+    power_detailed_5mw = detailed_turbine_5mw.get_power(wind_speeds)
+    power_detailed_15mw = detailed_turbine_15mw.get_power(wind_speeds)
 
     # Plot the power curves
     plt.figure(figsize=(10, 6))
@@ -336,10 +525,23 @@ def plot_power_curve(wind_speeds, rotor_diameter, hub_height,
     plt.title("Comparison of Wind Turbine Power Curves")
     plt.legend()
     plt.grid(True)
-    plt.show()
+    _show_or_save(plt, save_path)
 
 
 
+def _show_or_save(plt, save_path):
+    """
+    Show the current figure, or write it to save_path and close it.
+    """
+    if save_path is None:
+        plt.show()
+    else:
+        plt.savefig(save_path, dpi=150, bbox_inches="tight")
+        plt.close()
+
+
+
+@profiled("compute_aep", rows=None)
 def compute_aep(turbine, k, a, u_in, u_out, availability=1.0):
     """
     Compute the Annual Energy Production (AEP) in kWh.
@@ -347,11 +549,9 @@ def compute_aep(turbine, k, a, u_in, u_out, availability=1.0):
     - k, A: Weibull parameters (shape, scale)
     - u_in, u_out: cut-in and cut-out speeds
     - availability: assumed 1.0 unless stated otherwise
+    Integration is done by weibull_aep; use it directly for arrays of (k, A)
+    or several turbines.
     """
 
-    def integrand(u):
-        return turbine.get_power(u) * weibull_min.pdf(u, k, scale=a)
-
-    energy_per_year, _ = quad(integrand, u_in, u_out)
-    aep = availability * 8760 * energy_per_year  # kWh/year
-    return aep
+    aep = weibull_aep(turbine, k, a, u_in, u_out, availability)  # kWh/year
+    return float(aep)
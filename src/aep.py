@@ -0,0 +1,145 @@
+"""
+Annual Energy Production from Weibull parameters, vectorised over many
+(k, A) pairs and turbines, or directly from wind-speed time series.
+
+Power curves are treated as piecewise linear between tabulated speeds, and
+each linear segment is integrated exactly against the Weibull pdf using the
+Weibull CDF and the incomplete gamma function, so no adaptive quadrature or
+per-speed Python calls are needed.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.special import gamma, gammainc
+
+
+def _curve_speeds(turbine, u_in, u_out, du):
+    """
+    Speeds at which the power curve of `turbine` is piecewise linear: the
+    tabulated speeds of a WindTurbine, or a du-spaced grid for other turbines.
+    """
+    if hasattr(turbine, "power_curve_data"):
+        return np.asarray(turbine.power_curve_data, dtype=float)[:, 0]
+    return np.arange(u_in, u_out, du)
+
+
+def weibull_aep(turbines, k, a, u_in=None, u_out=None, availability=1.0,
+                du=0.01, tail=1e-12):
+    """
+    Compute the Annual Energy Production (AEP) in kWh for arrays of Weibull
+    parameters and one or more turbines.
+    - turbines: a turbine or a list of turbines with an array-aware .get_power(u).
+    - k, a: Weibull shape and scale, arrays of any (broadcastable) shape.
+    - u_in, u_out: integration limits, scalars or one per turbine. Default to
+      each turbine's v_in and v_out. u_out may be np.inf; the integral is then
+      cut where the Weibull exceedance probability drops below `tail`.
+    - du: speed spacing used to tabulate turbines without power_curve_data.
+    Tabulated power curves (WindTurbine) are integrated exactly, matching
+    quad to its own tolerance (~1e-8 relative). Analytical curves such as
+    GeneralWindTurbine are linearised every `du` m/s, which keeps the
+    relative error below 1e-5 for du=0.01.
+    Returns an array of shape (turbines, *shape) for a list of turbines, or
+    of the broadcast shape of k and a for a single turbine.
+    """
+    single = not isinstance(turbines, (list, tuple))
+    turbines = [turbines] if single else list(turbines)
+
+    k, a = np.broadcast_arrays(np.asarray(k, dtype=float), np.asarray(a, dtype=float))
+    shape = k.shape
+    k, a = k.ravel(), a.ravel()
+
+    u_in = np.broadcast_to([t.v_in for t in turbines] if u_in is None else u_in,
+                           (len(turbines),)).astype(float)
+    u_out = np.broadcast_to([t.v_out for t in turbines] if u_out is None else u_out,
+                            (len(turbines),)).astype(float)
+    if np.isinf(u_out).any():
+        with np.errstate(invalid="ignore"):
+            u_max = np.nanmax(a * (-np.log(tail)) ** (1 / k), initial=np.nanmax(u_in) + du)
+        u_out = np.where(np.isinf(u_out), u_max, u_out)
+
+    # Common speed nodes of all turbines, including every integration limit
+    speeds = np.unique(np.concatenate(
+        [_curve_speeds(t, lo, hi, du) for t, lo, hi in zip(turbines, u_in, u_out)]
+        + [u_in, u_out]))
+    speeds = speeds[(speeds >= u_in.min()) & (speeds <= u_out.max())]
+
+    power = np.stack([np.broadcast_to(np.asarray(t.get_power(speeds), dtype=float),
+                                      speeds.shape) for t in turbines])
+    inside = (speeds[:-1] >= u_in[:, None]) & (speeds[1:] <= u_out[:, None])
+
+    # Exact integrals of f(u) and u f(u) at the nodes: CDF and partial mean
+    with np.errstate(invalid="ignore", divide="ignore"):
+        z = (speeds / a[:, None]) ** k[:, None]
+        cdf = -np.expm1(-z)
+        shape1 = 1 + 1 / k[:, None]
+        partial_mean = a[:, None] * gamma(shape1) * gammainc(shape1, z)
+
+    # Each linear segment contributes p0 * w0 + p1 * w1
+    d_cdf = np.diff(cdf, axis=1)
+    w1 = (np.diff(partial_mean, axis=1) - speeds[:-1] * d_cdf) / np.diff(speeds)
+    w0 = d_cdf - w1
+
+    energy_per_hour = ((power[:, :-1] * inside) @ w0.T
+                       + (power[:, 1:] * inside) @ w1.T)
+    aep = availability * 8760 * energy_per_hour.reshape((len(turbines),) + shape)
+    return aep[0] if single else aep
+
+
+def timeseries_aep(turbines, times, speeds, availability=1.0):
+    """
+    Energy production straight from a wind-speed time series, without a
+    Weibull fit, e.g. the wind_speed_at_{height}[m/s] column of
+    compute_power_law.
+    - turbines: a turbine or a list of turbines with rated_power, name and an
+      array-aware .get_power(u).
+    - times, speeds: valid_time stamps and hub-height wind speeds. NaN speeds
+      are treated as missing and excluded from the energy and the hours.
+    The power of all turbines is computed in one array, and monthly and yearly
+    sums are one reduction over the sorted time keys.
+    Returns (summary, yearly, monthly) DataFrames with one column per turbine:
+    - summary: AEP [kWh], capacity factor and the inter-annual standard
+      deviation and coefficient of variation of the yearly energy.
+    - yearly: energy [kWh] per calendar year.
+    - monthly: energy [kWh] per (year, month).
+    """
+    turbines = list(turbines) if isinstance(turbines, (list, tuple)) else [turbines]
+    names = [t.name or f"turbine_{n}" for n, t in enumerate(turbines)]
+
+    times = np.asarray(times, dtype="datetime64[ns]")
+    speeds = np.asarray(speeds, dtype=float)
+    if np.any(times[1:] < times[:-1]):
+        order = np.argsort(times, kind="stable")
+        times, speeds = times[order], speeds[order]
+
+    step_hours = (np.median(np.diff(times)) / np.timedelta64(1, "h")) if times.size > 1 else 1.0
+    valid = np.isfinite(speeds)
+    power = np.stack([np.broadcast_to(np.asarray(t.get_power(speeds), dtype=float), speeds.shape)
+                      for t in turbines])
+    energy = availability * step_hours * np.where(valid, power, 0.0)  # kWh per sample
+    hours = step_hours * valid
+
+    # Integer time keys; the series is sorted, so every group is one contiguous run
+    month_key = times.astype("datetime64[M]").astype(np.int64)
+    year_key = month_key // 12
+    month_start = np.flatnonzero(np.r_[True, month_key[1:] != month_key[:-1]])
+    year_start = np.flatnonzero(np.r_[True, year_key[1:] != year_key[:-1]])
+
+    monthly = pd.DataFrame(
+        np.add.reduceat(energy, month_start, axis=1).T, columns=names,
+        index=pd.MultiIndex.from_arrays([1970 + year_key[month_start],
+                                         month_key[month_start] % 12 + 1],
+                                        names=["year", "month"]))
+    yearly = pd.DataFrame(np.add.reduceat(energy, year_start, axis=1).T, columns=names,
+                          index=pd.Index(1970 + year_key[year_start], name="year"))
+
+    total_hours = hours.sum()
+    mean_power = energy.sum(axis=1) / total_hours
+    rated = np.array([t.rated_power for t in turbines], dtype=float)
+    yearly_std = yearly.std(axis=0).to_numpy()
+    summary = pd.DataFrame({
+        "aep [kWh]": 8760 * mean_power,
+        "capacity_factor": mean_power / rated,
+        "yearly_std [kWh]": yearly_std,
+        "yearly_cov": yearly_std / yearly.mean(axis=0).to_numpy(),
+    }, index=pd.Index(names, name="turbine"))
+    return summary, yearly, monthly
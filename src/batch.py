@@ -0,0 +1,64 @@
+"""
+Batch wind resource assessment over many candidate sites, hub heights and
+turbines. Every step works on (sites, heights, time) arrays instead of
+running the single-site pipeline once per site.
+"""
+
+import numpy as np
+import pandas as pd
+
+from .aep import weibull_aep
+from .profiling import profiled
+from .shear import vertical_profile
+from .weibull import fit_weibull_batch
+
+
+@profiled("assess_sites")
+def assess_sites(grid, sites, heights, turbines, z1=10, z2=100,
+                 availability=1.0, max_elements=2**23):
+    """
+    Weibull parameters and AEP for every combination of site, height and turbine.
+    - grid: WindGrid with "wind_speed_10m [m/s]" and "wind_speed_100m [m/s]".
+    - sites: array-like of (lat, lon) pairs, shape (N, 2). A regular grid of
+      candidate sites can be built with np.meshgrid.
+    - heights: hub heights [m] at which the power law is evaluated.
+    - turbines: objects with v_in, v_out, name and an array-aware get_power.
+    - max_elements: size budget of the (sites, heights, time) working array;
+      sites are processed in chunks of max_elements // (heights * time), at
+      least one, so the memory does not grow with the record length. The
+      speeds stay in the grid's float dtype until the Weibull fit.
+    Returns a DataFrame with one row per (site, height, turbine).
+    """
+    sites = np.atleast_2d(np.asarray(sites, dtype=float))
+    heights = np.atleast_1d(np.asarray(heights, dtype=float))
+    columns = ["wind_speed_10m [m/s]", "wind_speed_100m [m/s]"]
+
+    dtype = np.result_type(grid.values.dtype, np.float32)
+    chunk_size = max(1, max_elements // (max(heights.size, 2) * grid.times.size))
+
+    k = np.empty((len(sites), heights.size))
+    a = np.empty((len(sites), heights.size))
+    for start in range(0, len(sites), chunk_size):
+        block = sites[start:start + chunk_size]
+        speeds = grid.interpolate(block[:, 0], block[:, 1], columns, dtype)  # (sites, 2, time)
+        u1, u2 = speeds[:, 0], speeds[:, 1]
+
+        # Shear once per site and time step, then all heights at once
+        u_z = vertical_profile(u1, u2, heights, z1, z2, dtype=dtype)  # (sites, time, heights)
+
+        k[start:start + chunk_size], a[start:start + chunk_size] = fit_weibull_batch(
+            np.moveaxis(u_z, -1, 1))
+
+    aep = weibull_aep(list(turbines), k, a, availability=availability)
+
+    n_sites, n_heights, n_turbines = len(sites), heights.size, len(turbines)
+    names = [turbine.name or f"turbine_{n}" for n, turbine in enumerate(turbines)]
+    return pd.DataFrame({
+        "latitude": np.repeat(sites[:, 0], n_heights * n_turbines),
+        "longitude": np.repeat(sites[:, 1], n_heights * n_turbines),
+        "height [m]": np.tile(np.repeat(heights, n_turbines), n_sites),
+        "turbine": np.tile(names, n_sites * n_heights),
+        "k": np.repeat(k.ravel(), n_turbines),
+        "A [m/s]": np.repeat(a.ravel(), n_turbines),
+        "aep [kWh]": aep.transpose(1, 2, 0).ravel(),
+    })
@@ -0,0 +1,138 @@
+"""
+Persistent on-disk cache of derived wind grids.
+
+Every entry is a directory of .npy files (memory-mapped on load, so reading
+a cached grid costs no copy) plus a meta.json describing the source files
+and processing parameters it was built from.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+
+from .grid import WindGrid
+
+
+def _source_stats(file_paths):
+    """
+    (absolute path, size, mtime) of every source file.
+    """
+    stats = []
+    for path in file_paths:
+        info = os.stat(path)
+        stats.append([os.path.abspath(path), info.st_size, info.st_mtime_ns])
+    return stats
+
+
+class WindCache:
+    """
+    Directory of cached WindGrids keyed by their source files and parameters.
+    - cache_dir: directory of the cache, created if missing.
+    - max_entries: least recently used entries beyond this number are evicted.
+    An entry is stale when a source file changes size or mtime; stale
+    entries for the same files and parameters are removed when the new
+    entry is saved.
+    """
+    def __init__(self, cache_dir, max_entries=8):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, file_paths, **params):
+        """
+        Cache key of a grid built from `file_paths` with `params`.
+        """
+        payload = json.dumps({"sources": _source_stats(file_paths), "params": params},
+                             sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+    def _entries(self):
+        """
+        (path, meta) of every complete entry in the cache.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            meta_path = os.path.join(self.cache_dir, name, "meta.json")
+            if os.path.isfile(meta_path):
+                with open(meta_path, encoding="utf-8") as f:
+                    entries.append((os.path.join(self.cache_dir, name), json.load(f)))
+        return entries
+
+    def load(self, key):
+        """
+        Return the cached grid for `key`, memory-mapped read-only, or None.
+        """
+        entry = os.path.join(self.cache_dir, key)
+        meta_path = os.path.join(entry, "meta.json")
+        if not os.path.isfile(meta_path):
+            return None
+
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        try:
+            os.utime(meta_path)  # mark as recently used
+        except OSError:
+            pass  # entries written by another user are read-only; recency is best effort
+        return WindGrid(np.load(os.path.join(entry, "times.npy")),
+                        np.load(os.path.join(entry, "latitudes.npy")),
+                        np.load(os.path.join(entry, "longitudes.npy")),
+                        meta["variables"],
+                        np.load(os.path.join(entry, "values.npy"), mmap_mode="r"))
+
+    def staging(self):
+        """
+        New staging directory inside the cache. A values.npy written there
+        (e.g. by ingest_files) is moved into the entry by save() without copying.
+        """
+        tmp = tempfile.mkdtemp(dir=self.cache_dir, prefix=".tmp-")
+        os.chmod(tmp, 0o755)  # mkdtemp makes it private; entries are shared like the files
+        return tmp
+
+    def save(self, key, grid, file_paths, staging=None, **params):
+        """
+        Store `grid` under `key`, evict stale and least recently used
+        entries, and return the stored grid memory-mapped from disk.
+        """
+        tmp = staging or self.staging()
+        np.save(os.path.join(tmp, "times.npy"), grid.times)
+        np.save(os.path.join(tmp, "latitudes.npy"), grid.latitudes)
+        np.save(os.path.join(tmp, "longitudes.npy"), grid.longitudes)
+        if not os.path.isfile(os.path.join(tmp, "values.npy")):
+            np.save(os.path.join(tmp, "values.npy"), grid.values)
+        meta = {"variables": grid.variables,
+                "sources": [os.path.abspath(p) for p in file_paths],
+                "params": json.loads(json.dumps(params, default=str)),
+                "created": time.time(),
+                "nbytes": int(grid.values.nbytes)}
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        entry = os.path.join(self.cache_dir, key)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+        self._evict(key, meta)
+        return self.load(key)
+
+    def _evict(self, key, meta):
+        """
+        Remove entries of the same sources and parameters with an other key
+        (their files have changed), then the least recently used entries.
+        """
+        entries = []
+        for path, other in self._entries():
+            stale = (os.path.basename(path) != key
+                     and other["sources"] == meta["sources"]
+                     and other["params"] == meta["params"])
+            if stale:
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                entries.append(path)
+
+        entries.sort(key=lambda path: os.path.getmtime(os.path.join(path, "meta.json")))
+        for path in entries[:max(len(entries) - self.max_entries, 0)]:
+            shutil.rmtree(path, ignore_errors=True)
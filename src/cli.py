@@ -0,0 +1,197 @@
+"""
+Command-line entry point for running the assessment without a display.
+
+    wra run config.json            full assessment from a JSON config
+    wra aep --k 2.1 --A 9.5 --power-curve inputs/NREL_Reference_5MW_126.csv
+    wra serve config.json --port 8765   query service, see src/service.py
+
+Figures are written to files with the non-interactive Agg backend, and
+matplotlib and xarray are only imported by the steps that use
+them, so an AEP query starts in a fraction of the time of a full run.
+
+Config keys (only "files" and "site" are required; serve ignores site):
+    files          list of ERA5 NetCDF files
+    site           [latitude, longitude]
+    heights        hub heights [m], default [90]
+    turbines       list of {"name", "power_curve" (CSV), "rotor_diameter",
+                   "hub_height", "rated_power", "v_in", "v_rated", "v_out"}
+    output_dir     default "outputs"
+    cache_dir      WindGrid cache, see load_wind_grid (default none)
+    workers        parallel NetCDF decoding, see load_wind_grid
+    weibull_method "mle", "moments" or "wasp"
+    availability   default 1.0
+    plots          write Weibull and wind rose figures, default true
+    profile        write a stage profile to profile.json, default false
+    table_format   format of the hub-height series: "csv" (default),
+                   "netcdf" (wind_data.nc) or "arrow" (wind_data.arrow),
+                   see src/export.py
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from .turbines import read_curve_csv
+
+DEFAULTS = {"heights": [90], "turbines": [], "output_dir": "outputs", "cache_dir": None,
+            "workers": None, "weibull_method": "mle", "availability": 1.0,
+            "plots": True, "profile": False, "table_format": "csv"}
+
+
+def load_config(path, required=("files", "site")):
+    """
+    Read a JSON config and fill in the defaults.
+    """
+    with open(path, encoding="utf-8") as f:
+        config = {**DEFAULTS, **json.load(f)}
+    missing = [key for key in required if key not in config]
+    if missing:
+        raise ValueError(f"config {path} is missing {', '.join(missing)}")
+    return config
+
+
+def make_turbine(spec):
+    """
+    WindTurbine from a config entry; the first two columns of its power
+    curve CSV are speed [m/s] and power [kW].
+    """
+    from . import WindTurbine
+    # a copy: the frame of read_curve_csv is shared
+    curve = read_curve_csv(spec["power_curve"]).iloc[:, :2].to_numpy(dtype=float, copy=True)
+    rated_power = spec.get("rated_power", float(curve[:, 1].max()))
+    return WindTurbine(spec.get("rotor_diameter"), spec.get("hub_height"), rated_power,
+                       spec.get("v_in", float(curve[0, 0])), spec.get("v_rated"),
+                       spec.get("v_out", float(curve[-1, 0])), curve,
+                       spec.get("name", os.path.splitext(os.path.basename(spec["power_curve"]))[0]))
+
+
+def run(config):
+    """
+    Run the assessment of a config dict and write the results to its
+    output_dir. Returns the results table (one row per height and turbine).
+    """
+    from . import (StageProfiler, compute_aep, compute_power_law, fit_weibull, interpolation,
+                   load_wind_grid, plot_weibull, timeseries_aep, wind_rose)
+
+    out = config["output_dir"]
+    os.makedirs(out, exist_ok=True)
+    if config["plots"]:
+        import matplotlib
+        matplotlib.use("Agg")
+    profiler = StageProfiler().start() if config["profile"] else None
+
+    lat, lon = config["site"]
+    grid = load_wind_grid(config["files"], cache_dir=config["cache_dir"],
+                          workers=config["workers"])
+    table = interpolation(lat, lon, grid)
+    heights = list(config["heights"])
+    height_speed = compute_power_law(table, heights)
+    turbines = [make_turbine(spec) for spec in config["turbines"]]
+
+    rows = []
+    for height in heights:
+        speeds = height_speed[f"wind_speed_at_{height}[m/s]"].to_numpy()
+        speeds = speeds[~np.isnan(speeds)]
+        k, a = fit_weibull(speeds, config["weibull_method"])
+        if turbines:
+            summary = timeseries_aep(turbines, height_speed["valid_time"],
+                                     height_speed[f"wind_speed_at_{height}[m/s]"],
+                                     config["availability"])[0]
+        for turbine in turbines or [None]:
+            row = {"latitude": lat, "longitude": lon, "height [m]": height,
+                   "k": k, "A [m/s]": a, "mean speed [m/s]": float(speeds.mean())}
+            if turbine is not None:
+                row["turbine"] = turbine.name
+                row["aep [kWh]"] = compute_aep(turbine, k, a, turbine.v_in, turbine.v_out,
+                                               config["availability"])
+                row["timeseries aep [kWh]"] = float(summary.loc[turbine.name, "aep [kWh]"])
+            rows.append(row)
+
+        if config["plots"]:
+            plot_weibull(speeds, k, a, height,
+                         save_path=os.path.join(out, f"weibull_{height}m.png"))
+            wind_rose(height_speed, height, save_path=os.path.join(out, f"wind_rose_{height}m.png"))
+
+    results = pd.DataFrame(rows)
+    results.to_csv(os.path.join(out, "results.csv"), index=False)
+    if config["table_format"] == "csv":
+        height_speed.to_csv(os.path.join(out, "wind_data.csv"), index=False)
+    else:
+        from .export import write_table
+        extension = {"netcdf": "nc", "arrow": "arrow"}[config["table_format"]]
+        write_table(os.path.join(out, f"wind_data.{extension}"), height_speed,
+                    fmt=config["table_format"], latitude=lat, longitude=lon,
+                    heights=list(config["heights"]))
+    if profiler is not None:
+        profiler.stop()
+        profiler.to_json(os.path.join(out, "profile.json"))
+    return results
+
+
+def query_aep(k, a, power_curve, availability=1.0):
+    """
+    AEP [kWh] of the power curve CSV for Weibull parameters k, A.
+    """
+    from . import compute_aep
+    turbine = make_turbine({"power_curve": power_curve})
+    return compute_aep(turbine, k, a, turbine.v_in, turbine.v_out, availability)
+
+
+def serve(config, host="127.0.0.1", port=8765, unix_path=None):
+    """
+    Load the grid of a config once and answer queries until interrupted.
+    """
+    from . import load_wind_grid
+    from .service import serve as run_service
+    grid = load_wind_grid(config["files"], cache_dir=config["cache_dir"],
+                          workers=config["workers"])
+    turbines = [make_turbine(spec) for spec in config["turbines"]]
+    print(f"serving {len(turbines)} turbines on "
+          f"{unix_path or f'http://{host}:{port}'}", flush=True)
+    run_service(grid, turbines, host, port, unix_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="wra", description="Wind resource assessment")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="full assessment from a JSON config")
+    run_parser.add_argument("config")
+    run_parser.add_argument("--output-dir", help="overrides output_dir of the config")
+    run_parser.add_argument("--no-plots", action="store_true")
+
+    aep_parser = commands.add_parser("aep", help="AEP from Weibull parameters")
+    aep_parser.add_argument("--k", type=float, required=True)
+    aep_parser.add_argument("--A", type=float, required=True)
+    aep_parser.add_argument("--power-curve", required=True)
+    aep_parser.add_argument("--availability", type=float, default=1.0)
+
+    serve_parser = commands.add_parser("serve", help="query service on a resident grid")
+    serve_parser.add_argument("config")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--unix-socket")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        serve(load_config(args.config, required=("files",)), args.host, args.port, args.unix_socket)
+        return 0
+    if args.command == "aep":
+        print(f"{query_aep(args.k, args.A, args.power_curve, args.availability):.1f}")
+        return 0
+
+    config = load_config(args.config)
+    if args.output_dir:
+        config["output_dir"] = args.output_dir
+    if args.no_plots:
+        config["plots"] = False
+    print(run(config).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,201 @@
+"""
+Typed, chunked export of result tables.
+
+Time series and summary tables are written column by column to NetCDF-4
+(compressed, the format of the inputs) or, when pyarrow is installed, to
+the Arrow IPC file format, which can be memory-mapped on reload. Tables may
+be given as one DataFrame or as an iterable of DataFrame chunks (e.g. one
+per site), so large outputs never have to be assembled in memory.
+Metadata (site, height, turbine, ...) is stored with the file and comes
+back in DataFrame.attrs.
+"""
+
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+_TIME_UNITS = "nanoseconds since 1970-01-01"
+_MISSING = "\x1fNA"  # stands for missing values in string variables
+
+
+def _split_name(column):
+    """
+    NetCDF variable name and units of a column like "wind_speed_10m [m/s]".
+    """
+    match = re.fullmatch(r"\s*(.*?)\s*\[(.*)\]\s*", column)
+    name, units = (match.group(1), match.group(2)) if match else (column, None)
+    return re.sub(r"[^0-9A-Za-z_]", "_", name) or "column", units
+
+
+def _chunks(table, chunk_size):
+    """DataFrame chunks of a DataFrame or an iterable of DataFrames."""
+    if isinstance(table, pd.DataFrame):
+        for start in range(0, max(len(table), 1), chunk_size):
+            yield table.iloc[start:start + chunk_size]
+    else:
+        yield from table
+
+
+def _format(path, fmt):
+    if fmt is not None:
+        return fmt
+    return "arrow" if os.path.splitext(path)[1] in (".arrow", ".feather", ".ipc") else "netcdf"
+
+
+def write_table(path, table, fmt=None, chunk_size=100_000, compression=None, **metadata):
+    """
+    Write a table to `path`.
+    - table: a DataFrame or an iterable of DataFrames with the same columns.
+    - fmt: "netcdf" or "arrow"; by default from the file extension
+      (.arrow/.feather/.ipc for Arrow, anything else NetCDF).
+    - compression: NetCDF zlib level (default 4), or an Arrow codec
+      ("lz4", "zstd"; default none, which keeps the file memory-mappable).
+    - metadata: attributes stored with the file, e.g. latitude=7.93,
+      height=90, turbine="NREL_5MW". The table's own attrs are included.
+    Returns the number of rows written.
+    """
+    fmt = _format(path, fmt)
+    if fmt == "netcdf":
+        return _write_netcdf(path, _chunks(table, chunk_size), metadata,
+                             4 if compression is None else compression, table)
+    if fmt == "arrow":
+        return _write_arrow(path, _chunks(table, chunk_size), metadata, compression, table)
+    raise ValueError(f"unknown format {fmt!r}; use 'netcdf' or 'arrow'")
+
+
+def _attributes(table, metadata):
+    attrs = dict(table.attrs) if isinstance(table, pd.DataFrame) else {}
+    attrs.update(metadata)
+    return {key: value if isinstance(value, (str, int, float)) else json.dumps(value, default=str)
+            for key, value in attrs.items()}
+
+
+def _write_netcdf(path, chunks, metadata, level, table):
+    import netCDF4
+
+    rows = 0
+    with netCDF4.Dataset(path, "w", format="NETCDF4") as nc:
+        nc.setncatts(_attributes(table, metadata))
+        nc.createDimension("row", None)
+        variables = None
+        for chunk in chunks:
+            if variables is None:
+                variables, used = {}, set()
+                for column in chunk.columns:
+                    name, units = _split_name(str(column))
+                    while name in used:
+                        name += "_"
+                    used.add(name)
+                    values = chunk[column]
+                    if pd.api.types.is_datetime64_any_dtype(values):
+                        var = nc.createVariable(name, "i8", ("row",), zlib=level > 0,
+                                                complevel=level)
+                        var.units = _TIME_UNITS
+                    elif pd.api.types.is_bool_dtype(values):
+                        # NetCDF has no boolean type
+                        var = nc.createVariable(name, "i1", ("row",), zlib=level > 0,
+                                                complevel=level)
+                        var.kind = "bool"
+                    elif pd.api.types.is_numeric_dtype(values):
+                        var = nc.createVariable(name, values.to_numpy().dtype, ("row",),
+                                                zlib=level > 0, complevel=level)
+                        if units is not None:
+                            var.units = units
+                    else:
+                        var = nc.createVariable(name, str, ("row",))
+                        var.missing_string = _MISSING
+                    var.column = str(column)
+                    variables[column] = var
+            for column, var in variables.items():
+                values = chunk[column]
+                if pd.api.types.is_datetime64_any_dtype(values):
+                    data = values.to_numpy().astype("datetime64[ns]").astype(np.int64)
+                elif var.dtype is str:
+                    data = values.astype(object).where(values.notna(), _MISSING).astype(
+                        str).to_numpy(dtype=object)
+                elif getattr(var, "kind", None) == "bool":
+                    data = values.to_numpy().astype(np.int8)
+                else:
+                    data = values.to_numpy()
+                var[rows:rows + len(chunk)] = data
+            rows += len(chunk)
+    return rows
+
+
+def _write_arrow(path, chunks, metadata, compression, table):
+    try:
+        import pyarrow as pa
+    except ImportError as error:
+        raise ImportError("the Arrow format needs pyarrow; use a .nc path for NetCDF") from error
+
+    rows = 0
+    writer = None
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    try:
+        for chunk in chunks:
+            batch = pa.RecordBatch.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = batch.schema.with_metadata(
+                    {"attrs": json.dumps(_attributes(table, metadata))})
+                writer = pa.ipc.new_file(path, schema, options=options)
+            writer.write_batch(batch.replace_schema_metadata(schema.metadata))
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
+
+
+def read_table(path, columns=None, fmt=None):
+    """
+    Read a table written by write_table; the metadata is in DataFrame.attrs.
+    - columns: optional subset of columns to read.
+    Arrow files are memory-mapped, so unselected columns are never read.
+    """
+    fmt = _format(path, fmt)
+    if fmt == "netcdf":
+        import netCDF4
+        with netCDF4.Dataset(path) as nc:
+            data = {}
+            for var in nc.variables.values():
+                column = getattr(var, "column", var.name)
+                if columns is not None and column not in columns:
+                    continue
+                values = var[:]
+                values = values.filled() if np.ma.isMaskedArray(values) else np.asarray(values)
+                if getattr(var, "units", None) == _TIME_UNITS:
+                    values = values.astype("datetime64[ns]")
+                elif getattr(var, "kind", None) == "bool":
+                    values = values.astype(bool)
+                elif hasattr(var, "missing_string"):
+                    values = np.where(values == var.missing_string, None, values)
+                data[column] = values
+            attrs = {key: nc.getncattr(key) for key in nc.ncattrs()}
+        df = pd.DataFrame(data, columns=[c for c in (columns or data) if c in data])
+    elif fmt == "arrow":
+        import pyarrow as pa
+        with pa.memory_map(path) as source:
+            arrow_table = pa.ipc.open_file(source).read_all()
+        if columns is not None:
+            arrow_table = arrow_table.select(list(columns))
+        attrs = json.loads(arrow_table.schema.metadata[b"attrs"])
+        df = arrow_table.to_pandas()
+    else:
+        raise ValueError(f"unknown format {fmt!r}; use 'netcdf' or 'arrow'")
+    df.attrs.update({key: _decode(value) for key, value in attrs.items()})
+    return df
+
+
+def _decode(value):
+    """Attribute value as written: numbers as Python scalars, lists and dicts from JSON."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, str) and value[:1] in ("[", "{"):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return value
@@ -0,0 +1,336 @@
+"""
+Gridded storage of ERA5-like wind data.
+
+A WindGrid keeps every variable in one contiguous
+(variable, latitude, longitude, time) array, so the time series of a single
+grid point is a contiguous view that can be indexed without any copying.
+"""
+
+import numpy as np
+
+
+def _axis_cells(axis, values):
+    """
+    Locate `values` on a 1-D coordinate axis (ascending or descending).
+    Returns the indices of the two enclosing nodes and the fractional
+    distance from the first to the second. Values outside the axis use the
+    nearest edge cell, which extrapolates linearly.
+    """
+    axis = np.asarray(axis, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if axis.size == 1:
+        zeros = np.zeros(values.shape, dtype=int)
+        return zeros, zeros, np.zeros(values.shape)
+
+    order = np.argsort(axis)
+    ascending = axis[order]
+    upper = np.clip(np.searchsorted(ascending, values), 1, axis.size - 1)
+    lower = upper - 1
+    fraction = (values - ascending[lower]) / (ascending[upper] - ascending[lower])
+    return order[lower], order[upper], fraction
+
+
+def site_window(coords, value, margin=0):
+    """
+    Return the index slice of `coords` covering the cell that encloses `value`,
+    widened by `margin` cells. Works for ascending and descending axes.
+    """
+    coords = np.asarray(coords)
+    if value is None or coords.size < 2:
+        return slice(None)
+
+    descending = coords[0] > coords[-1]
+    ascending = coords[::-1] if descending else coords
+    upper = int(np.clip(np.searchsorted(ascending, value), 1, coords.size - 1))
+    start = max(upper - 1 - margin, 0)
+    stop = min(upper + 1 + margin, coords.size)
+    if descending:
+        start, stop = coords.size - stop, coords.size - start
+    return slice(start, stop)
+
+
+def wind_field_names(heights=(10, 100)):
+    """
+    Names of the variables derived for `heights`: the wind speeds, named
+    like the columns of wind_speed_df, and the u/v components the
+    directions are computed from after interpolation.
+    """
+    return ([f"wind_speed_{h}m [m/s]" for h in heights]
+            + [f"wind_{c}_{h}m [m/s]" for h in heights for c in ("u", "v")])
+
+
+def derive_wind_fields(ds, out, heights=(10, 100)):
+    """
+    Write wind speed and the u/v components at `heights` from the Dataset
+    `ds` into `out`, an array of shape
+    (3 * len(heights), latitude, longitude, valid_time), without temporaries
+    of the full output size.
+    """
+    for n, height in enumerate(heights):
+        u = ds[f"u{height}"].transpose("latitude", "longitude", "valid_time").values
+        v = ds[f"v{height}"].transpose("latitude", "longitude", "valid_time").values
+        np.hypot(u, v, out=out[n])
+        out[len(heights) + 2 * n] = u
+        out[len(heights) + 2 * n + 1] = v
+
+
+def wind_direction(u, v, out=None):
+    """
+    Meteorological wind direction [degrees] (where the wind comes from) of
+    the u/v components, computed in place in `out` if given.
+    """
+    out = np.arctan2(u, v, out=out)
+    out *= 180 / np.pi
+    out += 180
+    return out
+
+
+def _is_angle(name):
+    return name.endswith("[degrees]")
+
+
+# largest number of grid points interpolated with one dense weight matrix
+_DENSE_NODES = 16
+
+
+def bilinear_weights(latitudes, longitudes, site_lats, site_lons):
+    """
+    Find the enclosing grid cell of every site and its bilinear weights.
+    - latitudes, longitudes: coordinate axes of the grid.
+    - site_lats, site_lons: arrays of N site coordinates.
+    Returns lat_idx (N, 2), lon_idx (N, 2) and weights (N, 2, 2), where
+    weights[n, a, b] belongs to the node (lat_idx[n, a], lon_idx[n, b]).
+    """
+    lat0, lat1, x = _axis_cells(latitudes, np.atleast_1d(site_lats))
+    lon0, lon1, y = _axis_cells(longitudes, np.atleast_1d(site_lons))
+
+    lat_idx = np.stack([lat0, lat1], axis=-1)
+    lon_idx = np.stack([lon0, lon1], axis=-1)
+    lat_weights = np.stack([1 - x, x], axis=-1)
+    lon_weights = np.stack([1 - y, y], axis=-1)
+    weights = lat_weights[:, :, None] * lon_weights[:, None, :]
+    return lat_idx, lon_idx, weights
+
+
+class WindGrid:
+    """
+    Wind data on a (latitude, longitude) grid.
+    - times: 1-D array of time stamps (valid_time).
+    - latitudes, longitudes: 1-D coordinate axes of the grid.
+    - variables: names of the stored quantities, e.g. "wind_speed_10m [m/s]".
+    - values: array of shape (variables, latitudes, longitudes, times).
+    """
+    def __init__(self, times, latitudes, longitudes, variables, values):
+        self.times = np.asarray(times)
+        self.latitudes = np.asarray(latitudes, dtype=float)
+        self.longitudes = np.asarray(longitudes, dtype=float)
+        self.variables = list(variables)
+        self.values = np.ascontiguousarray(values)
+
+        expected = (len(self.variables), self.latitudes.size,
+                    self.longitudes.size, self.times.size)
+        if self.values.shape != expected:
+            raise ValueError(f"values has shape {self.values.shape}, expected {expected}")
+
+        # Coordinate lookup table: (lat, lon) -> (lat index, lon index)
+        self.lookup = {(lat, lon): (i, j)
+                       for i, lat in enumerate(self.latitudes.tolist())
+                       for j, lon in enumerate(self.longitudes.tolist())}
+        self._variable_index = {name: n for n, name in enumerate(self.variables)}
+
+    @classmethod
+    def from_dataframe(cls, df, variables=None):
+        """
+        Build a grid from a long-format DataFrame such as the output of
+        wind_speed_df, with one row per (valid_time, latitude, longitude).
+        Missing combinations are filled with NaN.
+        """
+        if variables is None:
+            variables = [col for col in df.columns
+                         if col not in ("valid_time", "latitude", "longitude")]
+
+        times, time_idx = np.unique(df["valid_time"].to_numpy(), return_inverse=True)
+        latitudes, lat_idx = np.unique(df["latitude"].to_numpy(), return_inverse=True)
+        longitudes, lon_idx = np.unique(df["longitude"].to_numpy(), return_inverse=True)
+
+        dtype = np.result_type(np.float32, *[df[name].dtype for name in variables])
+        values = np.full((len(variables), latitudes.size, longitudes.size, times.size),
+                         np.nan, dtype=dtype)
+        for n, name in enumerate(variables):
+            values[n, lat_idx, lon_idx, time_idx] = df[name].to_numpy()
+
+        return cls(times, latitudes, longitudes, variables, values)
+
+    @classmethod
+    def from_dataset(cls, ds, variables=None):
+        """
+        Build a grid from an xarray Dataset with (valid_time, latitude, longitude)
+        variables, e.g. the output of nc_reader(..., lazy=True).
+        """
+        if variables is None:
+            variables = list(ds.data_vars)
+
+        values = np.stack([ds[name].transpose("latitude", "longitude", "valid_time").values
+                           for name in variables])
+        return cls(ds["valid_time"].values, ds["latitude"].values, ds["longitude"].values,
+                   variables, values)
+
+    @classmethod
+    def from_components(cls, ds, heights=(10, 100), dtype=np.float32):
+        """
+        Build a grid of wind speed and u/v components (see wind_field_names)
+        from u10, v10, u100, v100, ... of an xarray Dataset such as the output
+        of nc_reader(..., lazy=True), written straight into one preallocated
+        array. Directions follow from interpolate_wind or direction.
+        """
+        variables = wind_field_names(heights)
+        values = np.empty((len(variables), ds.sizes["latitude"], ds.sizes["longitude"],
+                           ds.sizes["valid_time"]), dtype=dtype)
+        derive_wind_fields(ds, values, heights)
+
+        return cls(ds["valid_time"].values, ds["latitude"].values, ds["longitude"].values,
+                   variables, values)
+
+    @classmethod
+    def from_tables(cls, tables):
+        """
+        Build a grid from the per-coordinate dict returned by nc_sorter,
+        keyed like "lat_8.0_lon_55.5".
+        """
+        points = {}
+        for key, table in tables.items():
+            _, lat, _, lon = key.split("_")
+            points[(float(lat), float(lon))] = table
+
+        first = next(iter(tables.values()))
+        variables = [col for col in first.columns
+                     if col not in ("valid_time", "latitude", "longitude")]
+        latitudes = np.unique([lat for lat, _ in points])
+        longitudes = np.unique([lon for _, lon in points])
+
+        dtype = np.result_type(np.float32, *[first[name].dtype for name in variables])
+        values = np.full((len(variables), latitudes.size, longitudes.size, len(first)),
+                         np.nan, dtype=dtype)
+        for (lat, lon), table in points.items():
+            i = np.searchsorted(latitudes, lat)
+            j = np.searchsorted(longitudes, lon)
+            values[:, i, j] = table[variables].to_numpy().T
+
+        return cls(first["valid_time"].to_numpy(), latitudes, longitudes, variables, values)
+
+    @property
+    def shape(self):
+        """(latitudes, longitudes, times) of the grid."""
+        return self.values.shape[1:]
+
+    def index(self, lat, lon):
+        """
+        Return the (lat index, lon index) of a grid point.
+        """
+        try:
+            return self.lookup[(float(lat), float(lon))]
+        except KeyError:
+            raise KeyError(f"({lat}, {lon}) is not a point of the grid") from None
+
+    def series(self, lat, lon, variable):
+        """
+        Return the time series of one variable at a grid point as a view.
+        """
+        i, j = self.index(lat, lon)
+        return self.values[self._variable_index[variable], i, j]
+
+    def point(self, lat, lon):
+        """
+        Return all variables at a grid point as a dict of views, keyed like
+        the columns of the nc_sorter tables.
+        """
+        i, j = self.index(lat, lon)
+        table = {"valid_time": self.times}
+        table.update(zip(self.variables, self.values[:, i, j]))
+        return table
+
+    def interpolate(self, site_lats, site_lons, variables=None, dtype=None):
+        """
+        Bilinearly interpolate variables to N sites in one vectorised pass.
+        The weights are computed once per site and applied to all variables
+        and time steps; when the sites share at most _DENSE_NODES grid
+        points (a site window, or many sites in one cell) that is a single
+        matrix product with the series of those points.
+        Variables in degrees are interpolated as unit vectors, so 350 and 10
+        degrees give 0, not 180.
+        - dtype: float dtype of the result, e.g. the grid's float32 to avoid
+          a float64 copy; None uses float64 weights.
+        Returns an array of shape (N, variables, times).
+        """
+        names = self.variables if variables is None else list(variables)
+        var_idx = [self._variable_index[name] for name in names]
+        angles = [n for n, name in enumerate(names) if _is_angle(name)]
+
+        lat_idx, lon_idx, weights = bilinear_weights(self.latitudes, self.longitudes,
+                                                     site_lats, site_lons)
+        n_sites = weights.shape[0]
+        node = (lat_idx[:, :, None] * self.longitudes.size + lon_idx[:, None, :]).reshape(
+            n_sites, 4)
+        points = self.values.reshape(len(self.variables), -1, self.times.size)
+        weights = weights.reshape(n_sites, 4).astype(dtype or weights.dtype, copy=False)
+
+        def rows(indices):
+            """Series of the variables at grid points, each angle as a cosine and a sine."""
+            data = points[np.ix_(var_idx, indices)]
+            yield from data
+            for values in data[angles]:
+                radians = np.deg2rad(values, dtype=np.result_type(values.dtype, np.float32))
+                yield np.cos(radians)
+                yield np.sin(radians, out=radians)
+
+        nodes, inverse = np.unique(node, return_inverse=True)
+        n_rows = len(names) + 2 * len(angles)
+        if nodes.size <= _DENSE_NODES:
+            matrix = np.zeros((n_sites, nodes.size), dtype=weights.dtype)
+            np.add.at(matrix, (np.repeat(np.arange(n_sites), 4), inverse.ravel()), weights.ravel())
+            out = np.matmul(matrix, np.stack(list(rows(nodes)))).astype(dtype or matrix.dtype,
+                                                                       copy=False)
+        else:
+            # only the corners of the sites are read, one corner and variable at a time
+            out = np.zeros((n_rows, n_sites, self.times.size),
+                           dtype=dtype or np.result_type(self.values.dtype, weights.dtype))
+            for corner in range(4):
+                for row, values in zip(out, rows(node[:, corner])):
+                    row += weights[:, corner, None] * values
+        if angles:
+            cosine, sine = out[len(names)::2], out[len(names) + 1::2]
+            direction = np.rad2deg(np.arctan2(sine, cosine, out=sine), out=sine)
+            direction -= 360 * np.floor(direction / 360)
+            out[angles] = direction
+        return out[:len(names)].transpose(1, 0, 2)
+
+    def interpolate_wind(self, site_lats, site_lons, heights=(10, 100)):
+        """
+        Wind speed [m/s] and direction [degrees] at `heights` for N sites,
+        each of shape (N, heights, times). Grids of wind_field_names store
+        u/v components, which are interpolated as vectors and converted to
+        degrees once, in place; grids with direction variables in degrees
+        (e.g. from nc_sorter tables) are interpolated as angles.
+        """
+        speeds = [f"wind_speed_{h}m [m/s]" for h in heights]
+        components = [f"wind_{c}_{h}m [m/s]" for h in heights for c in ("u", "v")]
+        if all(name in self._variable_index for name in components):
+            values = self.interpolate(site_lats, site_lons, speeds + components)
+            directions = values[:, len(heights)::2]
+            wind_direction(directions, values[:, len(heights) + 1::2], out=directions)
+        else:
+            values = self.interpolate(site_lats, site_lons, speeds + [
+                f"wind_direction_{h}m [degrees]" for h in heights])
+            directions = values[:, len(heights):]
+        return values[:, :len(heights)], directions
+
+    def direction(self, height):
+        """
+        Wind direction [degrees] at `height` at every grid point, shape
+        (latitudes, longitudes, times).
+        """
+        name = f"wind_direction_{height}m [degrees]"
+        if name in self._variable_index:
+            return self.values[self._variable_index[name]]
+        return wind_direction(self.values[self._variable_index[f"wind_u_{height}m [m/s]"]],
+                              self.values[self._variable_index[f"wind_v_{height}m [m/s]"]])
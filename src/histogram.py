@@ -0,0 +1,175 @@
+"""
+Joint wind speed / direction histogram.
+
+JointHistogram counts samples per (direction sector, speed bin) for an
+array of series in one vectorised pass. Histograms of separate files or
+sites are merged by adding counts, so wind roses, speed histograms, sector
+frequencies and Weibull fits over long periods or many sites never need
+the raw samples in memory. Binning, Weibull fits and storage are shared
+with WindStatistics.
+"""
+
+import numpy as np
+
+from .incremental import WindStatistics, cell_counts, load_arrays, save_arrays, speed_bins
+from .sectors import sector_index
+
+
+class JointHistogram:
+    """
+    Counts of samples per direction sector and speed bin.
+    - shape: leading shape of the series, e.g. () for one site or (sites,).
+    - bin_width, max_speed: speed bins [m/s]; speeds above max_speed fall in
+      the last bin.
+    - n_sectors: number of direction sectors, see sector_index.
+    counts has shape shape + (n_sectors, n_bins).
+    """
+    def __init__(self, shape=(), bin_width=0.5, max_speed=40.0, n_sectors=12):
+        self.shape = tuple(shape)
+        self.bin_width = float(bin_width)
+        self.n_bins = int(np.ceil(max_speed / bin_width))
+        self.n_sectors = int(n_sectors)
+        self.counts = np.zeros(self.shape + (self.n_sectors, self.n_bins), dtype=np.int64)
+
+    @classmethod
+    def from_series(cls, speeds, directions, bin_width=0.5, max_speed=40.0, n_sectors=12):
+        """
+        Histogram of speed and direction arrays of shape (..., time).
+        """
+        speeds = np.asarray(speeds, dtype=float)
+        hist = cls(speeds.shape[:-1], bin_width, max_speed, n_sectors)
+        return hist.update(speeds, directions)
+
+    @property
+    def bin_edges(self):
+        """Edges of the speed bins [m/s]."""
+        return np.arange(self.n_bins + 1) * self.bin_width
+
+    @property
+    def sector_centres(self):
+        """Centre direction of every sector [degrees]."""
+        return np.arange(self.n_sectors) * 360 / self.n_sectors
+
+    @property
+    def total(self):
+        """Number of samples of every series."""
+        return self.counts.sum(axis=(-2, -1))
+
+    def update(self, speeds, directions):
+        """
+        Add samples of shape shape + (time,); samples with a NaN speed or
+        direction are skipped.
+        """
+        speeds = np.asarray(speeds, dtype=float)
+        if speeds.shape[:-1] != self.shape:
+            raise ValueError(f"speeds have shape {speeds.shape}, expected {self.shape} + (time,)")
+        sector = sector_index(directions, self.n_sectors)
+        valid = np.isfinite(speeds) & (sector >= 0)
+        cells = sector * self.n_bins + speed_bins(np.where(valid, speeds, 0.0), self.bin_width,
+                                                  self.n_bins)
+        self.counts += cell_counts(cells, valid, self.n_sectors * self.n_bins,
+                                   self.shape).reshape(self.counts.shape)
+        return self
+
+    def _check(self, other):
+        same = (self.bin_width == other.bin_width and self.n_bins == other.n_bins
+                and self.n_sectors == other.n_sectors)
+        if not same:
+            raise ValueError("histograms have different bins or sectors")
+
+    def merge(self, other):
+        """
+        Histogram of both objects' samples, e.g. of two files of one site.
+        """
+        self._check(other)
+        if self.shape != other.shape:
+            raise ValueError(f"histograms have shapes {self.shape} and {other.shape}")
+        merged = JointHistogram(self.shape, self.bin_width, self.n_bins * self.bin_width,
+                                self.n_sectors)
+        merged.counts = self.counts + other.counts
+        return merged
+
+    def collapse(self, axis=None):
+        """
+        Histogram summed over the leading axes `axis` (all of them by
+        default), e.g. one rose for many sites.
+        """
+        axes = range(len(self.shape)) if axis is None else np.atleast_1d(axis)
+        counts = self.counts.sum(axis=tuple(int(a) for a in axes))
+        collapsed = JointHistogram(counts.shape[:-2], self.bin_width,
+                                   self.n_bins * self.bin_width, self.n_sectors)
+        collapsed.counts = counts
+        return collapsed
+
+    def sector_frequencies(self):
+        """Fraction of samples in every direction sector, shape shape + (n_sectors,)."""
+        sector_counts = self.counts.sum(axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return sector_counts / sector_counts.sum(axis=-1, keepdims=True)
+
+    def speed_histogram(self, density=True):
+        """
+        Speed histogram over all sectors.
+        Returns: counts (or probability density [1/(m/s)]) of shape
+        shape + (n_bins,), and the bin edges.
+        """
+        counts = self.counts.sum(axis=-2)
+        if density:
+            with np.errstate(invalid="ignore", divide="ignore"):
+                counts = counts / (counts.sum(axis=-1, keepdims=True) * self.bin_width)
+        return counts, self.bin_edges
+
+    def rose_table(self, speed_classes=(0, 5, 10, 15, 20, 25)):
+        """
+        Fraction of samples per sector and speed class, shape
+        shape + (n_sectors, classes). Class i holds speeds from
+        speed_classes[i] to speed_classes[i + 1]; the last class is open.
+        The class limits are rounded to the histogram bins.
+        """
+        lower = self.bin_edges[:-1]
+        member = np.clip(np.searchsorted(speed_classes, lower + 1e-9 * self.bin_width,
+                                         side="right") - 1, 0, len(speed_classes) - 1)
+        table = self.counts @ np.eye(len(speed_classes))[member]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return table / self.total[..., None, None]
+
+    def statistics(self, by_sector=True):
+        """
+        WindStatistics of the binned speeds, with every sample at its bin
+        centre: one series per (series, sector), shape shape + (n_sectors,),
+        or per series over all sectors.
+        """
+        counts = self.counts if by_sector else self.counts.sum(axis=-2)
+        stats = WindStatistics(counts.shape[:-1], self.bin_width, self.n_bins * self.bin_width,
+                               self.n_sectors)
+        centres = self.bin_edges[:-1] + self.bin_width / 2
+        stats.count = counts.sum(axis=-1)
+        stats.sums = np.stack([counts @ centres**p for p in (1, 2, 3)], axis=-1)
+        stats.histogram = counts
+        if not by_sector:
+            stats.sector_counts = self.counts.sum(axis=-1)
+        return stats
+
+    def weibull(self, by_sector=True, method="wasp"):
+        """
+        Weibull parameters fitted to the binned speeds, see
+        WindStatistics.weibull.
+        - by_sector: one fit per sector (shape shape + (n_sectors,)), or one
+          per series over all sectors.
+        - method: "wasp" (mean of u^3 and frequency above the mean) or "moments".
+        Returns: k, A.
+        """
+        return self.statistics(by_sector).weibull(method)
+
+    def save(self, path):
+        """Write the histogram to a .npz file."""
+        save_arrays(path, self.bin_width, counts=self.counts)
+
+    @classmethod
+    def load(cls, path):
+        """Read a histogram written by save()."""
+        bin_width, data = load_arrays(path)
+        counts = data["counts"]
+        hist = cls(counts.shape[:-2], bin_width, counts.shape[-1] * bin_width, counts.shape[-2])
+        hist.counts = counts
+        return hist
@@ -0,0 +1,228 @@
+"""
+Mergeable running wind statistics for incremental ingestion.
+
+WindStatistics keeps, per series (e.g. per grid point and height), only
+counts, moment sums, a speed histogram and direction-sector counts. A new
+reanalysis period is added in time proportional to its own length, and
+Weibull parameters and AEP are derived from the accumulated statistics
+without revisiting earlier periods.
+"""
+
+import numpy as np
+
+from .aep import weibull_aep
+from .sectors import sector_index
+from .shear import direction_profile, vertical_profile
+from .weibull import weibull_from_energy, weibull_from_moments
+
+
+def speed_bins(speeds, bin_width, n_bins):
+    """Histogram bin of every speed; speeds above the last bin fall in it."""
+    return np.minimum((speeds // bin_width).astype(np.int64), n_bins - 1)
+
+
+def group_counts(groups, cells, valid, n_groups, n_cells):
+    """
+    Number of samples in every (group, cell) pair, shape (n_groups, n_cells),
+    from the group and cell index of every sample; invalid samples are
+    skipped. One bincount over (group, cell) ids.
+    """
+    ids = np.where(valid, groups * n_cells + cells, n_groups * n_cells)
+    return np.bincount(ids.ravel(), minlength=n_groups * n_cells + 1)[:-1].reshape(
+        n_groups, n_cells)
+
+
+def cell_counts(cells, valid, n_cells, shape):
+    """
+    Number of samples in every cell of every series, shape shape + (n_cells,),
+    from cell indices of shape shape + (time,); invalid samples are skipped.
+    """
+    n_series = int(np.prod(shape, dtype=np.int64))
+    series = np.arange(n_series).reshape(tuple(shape) + (1,))
+    return group_counts(series, cells, valid, n_series, n_cells).reshape(
+        tuple(shape) + (n_cells,))
+
+
+def save_arrays(path, bin_width, **arrays):
+    """Write binned statistics to a .npz file."""
+    np.savez(path, bin_width=bin_width, **arrays)
+
+
+def load_arrays(path):
+    """(bin_width, dict of arrays) of a file written by save_arrays."""
+    with np.load(path) as data:
+        arrays = {name: data[name] for name in data.files}
+    return float(arrays.pop("bin_width")), arrays
+
+
+class WindStatistics:
+    """
+    Running statistics of wind speed and direction for an array of series.
+    - shape: leading shape of the series, e.g. (lat, lon, heights).
+    - bin_width, max_speed: speed histogram bins; speeds above max_speed
+      fall in the last bin.
+    - n_sectors: number of direction sectors, see sector_index.
+    - heights: optional hub heights of the last axis, used by update_grid.
+    """
+    def __init__(self, shape, bin_width=0.5, max_speed=40.0, n_sectors=12, heights=None):
+        self.shape = tuple(shape)
+        self.bin_width = float(bin_width)
+        self.n_bins = int(np.ceil(max_speed / bin_width))
+        self.n_sectors = int(n_sectors)
+        self.heights = None if heights is None else np.asarray(heights, dtype=float)
+
+        self.count = np.zeros(self.shape, dtype=np.int64)
+        self.sums = np.zeros(self.shape + (3,))  # sum of u, u^2, u^3
+        self.histogram = np.zeros(self.shape + (self.n_bins,), dtype=np.int64)
+        self.sector_counts = np.zeros(self.shape + (self.n_sectors,), dtype=np.int64)
+        self.periods = np.empty((0, 2), dtype="datetime64[ns]")
+
+    @property
+    def bin_edges(self):
+        """Edges of the speed histogram bins [m/s]."""
+        return np.arange(self.n_bins + 1) * self.bin_width
+
+    def _add_period(self, times):
+        """
+        Record the time span of an update; overlapping spans are rejected so
+        no period is counted twice.
+        """
+        if times is None or len(times) == 0:
+            return
+        times = np.asarray(times, dtype="datetime64[ns]")
+        first, last = times.min(), times.max()
+        if np.any((self.periods[:, 0] <= last) & (self.periods[:, 1] >= first)):
+            raise ValueError(f"period {first} - {last} overlaps data already included")
+        self.periods = np.vstack([self.periods, [[first, last]]])
+
+    def update(self, speeds, directions, times=None):
+        """
+        Add samples to the statistics.
+        - speeds, directions: arrays of shape shape + (time,). Samples with a
+          NaN speed are skipped; NaN directions only skip the sector count.
+        - times: optional valid_time stamps, used to refuse overlapping periods.
+        """
+        speeds = np.asarray(speeds, dtype=float)
+        if speeds.shape[:-1] != self.shape:
+            raise ValueError(f"speeds have shape {speeds.shape}, expected {self.shape} + (time,)")
+        self._add_period(times)
+
+        valid = np.isfinite(speeds)
+        u = np.where(valid, speeds, 0.0)
+
+        self.count += valid.sum(axis=-1)
+        self.sums[..., 0] += u.sum(axis=-1)
+        self.sums[..., 1] += (u**2).sum(axis=-1)
+        self.sums[..., 2] += (u**3).sum(axis=-1)
+
+        self.histogram += cell_counts(speed_bins(u, self.bin_width, self.n_bins), valid,
+                                      self.n_bins, self.shape)
+        sector = sector_index(directions, self.n_sectors)
+        self.sector_counts += cell_counts(sector, valid & (sector >= 0), self.n_sectors,
+                                          self.shape)
+        return self
+
+    def update_grid(self, grid, z1=10, z2=100):
+        """
+        Add a WindGrid period (e.g. one new reanalysis file) for every grid
+        point and the heights of the statistics, using the power law between
+        the 10 m and 100 m speeds as compute_power_law does.
+        """
+        if self.heights is None:
+            raise ValueError("the statistics need heights to be updated from a grid")
+        speed_10 = grid.values[grid.variables.index("wind_speed_10m [m/s]")]
+        speed_100 = grid.values[grid.variables.index("wind_speed_100m [m/s]")]
+        direction_10 = grid.direction(10)
+        direction_100 = grid.direction(100)
+        # (lat, lon, time, heights) -> (lat, lon, heights, time)
+        speeds = np.moveaxis(vertical_profile(speed_10, speed_100, self.heights, z1, z2), -1, 2)
+        directions = np.moveaxis(direction_profile(direction_10, direction_100, self.heights,
+                                                   z1, z2), -1, 2)
+        return self.update(speeds, directions, grid.times)
+
+    def merge(self, other):
+        """
+        Return the statistics of both objects combined, e.g. from separate
+        files processed on different machines.
+        """
+        same = (self.shape == other.shape and self.bin_width == other.bin_width
+                and self.n_bins == other.n_bins and self.n_sectors == other.n_sectors)
+        if not same:
+            raise ValueError("statistics have different shapes or bins")
+        merged = WindStatistics(self.shape, self.bin_width, self.n_bins * self.bin_width,
+                                self.n_sectors, self.heights)
+        merged.periods = self.periods
+        for first, last in other.periods:
+            merged._add_period([first, last])
+        merged.count = self.count + other.count
+        merged.sums = self.sums + other.sums
+        merged.histogram = self.histogram + other.histogram
+        merged.sector_counts = self.sector_counts + other.sector_counts
+        return merged
+
+    def mean(self):
+        """Mean wind speed of every series."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.sums[..., 0] / self.count
+
+    def sector_frequencies(self):
+        """Fraction of samples in every direction sector."""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return self.sector_counts / self.sector_counts.sum(axis=-1, keepdims=True)
+
+    def _fraction_above(self, speed):
+        """
+        Fraction of samples above `speed` (per series), interpolated linearly
+        inside the histogram bin that contains it.
+        """
+        position = np.clip(np.nan_to_num(speed / self.bin_width), 0, self.n_bins)
+        full_bin = np.minimum(np.floor(position), self.n_bins - 1).astype(np.int64)
+        cumulative = np.cumsum(self.histogram, axis=-1)
+        below = np.take_along_axis(cumulative, full_bin[..., None], axis=-1)[..., 0]
+        in_bin = np.take_along_axis(self.histogram, full_bin[..., None], axis=-1)[..., 0]
+        below = below - in_bin * (1 - (position - full_bin))
+        return 1 - below / self.count
+
+    def weibull(self, method="wasp"):
+        """
+        Weibull parameters from the accumulated statistics.
+        method: "wasp" (mean of u^3 and frequency above the mean) or "moments".
+        Returns: k (shape), A (scale) arrays of the statistics' shape.
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self.mean()
+            if method == "moments":
+                var = self.sums[..., 1] / self.count - mean**2
+                return weibull_from_moments(mean, np.sqrt(np.maximum(var, 0)))
+            if method == "wasp":
+                mean_cube = self.sums[..., 2] / self.count
+                return weibull_from_energy(mean, mean_cube, self._fraction_above(mean))
+        raise ValueError(f"unknown method {method!r}; use 'wasp' or 'moments'")
+
+    def aep(self, turbines, method="wasp", availability=1.0):
+        """
+        AEP [kWh] from the Weibull fit of the statistics, see weibull_aep.
+        """
+        k, a = self.weibull(method)
+        return weibull_aep(turbines, k, a, availability=availability)
+
+    def save(self, path):
+        """Write the statistics to a .npz file."""
+        save_arrays(path, self.bin_width, count=self.count, sums=self.sums,
+                    histogram=self.histogram, sector_counts=self.sector_counts,
+                    periods=self.periods,
+                    heights=self.heights if self.heights is not None else np.empty(0))
+
+    @classmethod
+    def load(cls, path):
+        """Read statistics written by save()."""
+        bin_width, data = load_arrays(path)
+        heights = data["heights"] if data["heights"].size else None
+        stats = cls(data["count"].shape, bin_width, data["histogram"].shape[-1] * bin_width,
+                    data["sector_counts"].shape[-1], heights)
+        stats.count = data["count"]
+        stats.sums = data["sums"]
+        stats.histogram = data["histogram"]
+        stats.sector_counts = data["sector_counts"]
+        stats.periods = data["periods"]
+        return stats
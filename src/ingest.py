@@ -0,0 +1,99 @@
+"""
+Parallel ingestion of many NetCDF files into one WindGrid.
+
+Worker processes decode one file each, derive wind speed and the u/v
+components and write them straight into their time slice of a shared memory-mapped .npy
+file, so the time-ordered cube is assembled without a concat or an extra
+full-size copy.
+"""
+
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .grid import WindGrid, derive_wind_fields, site_window, wind_field_names
+from .profiling import profiled
+
+
+def _ingest_file(task):
+    """
+    Worker: derive the wind fields of one file into its slice of the output.
+    """
+    import xarray as xr
+    path, out_path, offset, lat_sel, lon_sel, heights, time_chunk = task
+    out = np.load(out_path, mmap_mode="r+")
+    components = [f"{c}{h}" for h in heights for c in ("u", "v")]
+    with xr.open_dataset(path) as ds:
+        subset = ds[components].isel(latitude=lat_sel, longitude=lon_sel)
+        n_steps = subset.sizes["valid_time"]
+        for start in range(0, n_steps, time_chunk):
+            stop = min(start + time_chunk, n_steps)
+            chunk = subset.isel(valid_time=slice(start, stop)).load()
+            derive_wind_fields(chunk, out[..., offset + start:offset + stop], heights)
+    out.flush()
+    return path
+
+
+@profiled("ingest_files")
+def ingest_files(file_paths, site=None, margin=0, workers=None, out_dir=None,
+                 heights=(10, 100), dtype=np.float32, time_chunk=8760):
+    """
+    Read NetCDF files in parallel into a WindGrid of wind speed and u/v
+    components (see wind_field_names).
+    - site, margin: optional grid window, as in nc_reader(..., lazy=True).
+    - workers: number of worker processes; None uses os.cpu_count() and 1
+      runs in this process.
+    - out_dir: directory for the memory-mapped values.npy. By default a
+      temporary file is used and removed once it is mapped.
+    Files may be given in any order; the grid is ordered by valid_time.
+    """
+    import xarray as xr
+    if isinstance(file_paths, str):
+        file_paths = [file_paths]
+    lat, lon = site if site is not None else (None, None)
+
+    # Coordinates only, to lay out every file's slice of the output
+    files = []
+    for path in file_paths:
+        with xr.open_dataset(path) as ds:
+            lat_sel = site_window(ds["latitude"].values, lat, margin)
+            lon_sel = site_window(ds["longitude"].values, lon, margin)
+            times = ds["valid_time"].values
+            if not files:
+                latitudes = ds["latitude"].values[lat_sel]
+                longitudes = ds["longitude"].values[lon_sel]
+            files.append((times[0] if times.size else np.datetime64("NaT"), path,
+                          times, lat_sel, lon_sel))
+    files.sort(key=lambda item: item[0])
+
+    times = np.concatenate([item[2] for item in files])
+    offsets = np.cumsum([0] + [item[2].size for item in files[:-1]])
+    variables = wind_field_names(heights)
+
+    if out_dir is None:
+        handle, out_path = tempfile.mkstemp(suffix=".npy")
+        os.close(handle)
+    else:
+        out_path = os.path.join(out_dir, "values.npy")
+    out = np.lib.format.open_memmap(out_path, mode="w+", dtype=dtype, shape=(
+        len(variables), latitudes.size, longitudes.size, times.size))
+    del out  # header written; workers open the file themselves
+
+    tasks = [(path, out_path, int(offset), lat_sel, lon_sel, tuple(heights), time_chunk)
+             for (_, path, _, lat_sel, lon_sel), offset in zip(files, offsets)]
+    if workers == 1:
+        for task in tasks:
+            _ingest_file(task)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_ingest_file, tasks))
+
+    values = np.load(out_path, mmap_mode="r")
+    if out_dir is None:
+        try:
+            os.remove(out_path)  # the mapping stays valid on POSIX
+        except OSError:
+            pass
+    return WindGrid(times, latitudes, longitudes, variables, values)
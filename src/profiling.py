@@ -0,0 +1,206 @@
+"""
+Stage-level instrumentation of the assessment pipeline.
+
+Pipeline functions are wrapped with @profiled(name). While a StageProfiler
+is active (used as a context manager), every call records wall time, CPU
+time, peak traced memory and row count; otherwise the wrapper only checks
+one global and calls the function directly.
+
+    with StageProfiler() as profiler:
+        grid = load_wind_grid(paths)
+        with profiler.stage("plotting"):
+            wind_rose(height_speed, 90)
+    profiler.to_json("outputs/profile.json")
+"""
+
+import functools
+import json
+import time
+import tracemalloc
+
+import pandas as pd
+
+_ACTIVE = None  # the StageProfiler in use, if any
+
+
+def _count_rows(result):
+    """
+    Row count of a stage result: rows of a DataFrame or array, summed over
+    the tables of a dict, time steps of a WindGrid; None otherwise.
+    """
+    if isinstance(result, (pd.DataFrame, pd.Series)):
+        return len(result)
+    if isinstance(result, dict):
+        counts = [_count_rows(value) for value in result.values()]
+        return sum(c for c in counts if c is not None)
+    if hasattr(result, "times") and hasattr(result, "values"):
+        return int(len(result.times))
+    if hasattr(result, "shape") and len(result.shape) > 0:
+        return int(result.shape[0])
+    return None
+
+
+class _Stage:
+    """
+    One running stage; `rows` may be set inside the with block.
+    """
+    def __init__(self, name, depth, rows=None):
+        self.name = name
+        self.depth = depth
+        self.rows = rows
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.memory_start = 0
+        self.memory_peak = 0
+
+
+class StageProfiler:
+    """
+    Records wall time, CPU time, peak memory and rows of every pipeline stage.
+    - memory: trace allocations with tracemalloc for the peak memory of each
+      stage (slows allocation-heavy stages down); False records only times.
+    - callback: optional function called with every finished record (dict).
+    Records of nested stages (e.g. nc_reader inside load_wind_grid) have a
+    larger depth; their peaks are included in the enclosing stage.
+    """
+    def __init__(self, memory=True, callback=None):
+        self.memory = memory
+        self.callbacks = [callback] if callback is not None else []
+        self.records = []
+        self._stack = []
+        self._started_tracing = False
+        self._previous = None
+
+    def start(self):
+        """
+        Activate the profiler (as entering the with block does). Returns self.
+        """
+        global _ACTIVE
+        self._previous, _ACTIVE = _ACTIVE, self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def stop(self):
+        """Deactivate the profiler; the records are kept."""
+        global _ACTIVE
+        _ACTIVE = self._previous
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def add_callback(self, callback):
+        """Call `callback(record)` for every finished stage."""
+        self.callbacks.append(callback)
+
+    def _start(self, name, rows=None):
+        stage = _Stage(name, len(self._stack), rows)
+        if self.memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            if self._stack:
+                parent = self._stack[-1]
+                parent.memory_peak = max(parent.memory_peak, peak)
+            tracemalloc.reset_peak()
+            stage.memory_start = stage.memory_peak = current
+        self._stack.append(stage)
+        return stage
+
+    def _finish(self, stage):
+        record = {"stage": stage.name, "depth": stage.depth,
+                  "wall [s]": time.perf_counter() - stage.wall,
+                  "cpu [s]": time.process_time() - stage.cpu,
+                  "peak memory [MB]": None, "rows": stage.rows}
+        self._stack.pop()
+        if self.memory and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            stage.memory_peak = max(stage.memory_peak, peak)
+            record["peak memory [MB]"] = (stage.memory_peak - stage.memory_start) / 2**20
+            if self._stack:
+                parent = self._stack[-1]
+                parent.memory_peak = max(parent.memory_peak, stage.memory_peak)
+        self.records.append(record)
+        for callback in self.callbacks:
+            callback(record)
+        return record
+
+    def stage(self, name, rows=None):
+        """
+        Context manager recording a user-defined stage, e.g. plotting.
+        The yielded stage's `rows` attribute may be set in the block.
+        """
+        return _StageContext(self, name, rows)
+
+    def report(self):
+        """
+        DataFrame of all records in the order the stages finished.
+        """
+        return pd.DataFrame(self.records, columns=["stage", "depth", "wall [s]", "cpu [s]",
+                                                   "peak memory [MB]", "rows"])
+
+    def summary(self):
+        """
+        Total wall and CPU time, largest peak and number of calls per stage.
+        """
+        return self.report().groupby("stage", sort=False).agg(
+            calls=("wall [s]", "size"), **{"wall [s]": ("wall [s]", "sum"),
+                                           "cpu [s]": ("cpu [s]", "sum"),
+                                           "peak memory [MB]": ("peak memory [MB]", "max")})
+
+    def to_json(self, path=None):
+        """
+        The records as a JSON string; also written to `path` if given.
+        """
+        text = json.dumps({"memory": self.memory, "stages": self.records}, indent=2)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+
+class _StageContext:
+    """
+    Context manager of StageProfiler.stage().
+    """
+    def __init__(self, profiler, name, rows):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+        self._stage = None
+
+    def __enter__(self):
+        self._stage = self.profiler._start(self.name, self.rows)
+        return self._stage
+
+    def __exit__(self, *exc):
+        self.profiler._finish(self._stage)
+        return False
+
+
+def profiled(name, rows=_count_rows):
+    """
+    Decorator recording calls of a pipeline function as stage `name` while a
+    StageProfiler is active. `rows(result)` gives the row count.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _ACTIVE
+            if profiler is None:
+                return func(*args, **kwargs)
+            stage = profiler._start(name)
+            try:
+                result = func(*args, **kwargs)
+                stage.rows = rows(result) if rows is not None else None
+                return result
+            finally:
+                profiler._finish(stage)
+        return wrapper
+    return decorator
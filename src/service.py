@@ -0,0 +1,177 @@
+"""
+Local asyncio query service that keeps a WindGrid in memory.
+
+Clients ask for the Weibull fit and AEP of a site, hub height and turbine
+over HTTP (TCP or a Unix socket):
+
+    GET /aep?lat=7.93&lon=55.65&height=90&turbine=NREL_Reference_5MW_126
+    GET /turbines
+    GET /health
+
+Answers are kept in an LRU cache. Queries that arrive while a batch is
+being collected are answered together by one assess_sites call, which
+interpolates all their sites and fits all their heights in one pass, in a
+worker thread so the event loop keeps accepting connections.
+"""
+
+import asyncio
+import json
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlsplit
+
+from .batch import assess_sites
+
+
+class WindService:
+    """
+    Answers site / height / turbine queries from a resident WindGrid.
+    - grid: WindGrid with 10 m and 100 m wind speeds, e.g. from load_wind_grid.
+    - turbines: dict of name -> turbine, or a list of named turbines.
+    - cache_size: number of answers kept in the LRU cache.
+    - batch_window: seconds a new batch waits for further queries.
+    Site coordinates are rounded to `decimals` for the cache key.
+    """
+    def __init__(self, grid, turbines, cache_size=1024, batch_window=0.005, decimals=4):
+        self.grid = grid
+        self.turbines = (dict(turbines) if isinstance(turbines, dict)
+                         else {t.name: t for t in turbines})
+        self.cache_size = cache_size
+        self.batch_window = batch_window
+        self.decimals = decimals
+        self._cache = OrderedDict()
+        self._pending = {}
+        self._batch = None
+        self.stats = {"queries": 0, "cache_hits": 0, "batches": 0}
+
+    def _key(self, lat, lon, height, turbine):
+        if turbine not in self.turbines:
+            raise KeyError(f"unknown turbine {turbine!r}")
+        inside = (min(self.grid.latitudes) <= lat <= max(self.grid.latitudes)
+                  and min(self.grid.longitudes) <= lon <= max(self.grid.longitudes))
+        if not inside:
+            raise ValueError(f"site ({lat}, {lon}) is outside the grid")
+        return (round(float(lat), self.decimals), round(float(lon), self.decimals),
+                float(height), turbine)
+
+    async def query(self, lat, lon, height, turbine):
+        """
+        Weibull parameters and AEP [kWh] of one site, height and turbine.
+        Returns a dict with latitude, longitude, height [m], turbine, k,
+        A [m/s] and aep [kWh].
+        """
+        key = self._key(lat, lon, height, turbine)
+        self.stats["queries"] += 1
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return self._cache[key]
+
+        if key not in self._pending:
+            self._pending[key] = asyncio.get_running_loop().create_future()
+            if self._batch is None:
+                self._batch = asyncio.ensure_future(self._run_batch())
+        return await asyncio.shield(self._pending[key])
+
+    async def _run_batch(self):
+        """
+        Collect queries for batch_window seconds, then answer them together.
+        """
+        await asyncio.sleep(self.batch_window)
+        pending, self._pending, self._batch = self._pending, {}, None
+        self.stats["batches"] += 1
+
+        try:
+            sites = sorted({key[:2] for key in pending})
+            heights = sorted({key[2] for key in pending})
+            names = sorted({key[3] for key in pending})
+            table = await asyncio.get_running_loop().run_in_executor(
+                None, assess_sites, self.grid, sites, heights,
+                [self.turbines[name] for name in names])
+
+            table["turbine"] = [names[n % len(names)] for n in range(len(table))]
+            for row in table.to_dict("records"):
+                key = (row["latitude"], row["longitude"], row["height [m]"], row["turbine"])
+                if key in pending:
+                    answer = {name: (float(value) if name != "turbine" else value)
+                              for name, value in row.items()}
+                    self._store(key, answer)
+                    pending.pop(key).set_result(answer)
+        except Exception as error:  # pylint: disable=broad-except
+            for future in pending.values():
+                future.set_exception(error)
+            return
+        # queries the table had no row for would otherwise wait forever
+        for key, future in pending.items():
+            future.set_exception(KeyError(f"no answer for {key}"))
+
+    def _store(self, key, answer):
+        self._cache[key] = answer
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def handle(self, reader, writer):
+        """
+        Answer one HTTP request on a connection.
+        """
+        try:
+            request_line = (await reader.readline()).decode("latin-1").split()
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass  # headers are not used
+            status, body = await self._route(request_line)
+        except Exception as error:  # pylint: disable=broad-except
+            status, body = 500, {"error": str(error)}
+        payload = json.dumps(body).encode()
+        writer.write(f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                     f"Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n"
+                     "Connection: close\r\n\r\n".encode() + payload)
+        await writer.drain()
+        writer.close()
+
+    async def _route(self, request_line):
+        if len(request_line) < 2 or request_line[0] != "GET":
+            return 405, {"error": "only GET is supported"}
+        url = urlsplit(request_line[1])
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        if url.path == "/health":
+            return 200, {"status": "ok", **self.stats, "cached": len(self._cache)}
+        if url.path == "/turbines":
+            return 200, {"turbines": list(self.turbines)}
+        if url.path == "/aep":
+            try:
+                answer = await self.query(float(params["lat"]), float(params["lon"]),
+                                          float(params.get("height", 100)), params["turbine"])
+            except (KeyError, ValueError) as error:
+                return 400, {"error": f"bad query: {error}"}
+            return 200, answer
+        return 404, {"error": f"unknown path {url.path}"}
+
+    async def start(self, host="127.0.0.1", port=8765, unix_path=None):
+        """
+        Start serving on host:port, or on the Unix socket unix_path.
+        Returns the asyncio server.
+        """
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.handle, path=unix_path)
+        return await asyncio.start_server(self.handle, host, port)
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            500: "Internal Server Error"}
+
+
+def serve(grid, turbines, host="127.0.0.1", port=8765, unix_path=None, **options):
+    """
+    Run a WindService until interrupted; options are passed to WindService.
+    """
+    service = WindService(grid, turbines, **options)
+
+    async def main():
+        server = await service.start(host, port, unix_path)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,67 @@
+"""
+Vertical wind profiles from the 10 m and 100 m reanalysis speeds.
+
+The shear is computed once per series and then applied to an array of
+heights in one broadcast, instead of one compute_power_law call per height.
+"""
+
+import numpy as np
+
+
+def vertical_profile(u1, u2, heights, z1=10, z2=100, method="power", shear="time", z0=None,
+                     dtype=float):
+    """
+    Wind speed at several heights from the speeds u1 at z1 and u2 at z2.
+    - u1, u2: arrays of shape (..., time).
+    - heights: target heights [m].
+    - method: "power" for the power law u2 * (z / z2)^alpha, or "log" for
+      the log law, which passes through both u1 and u2 unless a roughness
+      length z0 [m] is given, in which case u2 * ln(z / z0) / ln(z2 / z0).
+    - shear: "time" uses the shear of every time step; "mean" one shear per
+      series from the mean speeds, so the profile shape is constant in time.
+    - dtype: float dtype of the computation and result, e.g. np.float32 to
+      keep the precision of a float32 grid at half the memory.
+    Returns an array of shape (..., time, heights).
+    """
+    u1 = np.asarray(u1, dtype=dtype)
+    u2 = np.asarray(u2, dtype=dtype)
+    heights = np.atleast_1d(np.asarray(heights, dtype=dtype))
+    z1, z2 = float(z1), float(z2)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if shear == "mean":
+            ratio = np.nanmean(u2, axis=-1, keepdims=True) / np.nanmean(u1, axis=-1, keepdims=True)
+        elif shear == "time":
+            ratio = u2 / u1
+        else:
+            raise ValueError(f"unknown shear {shear!r}; use 'time' or 'mean'")
+
+        if method == "power":
+            alpha = np.log(ratio) / float(np.log(z2 / z1))
+            # a power, not exp(alpha * log): 1 ** inf is 1, so u2 is kept at z2 when u1 == 0
+            return u2[..., None] * (heights / z2) ** alpha[..., None]
+        if method == "log":
+            if z0 is not None:
+                return u2[..., None] * (np.log(heights / z0) / float(np.log(z2 / z0)))
+            # u(z) = u1 + (u2 - u1) ln(z / z1) / ln(z2 / z1), with u2 - u1 from the chosen shear
+            weight = np.log(heights / z1) / float(np.log(z2 / z1))
+            return u2[..., None] + (u2 * (1 - 1 / ratio))[..., None] * (weight - 1)
+        raise ValueError(f"unknown method {method!r}; use 'power' or 'log'")
+
+
+def direction_profile(d1, d2, heights, z1=10, z2=100):
+    """
+    Wind direction at several heights from the directions d1 at z1 and d2
+    at z2 [degrees]: the veer is linear in height along the shorter arc from
+    d1 to d2 (so 350 and 10 degrees give 0 halfway) up to z2, and the
+    direction equals d2 above it. Results are in [0, 360).
+    Returns an array of shape (..., time, heights).
+    """
+    d1 = np.asarray(d1, dtype=float)
+    d2 = np.asarray(d2, dtype=float)
+    weight = np.minimum((np.atleast_1d(np.asarray(heights, dtype=float)) - z1) / (z2 - z1), 1.0)
+    veer = d2 - d1
+    veer -= 360 * np.rint(veer / 360)  # shorter arc, in [-180, 180]
+    out = d1[..., None] + veer[..., None] * weight
+    out -= 360 * np.floor(out / 360)
+    return out
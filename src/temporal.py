@@ -0,0 +1,250 @@
+"""
+Diurnal, seasonal and year-over-year statistics of hourly series.
+
+TemporalStatistics reduces a series once to sums per (calendar month,
+hour of day) cell, keyed by integer month and hour numbers computed from
+valid_time: sample counts, speed sums and power sums. The cell array is
+aligned to whole years, so diurnal x monthly matrices, monthly and yearly
+values and rolling 12-month AEP are reshapes and sums of this small array
+instead of groupby passes over the full table. Energy per calendar
+month and year as totals is given by timeseries_aep.
+"""
+
+import numpy as np
+import pandas as pd
+
+# mean number of days of every calendar month, February with leap years
+_DAYS = np.array([31, 28.25, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+class TemporalStatistics:
+    """
+    Sums of wind speed and power per calendar month and hour of day.
+    - shape: leading shape of the series, e.g. () for one site or (sites,).
+    - turbine: optional turbine whose .get_power(u) [kW] gives the energy
+      statistics; without one only speeds are kept.
+    - utc_offset: hours added to valid_time (UTC for ERA5) before the hour
+      of day is taken, e.g. 1 for Danish winter time.
+    count, speed_sum and power_sum have shape shape + (months, 24), with
+    months running from January of the first year to December of the last.
+    """
+    def __init__(self, shape=(), turbine=None, availability=1.0, utc_offset=0):
+        self.shape = tuple(shape)
+        self.turbine = turbine
+        self.availability = float(availability)
+        self.utc_offset = utc_offset
+        self.first_year = None
+        self.step_hours = None
+        self.data_months = None  # first and last month index with data
+        self.count = np.zeros(self.shape + (0, 24), dtype=np.int64)
+        self.speed_sum = np.zeros(self.shape + (0, 24))
+        self.power_sum = np.zeros(self.shape + (0, 24))
+
+    @classmethod
+    def from_series(cls, times, speeds, turbine=None, availability=1.0, utc_offset=0):
+        """
+        Statistics of speeds of shape (..., time) at valid_time `times`, e.g.
+        the valid_time and wind_speed_at_{height}[m/s] columns of
+        compute_power_law.
+        """
+        speeds = np.asarray(speeds, dtype=float)
+        stats = cls(speeds.shape[:-1], turbine, availability, utc_offset)
+        return stats.update(times, speeds)
+
+    @property
+    def n_years(self):
+        """Number of calendar years spanned by the cell arrays."""
+        return self.count.shape[-2] // 12
+
+    @property
+    def years(self):
+        """Calendar years of the cell arrays."""
+        return np.arange(self.n_years) + (self.first_year or 0)
+
+    @property
+    def months(self):
+        """First day of every month of the cell arrays, as datetime64[M]."""
+        return (np.datetime64(f"{self.first_year or 1970}-01", "M")
+                + np.arange(self.count.shape[-2]))
+
+    def _calendar_hours(self):
+        """Hours in every month of the cell arrays."""
+        days = np.append(self.months, self.months[-1] + 1).astype("datetime64[D]")
+        return np.diff(days).astype(float) * 24
+
+    def _data_range(self):
+        if self.data_months is None:
+            raise ValueError("no samples have been added")
+        return self.data_months[0], self.data_months[1] + 1
+
+    def _extend(self, first_year, last_year):
+        """Pad the cell arrays with empty years to cover first_year..last_year."""
+        if self.first_year is None:
+            self.first_year = first_year
+        before = max(self.first_year - first_year, 0)
+        after = max(last_year - (self.first_year + self.n_years - 1), 0)
+        if before or after:
+            pad = [(0, 0)] * len(self.shape) + [(12 * before, 12 * after), (0, 0)]
+            self.count = np.pad(self.count, pad)
+            self.speed_sum = np.pad(self.speed_sum, pad)
+            self.power_sum = np.pad(self.power_sum, pad)
+            self.first_year -= before
+            if self.data_months is not None:
+                self.data_months = self.data_months + 12 * before
+
+    def update(self, times, speeds):
+        """
+        Add samples of shape shape + (time,); NaN speeds are skipped.
+        """
+        speeds = np.asarray(speeds, dtype=float)
+        if speeds.shape[:-1] != self.shape:
+            raise ValueError(f"speeds have shape {speeds.shape}, expected {self.shape} + (time,)")
+        times = np.asarray(times, dtype="datetime64[ns]") + np.timedelta64(
+            int(round(self.utc_offset * 3600)), "s")
+        if times.size == 0:
+            return self
+        if self.step_hours is None:
+            self.step_hours = (np.median(np.diff(np.sort(times))) / np.timedelta64(1, "h")
+                               if times.size > 1 else 1.0)
+
+        # integer keys: months since 1970 and hour of day
+        month = times.astype("datetime64[M]").astype(np.int64)
+        hour = (times - times.astype("datetime64[D]")) // np.timedelta64(1, "h")
+        self._extend(1970 + int(month.min()) // 12, 1970 + int(month.max()) // 12)
+        month -= 12 * (self.first_year - 1970)
+        span = np.array([month.min(), month.max()])
+        self.data_months = span if self.data_months is None else np.array(
+            [min(self.data_months[0], span[0]), max(self.data_months[1], span[1])])
+
+        n_cells = self.count.shape[-2] * 24
+        n_series = int(np.prod(self.shape, dtype=np.int64))
+        valid = np.isfinite(speeds).reshape(n_series, -1)
+        u = np.where(valid, speeds.reshape(n_series, -1), 0.0)
+        cell = (np.arange(n_series)[:, None] * n_cells + month * 24 + hour)
+        cell = np.where(valid, cell, n_series * n_cells).ravel()  # the last id collects NaNs
+        size = n_series * n_cells + 1
+        cell_shape = self.count.shape
+
+        self.count += np.bincount(cell, minlength=size)[:-1].reshape(cell_shape)
+        self.speed_sum += np.bincount(cell, u.ravel(), size)[:-1].reshape(cell_shape)
+        if self.turbine is not None:
+            power = np.asarray(self.turbine.get_power(u), dtype=float)
+            self.power_sum += np.bincount(cell, np.where(valid, power, 0.0).ravel(),
+                                          size)[:-1].reshape(cell_shape)
+        return self
+
+    def _by_year(self, values):
+        """Cell array reshaped to shape + (years, 12, 24)."""
+        return values.reshape(self.shape + (self.n_years, 12, 24))
+
+    def _check_power(self):
+        if self.turbine is None:
+            raise ValueError("energy statistics need a turbine")
+
+    def diurnal_monthly(self, quantity="speed"):
+        """
+        Matrix of calendar month x hour of day, shape shape + (12, 24).
+        - quantity: "speed" for the mean speed [m/s], "power" for the mean
+          power [kW], or "energy" for the energy [kWh] of an average year
+          produced in that month and hour, with every month weighted by its
+          length, so the matrix sums to the AEP of a seasonally balanced year.
+        Cells without samples are NaN.
+        """
+        count = self._by_year(self.count).sum(axis=-3)
+        if quantity == "speed":
+            total = self._by_year(self.speed_sum).sum(axis=-3)
+        elif quantity in ("power", "energy"):
+            self._check_power()
+            total = self._by_year(self.power_sum).sum(axis=-3)
+        else:
+            raise ValueError(f"unknown quantity {quantity!r}; use 'speed', 'power' or 'energy'")
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+        if quantity == "energy":
+            # hours per average year in every (month, hour) cell, 8760 in total
+            mean = self.availability * mean * (_DAYS * 8760 / 365.25 / 24)[:, None]
+        return mean
+
+    def _window_sums(self, values, window):
+        """Sums over `window` consecutive months, shape shape + (months - window + 1,)."""
+        cumulative = np.cumsum(values, axis=-1)
+        cumulative = np.concatenate([np.zeros(cumulative.shape[:-1] + (1,)), cumulative], axis=-1)
+        return cumulative[..., window:] - cumulative[..., :-window]
+
+    def _frame(self, columns, index, name):
+        """
+        DataFrame of arrays of shape shape + (n,): indexed by `index` for one
+        series, by (series index..., index) for several.
+        """
+        if self.shape == ():
+            full = pd.Index(index, name=name)
+        else:
+            full = pd.MultiIndex.from_product(
+                [range(n) for n in self.shape] + [index],
+                names=[f"series_{n}" for n in range(len(self.shape))] + [name])
+        return pd.DataFrame({key: np.ravel(value) for key, value in columns.items()},
+                            index=full)
+
+    def monthly(self):
+        """
+        Mean speed [m/s], mean power [kW] (with a turbine) and coverage of
+        every month with data.
+        """
+        first, end = self._data_range()
+        count = self.count.sum(axis=-1)[..., first:end]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            columns = {"mean speed [m/s]": self.speed_sum.sum(axis=-1)[..., first:end] / count}
+            if self.turbine is not None:
+                columns["mean power [kW]"] = self.power_sum.sum(axis=-1)[..., first:end] / count
+        columns["coverage"] = count * self.step_hours / self._calendar_hours()[first:end]
+        return self._frame(columns, pd.DatetimeIndex(self.months[first:end]), "month")
+
+    def rolling_aep(self, window=12, min_coverage=0.9):
+        """
+        AEP [kWh] of every run of `window` consecutive months, indexed by the
+        last month of the window: 8760 h times the mean power of the window.
+        Windows whose coverage (sampled / calendar hours) is below
+        min_coverage are NaN.
+        """
+        self._check_power()
+        first, end = self._data_range()
+        if end - first < window:
+            raise ValueError(f"the data cover {end - first} months, fewer than {window}")
+        samples = self._window_sums(self.count.sum(axis=-1)[..., first:end].astype(float), window)
+        power = self._window_sums(self.power_sum.sum(axis=-1)[..., first:end], window)
+        coverage = (samples * self.step_hours
+                    / self._window_sums(self._calendar_hours()[first:end], window))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            aep = self.availability * 8760 * power / samples
+        aep = np.where(coverage >= min_coverage, aep, np.nan)
+        return self._frame({"aep [kWh]": aep, "coverage": coverage},
+                           pd.DatetimeIndex(self.months[first + window - 1:end]), "month")
+
+    def yearly(self, min_coverage=0.9):
+        """
+        Year-over-year table: mean speed [m/s], AEP [kWh] (with a turbine),
+        coverage, change of the AEP from the previous year [%] and the AEP
+        relative to the mean power of all years (the energy index).
+        Years whose coverage is below min_coverage have NaN AEP.
+        """
+        first, end = self._data_range()
+        years = slice(first // 12, (end - 1) // 12 + 1)
+        count = self._by_year(self.count).sum(axis=(-2, -1))[..., years]
+        hours = self._calendar_hours().reshape(-1, 12).sum(axis=-1)[years]
+        coverage = count * self.step_hours / hours
+        with np.errstate(invalid="ignore", divide="ignore"):
+            columns = {"mean speed [m/s]": (self._by_year(self.speed_sum).sum(axis=(-2, -1))
+                                            [..., years] / count),
+                       "coverage": coverage}
+            if self.turbine is not None:
+                power_sum = self._by_year(self.power_sum).sum(axis=(-2, -1))[..., years]
+                aep = self.availability * 8760 * power_sum / count
+                long_term = (self.availability * 8760 * power_sum.sum(axis=-1, keepdims=True)
+                             / count.sum(axis=-1, keepdims=True))
+                aep = np.where(coverage >= min_coverage, aep, np.nan)
+                previous = np.concatenate([np.full(self.shape + (1,), np.nan), aep[..., :-1]],
+                                          axis=-1)
+                columns["aep [kWh]"] = aep
+                columns["change [%]"] = 100 * (aep / previous - 1)
+                columns["energy index"] = aep / long_term
+        return self._frame(columns, self.years[years], "year")
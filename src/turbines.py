@@ -0,0 +1,178 @@
+"""
+Turbine curve lookup tables and a registry of turbine types.
+
+Power, Cp and Ct curves are loaded once per CSV file and compiled into
+tables on a uniform speed grid, so evaluating a curve is an index
+computation and one linear blend per sample instead of a binary search.
+Several curves compiled on a common grid are evaluated together into a
+(curves, samples) array.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+_CSV_CACHE = {}
+
+
+def read_curve_csv(path):
+    """
+    DataFrame of a turbine CSV, read once per (path, size, mtime). The
+    returned frame is shared between callers and must not be modified.
+    """
+    info = os.stat(path)
+    key = (os.path.abspath(path), info.st_size, info.st_mtime_ns)
+    if key not in _CSV_CACHE:
+        _CSV_CACHE[key] = pd.read_csv(path)
+    return _CSV_CACHE[key]
+
+
+def _uniform_step(knots, max_points):
+    """
+    Largest step min_spacing / m that puts every knot on a uniform grid
+    starting at knots[0], or None if that needs more than max_points points.
+    """
+    spacing = np.diff(knots)
+    smallest = spacing[spacing > 0].min()
+    span = knots[-1] - knots[0]
+    divisor = 1
+    while span / (smallest / divisor) <= max_points:
+        position = (knots - knots[0]) / (smallest / divisor)
+        if np.allclose(position, np.round(position), rtol=0, atol=1e-6):
+            return smallest / divisor
+        divisor += 1
+    return None
+
+
+class CurveTable:
+    """
+    Piecewise-linear curves tabulated on a uniform speed grid.
+    - speeds: knot speeds of one curve, or a list of knot arrays.
+    - values: values at the knots, or a list of value arrays.
+    - max_points: grid size limit. When all knots fit on a uniform grid
+      within the limit, evaluation equals np.interp exactly; otherwise the
+      curves are resampled at max_points points.
+    Outside the knots the end values are held, as np.interp does.
+    """
+    def __init__(self, speeds, values, max_points=100_000):
+        single = np.ndim(speeds[0]) == 0
+        speeds = [np.asarray(speeds, dtype=float)] if single else [
+            np.asarray(s, dtype=float) for s in speeds]
+        values = [np.asarray(values, dtype=float)] if single else [
+            np.asarray(v, dtype=float) for v in values]
+        knots = np.unique(np.concatenate(speeds))
+
+        self.start = knots[0]
+        self.step = _uniform_step(knots, max_points)
+        self.exact = self.step is not None
+        if not self.exact:
+            self.step = (knots[-1] - knots[0]) / (max_points - 1)
+        n_points = int(round((knots[-1] - knots[0]) / self.step)) + 1
+        self.grid = self.start + self.step * np.arange(n_points)
+        table = np.stack([np.interp(self.grid, s, v) for s, v in zip(speeds, values)])
+        self.table = table[0] if single else table
+        # one gather of value and slope per sample
+        self._slope = np.diff(self.table, axis=-1) if n_points > 1 else np.zeros_like(self.table)
+        self._inverse_step = 1 / self.step if n_points > 1 else 0.0
+
+    @property
+    def n_curves(self):
+        """Number of curves, 1 for a single curve."""
+        return 1 if self.table.ndim == 1 else self.table.shape[0]
+
+    def __call__(self, speeds):
+        """
+        Curve values at `speeds`: the shape of speeds for a single curve, or
+        (curves,) + shape of speeds for several.
+        """
+        speeds = np.asarray(speeds, dtype=float)
+        position = np.clip((speeds - self.start) * self._inverse_step, 0, self.grid.size - 1)
+        with np.errstate(invalid="ignore"):  # NaN speeds stay NaN through the fraction
+            index = np.clip(position.astype(np.intp), 0, self._slope.shape[-1] - 1)
+        return (self.table[..., index] + self._slope[..., index] * (position - index))[()]
+
+
+class TurbineRegistry:
+    """
+    Named turbine types with their power, Cp and Ct curves.
+    Every CSV is read once, and every curve is compiled into a CurveTable
+    on first use and kept.
+    """
+    def __init__(self):
+        self._specs = {}
+        self._tables = {}
+
+    def register(self, name, path, rotor_diameter=None, hub_height=None, rated_power=None,
+                 v_in=None, v_rated=None, v_out=None):
+        """
+        Add a turbine type from a CSV with speed, power [kW] and optionally
+        Cp and Ct columns. Missing parameters follow from the power curve.
+        """
+        self._specs[name] = {"path": path, "rotor_diameter": rotor_diameter,
+                             "hub_height": hub_height, "rated_power": rated_power,
+                             "v_in": v_in, "v_rated": v_rated, "v_out": v_out}
+        self._tables = {key: table for key, table in self._tables.items() if name not in key}
+        return self
+
+    def register_directory(self, directory, pattern=".csv"):
+        """Register every CSV in `directory` under its file name without extension."""
+        for file_name in sorted(os.listdir(directory)):
+            if file_name.endswith(pattern):
+                self.register(os.path.splitext(file_name)[0], os.path.join(directory, file_name))
+        return self
+
+    @property
+    def names(self):
+        """Names of the registered turbine types."""
+        return list(self._specs)
+
+    def data(self, name, kind="power"):
+        """
+        (speeds, values) of the curve `kind` ("power", "cp" or "ct") of a turbine.
+        """
+        df = read_curve_csv(self._specs[name]["path"])
+        columns = {column.split(" ")[0].lower(): column for column in df.columns}
+        column = columns.get(kind, df.columns[1] if kind == "power" else None)
+        if column is None:
+            raise KeyError(f"{name} has no {kind} curve")
+        return df.iloc[:, 0].to_numpy(dtype=float), df[column].to_numpy(dtype=float)
+
+    def table(self, names, kind="power"):
+        """
+        CurveTable of one turbine, or of several on a common grid.
+        """
+        key = (kind,) + ((names,) if isinstance(names, str) else tuple(names))
+        if key not in self._tables:
+            if isinstance(names, str):
+                self._tables[key] = CurveTable(*self.data(names, kind))
+            else:
+                curves = [self.data(name, kind) for name in names]
+                self._tables[key] = CurveTable([c[0] for c in curves], [c[1] for c in curves])
+        return self._tables[key]
+
+    def evaluate(self, speeds, names=None, kind="power"):
+        """
+        Curve values of many turbines (all registered ones by default) at
+        once. Returns an array of shape (turbines,) + speeds.shape.
+        """
+        names = self.names if names is None else list(names)
+        return self.table(names, kind)(speeds)
+
+    def turbine(self, name):
+        """
+        WindTurbine of a registered type; its get_power uses the registry's
+        compiled table.
+        """
+        from . import WindTurbine
+        spec = self._specs[name]
+        speeds, power = self.data(name)
+        rated = spec["rated_power"] if spec["rated_power"] is not None else float(power.max())
+        defaults = {"v_in": float(speeds[power > 0].min()),
+                    "v_rated": float(speeds[np.argmax(power >= rated)]),
+                    "v_out": float(speeds.max())}
+        v = {key: spec[key] if spec[key] is not None else value for key, value in defaults.items()}
+        turbine = WindTurbine(spec["rotor_diameter"], spec["hub_height"], rated, v["v_in"],
+                              v["v_rated"], v["v_out"], np.column_stack((speeds, power)), name)
+        turbine.lookup = self.table(name)
+        return turbine
@@ -0,0 +1,138 @@
+"""
+Block-bootstrap uncertainty of the AEP.
+
+The hourly series is reduced once to per-block (year or month)
+statistics: sample counts, sums of u, u^2 and u^3, a speed histogram and
+the energy of every turbine. A resample is then a vector of block counts,
+so a batch of resamples is one matrix product with the block statistics,
+followed by a vectorised Weibull fit and AEP for all resamples at once.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .aep import weibull_aep
+from .incremental import WindStatistics, group_counts, speed_bins
+
+
+def _block_statistics(times, speeds, turbines, block, bin_width, max_speed):
+    """
+    Per-block statistics of a series: (stats, energy, hours, strata) where
+    stats is a WindStatistics of shape (blocks,), energy (turbines, blocks)
+    the mean power [kW] times hours, and strata the group every block is
+    drawn from (all 0 for years, the calendar month for months).
+    """
+    times = np.asarray(times, dtype="datetime64[ns]")
+    speeds = np.asarray(speeds, dtype=float)
+    month_key = times.astype("datetime64[M]").astype(np.int64)
+    if block == "year":
+        key = month_key // 12
+    elif block == "month":
+        key = month_key
+    else:
+        raise ValueError(f"unknown block {block!r}; use 'year' or 'month'")
+
+    keys, inverse = np.unique(key, return_inverse=True)
+    n_blocks = keys.size
+    valid = np.isfinite(speeds)
+    u = np.where(valid, speeds, 0.0)
+    block_id = np.where(valid, inverse, n_blocks)  # the last id collects missing samples
+
+    stats = WindStatistics((n_blocks,), bin_width, max_speed)
+    stats.count = np.bincount(block_id, minlength=n_blocks + 1)[:-1]
+    stats.sums = np.stack([np.bincount(block_id, u**p, n_blocks + 1)[:-1] for p in (1, 2, 3)],
+                          axis=-1)
+    stats.histogram = group_counts(inverse, speed_bins(u, stats.bin_width, stats.n_bins), valid,
+                                   n_blocks, stats.n_bins)
+
+    step_hours = (np.median(np.diff(np.sort(times))) / np.timedelta64(1, "h")
+                  if times.size > 1 else 1.0)
+    power = np.stack([np.asarray(t.get_power(u), dtype=float) for t in turbines])
+    energy = np.stack([np.bincount(block_id, np.where(valid, p, 0.0), n_blocks + 1)[:-1]
+                       for p in power]) * step_hours
+    hours = stats.count * step_hours
+    strata = keys % 12 if block == "month" else np.zeros(n_blocks, dtype=np.int64)
+    return stats, energy, hours, strata
+
+
+def _resample_weights(strata, n_resamples, rng):
+    """
+    Block counts of every resample, shape (resamples, blocks): each stratum
+    draws as many of its own blocks, with replacement, as it has.
+    """
+    weights = np.zeros((n_resamples, strata.size), dtype=np.int64)
+    rows = np.arange(n_resamples)[:, None]
+    for stratum in np.unique(strata):
+        members = np.flatnonzero(strata == stratum)
+        draws = members[rng.integers(0, members.size, (n_resamples, members.size))]
+        np.add.at(weights, (np.broadcast_to(rows, draws.shape), draws), 1)
+    return weights
+
+
+def _bootstrap_batch(task):
+    """
+    Worker: AEP [kWh] of a batch of resamples, shape (turbines, resamples).
+    """
+    stats, energy, hours, weights, turbines, estimator, method, availability = task
+    if estimator == "timeseries":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return availability * 8760 * (energy @ weights.T) / (hours @ weights.T)
+
+    resampled = WindStatistics((weights.shape[0],), stats.bin_width,
+                               stats.n_bins * stats.bin_width)
+    resampled.count = weights @ stats.count
+    resampled.sums = weights @ stats.sums
+    resampled.histogram = weights @ stats.histogram
+    k, a = resampled.weibull(method)
+    return weibull_aep(list(turbines), k, a, availability=availability)
+
+
+def bootstrap_aep(turbines, times, speeds, n_resamples=1000, block="year",
+                  estimator="weibull", method="wasp", availability=1.0,
+                  probabilities=(50, 75, 90), seed=None, workers=1, batch_size=500,
+                  bin_width=0.1, max_speed=40.0):
+    """
+    Block-bootstrap distribution of the AEP from an hourly hub-height series,
+    e.g. the valid_time and wind_speed_at_{height}[m/s] columns of
+    compute_power_law.
+    - turbines: a turbine or a list of turbines.
+    - block: "year" resamples whole years; "month" resamples every calendar
+      month from the same month of other years, which keeps the seasons.
+    - estimator: "weibull" fits Weibull parameters to every resample
+      (method "wasp" or "moments", see WindStatistics.weibull) and
+      integrates the power curve; "timeseries" uses the mean power.
+    - probabilities: exceedance levels; P90 is the AEP exceeded with 90 %
+      probability.
+    - workers: processes the batches of batch_size resamples are spread
+      over; 1 runs in this process, None uses os.cpu_count().
+    Returns (summary, samples): a DataFrame with the point estimate, mean,
+    standard deviation and P-values [kWh] per turbine, and the AEP of every
+    resample, shape (turbines, n_resamples).
+    """
+    turbines = list(turbines) if isinstance(turbines, (list, tuple)) else [turbines]
+    names = [t.name or f"turbine_{n}" for n, t in enumerate(turbines)]
+    stats, energy, hours, strata = _block_statistics(times, speeds, turbines, block,
+                                                     bin_width, max_speed)
+
+    rng = np.random.default_rng(seed)
+    weights = _resample_weights(strata, n_resamples, rng)
+    tasks = [(stats, energy, hours, batch, turbines, estimator, method, availability)
+             for batch in np.array_split(weights, max(1, -(-n_resamples // batch_size)))]
+    if workers == 1:
+        results = [_bootstrap_batch(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_bootstrap_batch, tasks))
+    samples = np.concatenate([np.reshape(r, (len(turbines), -1)) for r in results], axis=1)
+
+    point = _bootstrap_batch((stats, energy, hours, np.ones((1, strata.size)), turbines,
+                              estimator, method, availability)).reshape(len(turbines))
+    summary = pd.DataFrame({"aep [kWh]": point,
+                            "mean [kWh]": np.nanmean(samples, axis=1),
+                            "std [kWh]": np.nanstd(samples, axis=1)},
+                           index=pd.Index(names, name="turbine"))
+    for p in probabilities:
+        summary[f"P{p} [kWh]"] = np.nanpercentile(samples, 100 - p, axis=1)
+    return summary, samples
@@ -0,0 +1,160 @@
+"""
+Vectorised 2-parameter Weibull estimation for many wind-speed series at once.
+"""
+
+import numpy as np
+from scipy.special import gamma, gammaln
+
+
+def _bisect(func, lo, hi, n_iter=60):
+    """
+    Vectorised bisection for increasing func on [lo, hi], element-wise.
+    """
+    lo = np.full(np.shape(func(lo)), lo, dtype=float)
+    hi = np.full(lo.shape, hi, dtype=float)
+    for _ in range(n_iter):
+        mid = np.sqrt(lo * hi)  # bisect in log(k)
+        above = func(mid) > 0
+        hi = np.where(above, mid, hi)
+        lo = np.where(above, lo, mid)
+    return np.sqrt(lo * hi)
+
+
+def weibull_from_moments(mean, std):
+    """
+    Method-of-moments Weibull parameters from the mean and standard
+    deviation of the wind speed (arrays of any shape).
+    k solves Gamma(1 + 2/k) / Gamma(1 + 1/k)^2 = 1 + (std / mean)^2.
+    Returns: k (shape), A (scale).
+    """
+    mean, std = np.asarray(mean, dtype=float), np.asarray(std, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        target = np.log1p((std / mean) ** 2)
+
+        def excess(k):
+            # ln(Gamma ratio) falls with k; the sign is flipped to make it increasing
+            return target - (gammaln(1 + 2 / k) - 2 * gammaln(1 + 1 / k))
+
+        k = _bisect(excess, 0.05, 100.0)
+        k = np.where(np.isfinite(target), k, np.nan)
+        a = mean / gamma(1 + 1 / k)
+    return k, a
+
+
+def weibull_from_energy(mean, mean_cube, p_exceed_mean):
+    """
+    WAsP-style Weibull parameters that preserve the mean power density
+    (mean of u^3) and the observed probability of exceeding the mean speed.
+    - mean, mean_cube: mean of u and of u^3.
+    - p_exceed_mean: fraction of samples above the mean speed.
+    Returns: k (shape), A (scale).
+    """
+    mean = np.asarray(mean, dtype=float)
+    mean_cube = np.asarray(mean_cube, dtype=float)
+    p_exceed_mean = np.asarray(p_exceed_mean, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        target = np.log(-np.log(p_exceed_mean))
+
+        def scale(k):
+            return (mean_cube / gamma(1 + 3 / k)) ** (1 / 3)
+
+        def excess(k):
+            # k ln(mean / A(k)) = ln(-ln P(u > mean)) for the fitted distribution
+            return target - k * np.log(mean / scale(k))
+
+        k = _bisect(excess, 0.05, 100.0)
+        k = np.where(np.isfinite(target) & (mean > 0), k, np.nan)
+        a = scale(k)
+    return k, a
+
+
+def fit_weibull_batch(speed_data, method="mle", tol=1e-10, max_iter=50):
+    """
+    Fit a 2-parameter Weibull (loc=0) to every series of `speed_data` at once.
+    - speed_data: array of shape (..., time). NaN values are ignored per
+      series; series with fewer than two valid samples give NaN.
+    - method:
+      "mle": maximum likelihood, a Newton iteration on k for all series at
+      once (same estimate as weibull_min.fit(floc=0)); zero speeds are ignored.
+      "moments": match the mean and standard deviation.
+      "wasp": match the mean of u^3 and the frequency above the mean speed.
+    Returns: k (shape), A (scale), both with the leading shape of speed_data.
+    """
+    x = np.asarray(speed_data, dtype=float)
+    return _fit(x, method, lambda v: v.sum(axis=-1), lambda v: v[..., None], tol, max_iter)
+
+
+def fit_weibull_grouped(speed_data, groups, n_groups, method="mle", tol=1e-10, max_iter=50):
+    """
+    Fit a 2-parameter Weibull to every group of samples at once, e.g. to
+    every (series, direction sector) pair, without splitting the data.
+    - speed_data: 1-D array of samples; NaN values are ignored.
+    - groups: integer group of every sample, in [0, n_groups).
+    - method: as in fit_weibull_batch.
+    Returns: k (shape), A (scale), arrays of length n_groups.
+    """
+    x = np.asarray(speed_data, dtype=float).ravel()
+    groups = np.asarray(groups).ravel()
+    return _fit(x, method,
+                lambda v: np.bincount(groups, np.ravel(v), minlength=n_groups),
+                lambda v: v[groups], tol, max_iter)
+
+
+def _fit(x, method, total, spread, tol, max_iter):
+    """
+    Weibull fit of the samples in x, reduced to one estimate per series.
+    total(v) sums sample values per series and spread(s) maps per-series
+    values back onto the samples.
+    """
+    if method == "mle":
+        return _fit_mle(x, total, spread, tol, max_iter)
+
+    valid = np.isfinite(x)
+    n = total(valid)
+    x0 = np.where(valid, x, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(n >= 2, total(x0) / n, np.nan)
+        if method == "moments":
+            var = total((x0 - spread(mean)) ** 2 * valid) / n
+            return weibull_from_moments(mean, np.sqrt(var))
+        if method == "wasp":
+            mean_cube = total(x0 ** 3) / n
+            p_exceed = total(x0 > spread(mean)) / n
+            return weibull_from_energy(mean, mean_cube, p_exceed)
+    raise ValueError(f"unknown method {method!r}; use 'mle', 'moments' or 'wasp'")
+
+
+def _fit_mle(x, total, spread, tol, max_iter):
+    """
+    Maximum-likelihood Weibull fit, see _fit.
+    """
+    valid = np.isfinite(x) & (x > 0)
+    n = total(valid)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        log_x = np.where(valid, np.log(np.where(valid, x, 1.0)), 0.0)
+        # Work with y = x / g (g: geometric mean), so mean(ln y) = 0 and y**k cannot overflow
+        log_g = total(log_x) / n
+        log_y = np.where(valid, log_x - spread(log_g), 0.0)
+        log_y2 = log_y**2
+
+        # Starting guess from the variance of ln x, which is pi^2 / (6 k^2)
+        k = np.pi / np.sqrt(6 * total(log_y2) / n)
+        k = np.where(n >= 2, k, np.nan)
+
+        for _ in range(max_iter):
+            w = np.where(valid, np.exp(spread(k) * log_y), 0.0)
+            s0 = total(w)
+            s1 = total(w * log_y) / s0
+            s2 = total(w * log_y2) / s0
+
+            # Likelihood equation: s1 - 1/k - mean(ln y) = 0; its derivative is > 0
+            step = (s1 - 1 / k) / (s2 - s1**2 + 1 / k**2)
+            k = np.maximum(k - step, 0.5 * k)
+            if not np.any(np.abs(step) > tol * k):
+                break
+
+        s0 = total(np.where(valid, np.exp(spread(k) * log_y), 0.0))
+        a = np.exp(log_g) * (s0 / n) ** (1 / k)
+
+    return k, a
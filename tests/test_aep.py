@@ -0,0 +1,73 @@
+# tests/test_aep.py
+
+import sys, os
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.integrate import quad
+from scipy.stats import weibull_min
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import GeneralWindTurbine, WindTurbine, timeseries_aep, weibull_aep
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def quad_aep(turbine, k, a, u_in, u_out):
+    # reference: the adaptive quadrature compute_aep used before
+    def integrand(u):
+        return turbine.get_power(u) * weibull_min.pdf(u, k, scale=a)
+    points = getattr(turbine, "power_curve_data", np.empty((0, 1)))[:, 0]
+    points = points[(points > u_in) & (points < u_out)]
+    energy, _ = quad(integrand, u_in, u_out, points=points, limit=200)
+    return 8760 * energy
+
+
+@pytest.fixture
+def turbines():
+    curve = pd.read_csv(os.path.join(ROOT, "inputs", "NREL_Reference_5MW_126.csv")).iloc[:, :2].values
+    detailed = WindTurbine(126, 90, 5000, 3.0, 11.4, 25.0, curve, "5MW")
+    general = GeneralWindTurbine(126, 90, 5000, 3.0, 11.4, 25.0, "general")
+    return [detailed, general]
+
+
+def test_weibull_aep_matches_quad(turbines):
+    k = np.array([[1.6, 2.0, 2.6]])
+    a = np.array([[6.0], [9.5]])
+    aep = weibull_aep(turbines, k, a)
+    assert aep.shape == (2, 2, 3)
+    for t, turbine in enumerate(turbines):
+        for i in range(2):
+            for j in range(3):
+                ref = quad_aep(turbine, k[0, j], a[i, 0], 3.0, 25.0)
+                tol = 1e-7 if t == 0 else 1e-5
+                assert pytest.approx(ref, rel=tol) == aep[t, i, j]
+
+    # single turbine gives the broadcast shape of (k, a)
+    assert weibull_aep(turbines[0], 2.0, 8.0).shape == ()
+    assert np.isnan(weibull_aep(turbines[0], [np.nan, 2.0], 8.0)[0])
+
+
+def test_weibull_aep_infinite_limit():
+    class Const:
+        def get_power(self, u): return 1.0
+    aep = weibull_aep(Const(), k=[1.5, 2.0, 3.0], a=8.0, u_in=0.0, u_out=np.inf)
+    np.testing.assert_allclose(aep, 8760, rtol=1e-9)
+
+
+def test_timeseries_aep(turbines):
+    times = pd.date_range("2001-01-01", "2002-12-31 23:00", freq="h")
+    speeds = np.full(times.size, 11.4)
+    speeds[:10] = np.nan
+    summary, yearly, monthly = timeseries_aep(turbines, times[::-1], speeds[::-1])
+
+    general = summary.loc["general"]
+    assert pytest.approx(5000 * 8760) == general["aep [kWh]"]
+    assert pytest.approx(1.0) == general["capacity_factor"]
+    assert list(yearly.index) == [2001, 2002]
+    assert len(monthly) == 24 and monthly.index.names == ["year", "month"]
+    # energy in the breakdowns adds up, missing hours excluded
+    assert pytest.approx(5000 * (times.size - 10)) == yearly["general"].sum()
+    np.testing.assert_allclose(monthly.groupby(level="year").sum(), yearly)
+    assert pytest.approx(5000 * 31 * 24) == monthly.loc[(2002, 1), "general"]
@@ -0,0 +1,47 @@
+# tests/test_batch.py
+
+import sys, os
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import (WindGrid, WindTurbine, interpolation, compute_power_law, fit_weibull,
+                 compute_aep, assess_sites)
+
+
+def test_assess_sites_matches_single_site_pipeline():
+    rng = np.random.default_rng(4)
+    lats, lons = np.array([8.0, 7.75]), np.array([55.5, 55.75])
+    n_time = 3000
+    u10 = rng.weibull(2.0, size=(2, 2, n_time)) * 7 + 0.1
+    u100 = u10 * rng.uniform(1.05, 1.3, size=(2, 2, 1))
+    direction = rng.uniform(0, 360, size=(2, 2, n_time))
+    grid = WindGrid(np.arange(n_time), lats, lons,
+                    ["wind_speed_10m [m/s]", "wind_speed_100m [m/s]",
+                     "wind_direction_10m [degrees]", "wind_direction_100m [degrees]"],
+                    np.stack([u10, u100, direction, direction]))
+
+    curve = np.column_stack((np.arange(3, 26), np.minimum(np.arange(3, 26) ** 3, 5000)))
+    turbine = WindTurbine(126, 90, 5000, 3, 11.4, 25, curve, "T")
+
+    sites = [(7.93, 55.65), (7.8, 55.6)]
+    out = assess_sites(grid, sites, heights=[90, 120], turbines=[turbine])
+    assert len(out) == 4
+    assert list(out["height [m]"]) == [90, 120, 90, 120]
+
+    table = interpolation(7.93, 55.65, grid)
+    speed = compute_power_law(table, 120)["wind_speed_at_120[m/s]"].to_numpy()
+    k, a = fit_weibull(speed)
+    aep = compute_aep(turbine, k, a, turbine.v_in, turbine.v_out)
+    row = out.iloc[1]
+    assert pytest.approx(k, rel=1e-4) == row["k"]
+    assert pytest.approx(a, rel=1e-4) == row["A [m/s]"]
+    assert pytest.approx(aep, rel=1e-4) == row["aep [kWh]"]
+
+    # a budget of one site per chunk, and a float32 grid, give the same table
+    one_site = assess_sites(grid, sites, heights=[90, 120], turbines=[turbine], max_elements=1)
+    np.testing.assert_allclose(one_site["aep [kWh]"], out["aep [kWh]"])
+    float32 = WindGrid(grid.times, lats, lons, grid.variables, grid.values.astype(np.float32))
+    np.testing.assert_allclose(assess_sites(float32, sites, [90, 120], [turbine])["k"],
+                               out["k"], rtol=1e-5)
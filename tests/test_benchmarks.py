@@ -0,0 +1,39 @@
+# tests/test_benchmarks.py
+
+import sys, os
+import json
+import numpy as np
+import xarray as xr
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "benchmarks")))
+
+from synthetic import write_era5, write_power_curve
+import run_benchmarks
+
+
+def test_synthetic_files_are_era5_like(tmp_path):
+    paths = write_era5(tmp_path, 48, n_lat=3, n_lon=2, n_files=2)
+    assert len(paths) == 2
+    ds = xr.concat([xr.open_dataset(p) for p in paths], "valid_time")
+    assert set(ds.data_vars) == {"u10", "v10", "u100", "v100"}
+    assert ds["u10"].dtype == np.float32
+    assert ds.sizes == {"valid_time": 48, "latitude": 3, "longitude": 2}
+    assert np.all(np.diff(ds["latitude"].values) < 0)
+
+    curve = np.loadtxt(write_power_curve(tmp_path / "curve.csv"), delimiter=",", skiprows=1)
+    assert curve.shape[1] == 5
+    assert curve[-1, 1] == 5000
+
+
+def test_run_writes_every_stage(tmp_path):
+    output = tmp_path / "bench.json"
+    results = run_benchmarks.run(["tiny"], str(output), repeat=1)
+    stages = [r["stage"] for r in results["results"]]
+    assert stages == ["nc_reader", "wind_speed_df", "nc_sorter", "interpolation",
+                      "compute_power_law", "fit_weibull", "compute_aep"]
+    with open(output, encoding="utf-8") as f:
+        saved = json.load(f)
+    assert all(r["time [s]"] > 0 for r in saved["results"])
+
+    ratios = run_benchmarks.compare(output, output)
+    assert all(r["time ratio"] == 1 for r in ratios)
@@ -0,0 +1,91 @@
+# tests/test_cache.py
+
+import sys, os
+import numpy as np
+import pandas as pd
+import xarray as xr
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import WindCache, WindGrid, load_wind_grid, nc_reader, wind_speed_df
+
+
+@pytest.fixture
+def nc_files(tmp_path):
+    times = pd.date_range("2000-01-01", periods=6, freq="h")
+    rng = np.random.default_rng(5)
+    ds = xr.Dataset(
+        {name: (("valid_time","latitude","longitude"), rng.normal(size=(6,2,3)).astype("float32"))
+         for name in ["u10", "v10", "u100", "v100"]},
+        coords={"valid_time": times, "latitude": [8.0, 7.75], "longitude": [55.25, 55.5, 55.75]}
+    )
+    paths = []
+    for i, part in enumerate([slice(0, 3), slice(3, 6)]):
+        path = tmp_path/f"part{i}.nc"; ds.isel(valid_time=part).to_netcdf(path)
+        paths.append(str(path))
+    return paths
+
+
+def test_load_wind_grid_matches_wind_speed_df(nc_files):
+    grid = load_wind_grid(nc_files)
+    reference = WindGrid.from_dataframe(wind_speed_df(nc_reader(nc_files)))
+    i, j = grid.index(7.75, 55.5)
+    for height in (10, 100):
+        name = f"wind_speed_{height}m [m/s]"
+        np.testing.assert_allclose(grid.series(7.75, 55.5, name),
+                                   reference.series(7.75, 55.5, name), rtol=1e-6, atol=1e-4)
+        np.testing.assert_allclose(grid.direction(height)[i, j],
+                                   reference.series(7.75, 55.5, f"wind_direction_{height}m [degrees]"),
+                                   rtol=1e-6, atol=1e-4)
+
+
+def test_cache_roundtrip_and_invalidation(nc_files, tmp_path):
+    cache_dir = str(tmp_path/"cache")
+    first = load_wind_grid(nc_files, cache_dir=cache_dir)
+    second = load_wind_grid(nc_files, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 1
+    # entries are readable by others, not private like a fresh mkdtemp
+    entry = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+    assert os.stat(entry).st_mode & 0o777 == 0o755
+    # cached grids are memory-mapped from disk
+    assert isinstance(second.values.base, np.memmap) or isinstance(second.values, np.memmap)
+    np.testing.assert_array_equal(first.values, second.values)
+    np.testing.assert_array_equal(first.times, second.times)
+
+    # a different site window is a separate entry
+    load_wind_grid(nc_files, site=(7.9, 55.3), cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+
+    # touching a source file makes the entry stale; it is replaced, not kept
+    old_key = WindCache(cache_dir).key(nc_files, site=None, margin=0,
+                                       fields="speed_uv_10_100")
+    stat = os.stat(nc_files[0])
+    os.utime(nc_files[0], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    load_wind_grid(nc_files, cache_dir=cache_dir)
+    entries = os.listdir(cache_dir)
+    assert len(entries) == 2 and old_key not in entries
+
+
+def test_cache_lru_eviction(nc_files, tmp_path):
+    cache = WindCache(str(tmp_path/"lru"), max_entries=2)
+    grid = load_wind_grid(nc_files)
+    for n in range(3):
+        cache.save(cache.key(nc_files, n=n), grid, nc_files, n=n)
+    assert sorted(os.listdir(cache.cache_dir)) == sorted(
+        [cache.key(nc_files, n=1), cache.key(nc_files, n=2)])
+    assert cache.load(cache.key(nc_files, n=0)) is None
+
+
+def test_cache_load_from_read_only_entry(nc_files, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path/"cache")
+    first = load_wind_grid(nc_files, cache_dir=cache_dir)
+    entry = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+    os.chmod(os.path.join(entry, "meta.json"), 0o444)
+
+    # as another user than the writer; root could touch the file regardless
+    def denied(*args, **kwargs):
+        raise PermissionError(13, "Permission denied")
+    monkeypatch.setattr(os, "utime", denied)
+    again = load_wind_grid(nc_files, cache_dir=cache_dir)
+    np.testing.assert_array_equal(first.values, again.values)
@@ -0,0 +1,57 @@
+# tests/test_cli.py
+
+import sys, os
+import json
+import subprocess
+import numpy as np
+import pandas as pd
+import xarray as xr
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import cli
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def test_import_skips_plotting_and_xarray():
+    code = ("import sys, src; print(sorted(m for m in ('matplotlib', 'windrose', 'xarray',"
+            " 'scipy.stats') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                         text=True, check=True).stdout
+    assert out.strip() == "[]"
+
+
+def test_run_writes_results_and_figures(tmp_path):
+    rng = np.random.default_rng(0)
+    shape = (24 * 20, 2, 2)
+    ds = xr.Dataset(
+        {name: (("valid_time", "latitude", "longitude"), rng.normal(5, 3, shape).astype("float32"))
+         for name in ("u10", "v10", "u100", "v100")},
+        coords={"valid_time": pd.date_range("2000-01-01", periods=shape[0], freq="h"),
+                "latitude": [8.0, 7.75], "longitude": [55.5, 55.75]})
+    ds.to_netcdf(tmp_path / "era5.nc")
+
+    config = {"files": [str(tmp_path / "era5.nc")], "site": [7.9, 55.6], "heights": [90, 120],
+              "turbines": [{"name": "5MW",
+                            "power_curve": os.path.join(ROOT, "inputs", "NREL_Reference_5MW_126.csv"),
+                            "rated_power": 5000, "v_in": 3.0, "v_rated": 11.4, "v_out": 25.0}],
+              "output_dir": str(tmp_path / "out")}
+    with open(tmp_path / "config.json", "w", encoding="utf-8") as f:
+        json.dump(config, f)
+
+    assert cli.main(["run", str(tmp_path / "config.json")]) == 0
+    results = pd.read_csv(tmp_path / "out" / "results.csv")
+    assert list(results["height [m]"]) == [90, 120]
+    assert (results["aep [kWh]"] > 0).all()
+    for name in ("weibull_90m.png", "wind_rose_120m.png", "wind_data.csv"):
+        assert (tmp_path / "out" / name).is_file()
+
+
+def test_aep_query_matches_compute_aep(capsys):
+    from src import compute_aep
+    curve = os.path.join(ROOT, "inputs", "NREL_Reference_5MW_126.csv")
+    cli.main(["aep", "--k", "2", "--A", "9", "--power-curve", curve])
+    turbine = cli.make_turbine({"power_curve": curve})
+    expected = compute_aep(turbine, 2, 9, turbine.v_in, turbine.v_out)
+    assert abs(float(capsys.readouterr().out) - expected) < 0.1
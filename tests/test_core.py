@@ -18,6 +18,7 @@ from src import (
     fit_weibull,
     plot_weibull,
     wind_rose,
+    memory_report,
 )
 
 
@@ -56,6 +57,72 @@ def test_nc_reader_and_wind_speed(sample_nc):
     assert pytest.approx(np.sqrt(13)) == df_ws["wind_speed_10m [m/s]"].iloc[0]
 
 
+@pytest.fixture
+def sample_nc_float32(sample_nc, tmp_path):
+    # the ERA5 inputs store the components as float32
+    paths = []
+    for n, path in enumerate(sample_nc):
+        with xr.open_dataset(path) as ds:
+            out = tmp_path/f"float32_{n}.nc"
+            ds.astype("float32").to_netcdf(out)
+        paths.append(str(out))
+    return paths
+
+
+def test_wind_speed_df_compact_float32_inputs(sample_nc_float32):
+    normal = wind_speed_df(nc_reader(sample_nc_float32))
+    compact = wind_speed_df(nc_reader(sample_nc_float32), compact=True)
+    for col in compact.columns[3:]:
+        np.testing.assert_allclose(compact[col], normal[col], rtol=1e-6)
+
+
+def test_wind_speed_df_compact(sample_nc):
+    normal = wind_speed_df(nc_reader(sample_nc))
+    raw = nc_reader(sample_nc)
+    compact = wind_speed_df(raw, compact=True)
+    assert list(compact.columns) == list(normal.columns)
+    # raw components are released from the input frame
+    assert not {"u10", "v10", "u100", "v100"} & set(raw.columns)
+    # a new frame, but over the data of the input's remaining columns
+    assert compact is not raw and set(compact.columns) == set(raw.columns)
+    assert np.shares_memory(compact["wind_speed_10m [m/s]"].to_numpy(),
+                            raw["wind_speed_10m [m/s]"].to_numpy())
+    for col in compact.columns[3:]:
+        assert compact[col].dtype == np.float32
+        np.testing.assert_allclose(compact[col], normal[col], rtol=1e-6)
+
+    report = memory_report(nc_reader=nc_reader(sample_nc), wind_speed_df=compact)
+    assert list(report.index) == ["nc_reader", "wind_speed_df"]
+    assert report.loc["wind_speed_df", "memory [MB]"] < report.loc["nc_reader", "memory [MB]"]
+
+
+def test_nc_reader_lazy_site_window(tmp_path):
+    times = pd.date_range("2000-01-01", periods=5, freq="h")
+    lats, lons = [8.25, 8.0, 7.75, 7.5], [55.25, 55.5, 55.75, 56.0]
+    rng = np.random.default_rng(1)
+    ds = xr.Dataset(
+        {name: (("valid_time","latitude","longitude"), rng.normal(size=(5,4,4)).astype("float32"))
+         for name in ["u10", "v10", "u100", "v100", "t2m"]},
+        coords={"valid_time": times, "latitude": lats, "longitude": lons}
+    )
+    paths = []
+    for i, part in enumerate([slice(0, 2), slice(2, 5)]):
+        path = tmp_path/f"part{i}.nc"; ds.isel(valid_time=part).to_netcdf(path)
+        paths.append(str(path))
+
+    cube = nc_reader(paths, lazy=True, site=(7.93, 55.65), time_chunk=2)
+    assert dict(cube.sizes) == {"valid_time": 5, "latitude": 2, "longitude": 2}
+    assert "t2m" not in cube
+    np.testing.assert_array_equal(cube["latitude"], [8.0, 7.75])
+    np.testing.assert_array_equal(cube["longitude"], [55.5, 55.75])
+    expected = ds["u100"].sel(latitude=[8.0, 7.75], longitude=[55.5, 55.75])
+    np.testing.assert_array_equal(cube["u100"].values, expected.values)
+
+    # A margin widens the window, clipped at the grid edge
+    wide = nc_reader(paths, lazy=True, site=(7.93, 55.65), margin=1)
+    assert dict(wide.sizes) == {"valid_time": 5, "latitude": 4, "longitude": 4}
+
+
 def test_nc_sorter_and_interpolation():
     times = pd.date_range("2000-01-01", periods=2, freq="h")  # fixed warning
     rows = []
@@ -0,0 +1,62 @@
+# tests/test_export.py
+
+import sys, os
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import read_table, write_table
+
+
+def _table(n=1000):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({"valid_time": pd.date_range("2000-01-01", periods=n, freq="h"),
+                         "wind_speed_at_90[m/s]": rng.weibull(2, n) * 9,
+                         "wind_direction_at_90 [deg]": rng.uniform(0, 360, n).astype("float32"),
+                         "sector": rng.integers(0, 12, n),
+                         "turbine": np.where(rng.random(n) < 0.5, "5MW", "15MW")})
+
+
+def test_netcdf_round_trip_keeps_columns_types_and_metadata(tmp_path):
+    df = _table()
+    path = str(tmp_path / "wind.nc")
+    assert write_table(path, df, chunk_size=300, latitude=7.93, height=90,
+                       heights=[90, 120]) == len(df)
+    back = read_table(path)
+    pd.testing.assert_frame_equal(back, df, check_dtype=False)
+    assert back["wind_direction_at_90 [deg]"].dtype == np.float32
+    assert back.attrs == {"latitude": 7.93, "height": 90, "heights": [90, 120]}
+    assert list(read_table(path, columns=["sector"]).columns) == ["sector"]
+
+
+def test_chunks_from_an_iterable_are_appended(tmp_path):
+    df = _table()
+    path = str(tmp_path / "chunks.nc")
+    assert write_table(path, (df.iloc[i:i + 250] for i in range(0, len(df), 250))) == len(df)
+    np.testing.assert_array_equal(read_table(path)["sector"], df["sector"])
+
+
+def test_arrow_round_trip(tmp_path):
+    pytest.importorskip("pyarrow")
+    df = _table()
+    path = str(tmp_path / "wind.arrow")
+    write_table(path, df, chunk_size=300, turbine="NREL_5MW")
+    back = read_table(path, columns=["valid_time", "sector"])
+    pd.testing.assert_frame_equal(back, df[["valid_time", "sector"]], check_dtype=False)
+    assert back.attrs["turbine"] == "NREL_5MW"
+
+
+def test_bool_and_missing_strings_round_trip(tmp_path):
+    df = pd.DataFrame({"available": [True, False, True],
+                       "turbine": ["5MW", None, ""],
+                       "aep [kWh]": [1.0, np.nan, 3.0]})
+    path = str(tmp_path / "flags.nc")
+    write_table(path, df)
+    back = read_table(path)
+    assert back["available"].dtype == bool
+    assert back["available"].tolist() == [True, False, True]
+    assert back["turbine"].iloc[0] == "5MW" and back["turbine"].iloc[2] == ""
+    assert pd.isna(back["turbine"].iloc[1])
+    assert np.isnan(back["aep [kWh]"].iloc[1])
@@ -0,0 +1,57 @@
+# tests/test_farm.py
+
+import sys, os
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import WindFarm, WindTurbine, JointHistogram, read_thrust_curve, timeseries_aep
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+CURVE = os.path.join(ROOT, "inputs", "NREL_Reference_5MW_126.csv")
+
+
+@pytest.fixture
+def turbine():
+    power_curve = pd.read_csv(CURVE).iloc[:, :2].to_numpy()
+    return WindTurbine(126, 90, 5000, 3.0, 11.4, 25.0, power_curve, "5MW")
+
+
+def test_thrust_curves_from_csv(tmp_path):
+    ct = read_thrust_curve(CURVE)
+    assert ct[0, 0] == 3 and ct.shape[1] == 2
+    # the 15 MW file has no Ct column: Ct follows from Cp by momentum theory
+    ct15 = read_thrust_curve(os.path.join(ROOT, "inputs", "NREL_Reference_15MW_240.csv"))
+    assert np.all((ct15[:, 1] >= 0) & (ct15[:, 1] <= 8 / 9))
+    a = (1 - np.sqrt(1 - ct15[1, 1])) / 2
+    cp = pd.read_csv(os.path.join(ROOT, "inputs", "NREL_Reference_15MW_240.csv")).iloc[1, 2]
+    assert 4 * a * (1 - a) ** 2 == pytest.approx(cp, rel=1e-6)
+
+
+def test_jensen_deficit_of_two_turbines(turbine):
+    farm = WindFarm([0, 630], [0, 0], turbine, read_thrust_curve(CURVE))
+    speeds = farm.effective_speeds(np.array([8.0, 8.0, 8.0]), np.array([270.0, 90.0, 0.0]))
+    ct = np.interp(8.0, *read_thrust_curve(CURVE).T)
+    expected = 8 * (1 - (1 - np.sqrt(1 - ct)) * (63 / (63 + 0.04 * 630)) ** 2)
+    np.testing.assert_allclose(speeds, [[8, expected], [expected, 8], [8, 8]])
+
+
+def test_farm_aep(turbine):
+    rng = np.random.default_rng(0)
+    speeds = 9 * rng.weibull(2, 5000)
+    directions = rng.uniform(0, 360, 5000)
+    x, y = np.meshgrid(np.arange(3) * 800.0, np.arange(3) * 800.0)
+    farm = WindFarm(x.ravel(), y.ravel(), turbine, read_thrust_curve(CURVE))
+
+    summary, per_turbine = farm.aep(speeds, directions, chunk_size=700)
+    times = pd.date_range("2000-01-01", periods=5000, freq="h")
+    single = timeseries_aep(turbine, times, speeds)[0].loc["5MW", "aep [kWh]"]
+    assert summary["gross aep [kWh]"] == pytest.approx(9 * single)
+    assert 0 < summary["wake loss [%]"] < 30
+    # the centre turbine is waked from every direction
+    assert per_turbine["wake loss [%]"].idxmax() == 4
+
+    binned = farm.aep_histogram(JointHistogram.from_series(speeds, directions, n_sectors=36))[0]
+    assert binned["net aep [kWh]"] == pytest.approx(summary["net aep [kWh]"], rel=0.02)
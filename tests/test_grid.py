@@ -0,0 +1,131 @@
+# tests/test_grid.py
+
+import sys, os
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import WindGrid, bilinear_weights, nc_sorter, interpolation
+
+
+@pytest.fixture
+def long_df():
+    # ERA5-like long table on the 2x2 grid used by examples/main.py
+    times = pd.date_range("2000-01-01", periods=4, freq="h")
+    rows = []
+    for lat in [8.0, 7.75]:
+        for lon in [55.5, 55.75]:
+            for n, t in enumerate(times):
+                rows.append({
+                    "valid_time": t,
+                    "latitude": lat,
+                    "longitude": lon,
+                    "wind_speed_10m [m/s]": lat + lon + n,
+                    "wind_speed_100m [m/s]": 2 * (lat + lon) + n,
+                    "wind_direction_10m [degrees]": 10.0 + n,
+                    "wind_direction_100m [degrees]": 20.0 + n
+                })
+    # shuffled, like an unsorted reader output
+    return pd.DataFrame(rows).sample(frac=1, random_state=0).reset_index(drop=True)
+
+
+def test_grid_from_dataframe(long_df):
+    grid = WindGrid.from_dataframe(long_df)
+    assert grid.shape == (2, 2, 4)
+    assert grid.variables[0] == "wind_speed_10m [m/s]"
+
+    series = grid.series(8.0, 55.75, "wind_speed_100m [m/s]")
+    np.testing.assert_allclose(series, 2 * (8.0 + 55.75) + np.arange(4))
+    # grid point series are views into the grid, not copies
+    assert np.shares_memory(series, grid.values)
+    assert series.flags["C_CONTIGUOUS"]
+
+    with pytest.raises(KeyError):
+        grid.index(9.0, 55.5)
+
+
+def test_nc_sorter_tables_match_grid(long_df):
+    tables = nc_sorter(long_df)
+    assert set(tables) == {"lat_7.75_lon_55.5", "lat_7.75_lon_55.75",
+                           "lat_8.0_lon_55.5", "lat_8.0_lon_55.75"}
+    table = tables["lat_8.0_lon_55.5"]
+    assert table["valid_time"].is_monotonic_increasing
+    grid = WindGrid.from_dataframe(long_df)
+    np.testing.assert_allclose(table["wind_speed_10m [m/s]"],
+                               grid.series(8.0, 55.5, "wind_speed_10m [m/s]"))
+
+    # interpolation gives the same result from the tables and from the grid
+    from_tables = interpolation(7.93, 55.65, tables)
+    from_grid = interpolation(7.93, 55.65, grid)
+    np.testing.assert_allclose(from_grid["wind_speed_100m [m/s]"],
+                               from_tables["wind_speed_100m [m/s]"])
+
+
+def test_bilinear_interpolation_many_sites():
+    # a field that is linear in lat and lon is reproduced exactly
+    lats = np.array([9.0, 8.5, 8.0, 7.5])      # descending, like ERA5
+    lons = np.array([55.0, 55.5, 56.0])
+    times = np.arange(3)
+    lat_g, lon_g = np.meshgrid(lats, lons, indexing="ij")
+    field = (2 * lat_g - lon_g)[..., None] + times
+    grid = WindGrid(times, lats, lons, ["a", "b"], np.stack([field, -field]))
+
+    site_lats = np.array([7.93, 8.6, 7.5])
+    site_lons = np.array([55.65, 55.1, 56.0])
+    out = grid.interpolate(site_lats, site_lons)
+    assert out.shape == (3, 2, 3)
+    expected = (2 * site_lats - site_lons)[:, None] + times
+    np.testing.assert_allclose(out[:, 0], expected)
+    np.testing.assert_allclose(out[:, 1], -expected)
+
+    lat_idx, lon_idx, weights = bilinear_weights(lats, lons, [7.93], [55.65])
+    assert set(lats[lat_idx[0]]) == {8.0, 7.5}
+    assert set(lons[lon_idx[0]]) == {55.5, 56.0}
+    assert pytest.approx(1.0) == weights.sum()
+
+
+def test_interpolation_multiple_sites(long_df):
+    grid = WindGrid.from_dataframe(long_df)
+    out = interpolation(np.array([7.8, 7.9]), np.array([55.6, 55.7]), grid)
+    assert len(out) == 2 * 4
+    assert list(out.columns[:3]) == ["latitude", "longitude", "valid_time"]
+    single = interpolation(7.9, 55.7, grid)
+    np.testing.assert_allclose(out["wind_speed_10m [m/s]"].to_numpy()[4:],
+                               single["wind_speed_10m [m/s]"])
+
+
+def test_directions_are_interpolated_as_vectors(long_df):
+    # wind from 350 and 10 degrees on either side of the site blends to north, not south
+    west = long_df["longitude"] == 55.5
+    long_df["wind_direction_10m [degrees]"] = np.where(west, 350.0, 10.0)
+    from_degrees = interpolation(7.875, 55.625, WindGrid.from_dataframe(long_df))
+
+    speed = long_df["wind_speed_10m [m/s]"].to_numpy()
+    theta = np.deg2rad(long_df["wind_direction_10m [degrees]"].to_numpy())
+    components = long_df.assign(**{"wind_u_10m [m/s]": -speed * np.sin(theta),
+                                   "wind_v_10m [m/s]": -speed * np.cos(theta),
+                                   "wind_u_100m [m/s]": 0.0, "wind_v_100m [m/s]": -1.0})
+    grid = WindGrid.from_dataframe(components.drop(columns=["wind_direction_10m [degrees]",
+                                                            "wind_direction_100m [degrees]"]))
+    from_vectors = interpolation(7.875, 55.625, grid)
+    for table in (from_degrees, from_vectors):
+        direction = table["wind_direction_10m [degrees]"].to_numpy()
+        np.testing.assert_allclose(np.minimum(direction, 360 - direction), 0, atol=1.0)
+    np.testing.assert_allclose(from_vectors["wind_direction_100m [degrees]"], 360)
+
+
+def test_interpolation_paths_agree():
+    # sites spread over many cells take the per-corner path, single sites the dense one
+    rng = np.random.default_rng(2)
+    lats, lons = np.linspace(10, 7, 7), np.linspace(54, 57, 7)
+    values = np.stack([rng.normal(8, 2, (7, 7, 20)), rng.uniform(0, 360, (7, 7, 20))])
+    grid = WindGrid(np.arange(20), lats, lons, ["speed", "direction [degrees]"], values)
+    site_lats, site_lons = rng.uniform(7, 10, 30), rng.uniform(54, 57, 30)
+    together = grid.interpolate(site_lats, site_lons)
+    for n in range(30):
+        alone = grid.interpolate(site_lats[n], site_lons[n])[0]
+        np.testing.assert_allclose(together[n, 0], alone[0])
+        difference = (together[n, 1] - alone[1] + 180) % 360 - 180
+        np.testing.assert_allclose(difference, 0, atol=1e-9)
@@ -0,0 +1,63 @@
+# tests/test_histogram.py
+
+import sys, os
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import JointHistogram, sector_weibull, fit_weibull_batch
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(1)
+    speeds = 8 * rng.weibull(2.2, (3, 5000))
+    directions = rng.uniform(0, 360, (3, 5000))
+    speeds[0, :10] = np.nan
+    return speeds, directions
+
+
+def test_counts_match_sector_and_speed_bins(series):
+    speeds, directions = series
+    hist = JointHistogram.from_series(speeds, directions, bin_width=1.0, max_speed=30)
+    assert hist.counts.shape == (3, 12, 30)
+    assert list(hist.total) == [4990, 5000, 5000]
+
+    freq, _, _ = sector_weibull(speeds, directions)
+    np.testing.assert_allclose(hist.sector_frequencies(), freq)
+    expected = np.histogram(speeds[1], bins=np.arange(31))[0]
+    np.testing.assert_array_equal(hist.counts[1].sum(axis=0), expected)
+
+
+def test_merge_equals_one_pass(series, tmp_path):
+    speeds, directions = series
+    whole = JointHistogram.from_series(speeds, directions)
+    first = JointHistogram.from_series(speeds[:, :2000], directions[:, :2000])
+    second = JointHistogram.from_series(speeds[:, 2000:], directions[:, 2000:])
+    np.testing.assert_array_equal(first.merge(second).counts, whole.counts)
+
+    whole.save(tmp_path / "hist.npz")
+    loaded = JointHistogram.load(tmp_path / "hist.npz")
+    np.testing.assert_array_equal(loaded.counts, whole.counts)
+    assert loaded.bin_width == whole.bin_width and loaded.n_sectors == 12
+
+    sites = whole.collapse()
+    assert sites.shape == () and sites.total == whole.total.sum()
+    with pytest.raises(ValueError):
+        whole.merge(JointHistogram((3,), n_sectors=8))
+
+
+def test_rose_table_and_weibull(series):
+    speeds, directions = series
+    hist = JointHistogram.from_series(speeds, directions)
+    table = hist.rose_table((0, 5, 10))
+    assert table.shape == (3, 12, 3)
+    np.testing.assert_allclose(table.sum(axis=(-2, -1)), 1)
+    np.testing.assert_allclose(table[1, :, 0].sum(), np.mean(speeds[1] < 5), atol=1e-12)
+
+    k, a = hist.weibull(by_sector=False)
+    k_raw, a_raw = fit_weibull_batch(speeds, "wasp")
+    np.testing.assert_allclose(k, k_raw, rtol=0.02)
+    np.testing.assert_allclose(a, a_raw, rtol=0.01)
+    assert hist.weibull()[0].shape == (3, 12)
@@ -0,0 +1,80 @@
+# tests/test_incremental.py
+
+import sys, os
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import (GeneralWindTurbine, WindGrid, WindStatistics, fit_weibull_batch,
+                 compute_power_law, interpolation, sector_weibull, weibull_aep)
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(12)
+    speeds = rng.weibull([[2.0], [2.6]], size=(2, 60000)) * [[7.0], [10.0]]
+    directions = rng.uniform(0, 360, size=(2, 60000))
+    times = pd.date_range("1997-01-01", periods=60000, freq="h").to_numpy()
+    return speeds, directions, times
+
+
+def test_incremental_update_equals_full(samples):
+    speeds, directions, times = samples
+    full = WindStatistics((2,)).update(speeds, directions, times)
+
+    first = WindStatistics((2,)).update(speeds[:, :40000], directions[:, :40000], times[:40000])
+    first.update(speeds[:, 40000:], directions[:, 40000:], times[40000:])
+    for name in ["count", "histogram", "sector_counts"]:
+        np.testing.assert_array_equal(getattr(first, name), getattr(full, name))
+    np.testing.assert_allclose(first.sums, full.sums)
+
+    # the same period cannot be added twice
+    with pytest.raises(ValueError):
+        first.update(speeds[:, :10], directions[:, :10], times[:10])
+
+    # merging statistics of separate periods gives the same result
+    a = WindStatistics((2,)).update(speeds[:, :40000], directions[:, :40000], times[:40000])
+    b = WindStatistics((2,)).update(speeds[:, 40000:], directions[:, 40000:], times[40000:])
+    np.testing.assert_array_equal(a.merge(b).histogram, full.histogram)
+
+
+def test_weibull_and_aep_from_statistics(samples, tmp_path):
+    speeds, directions, times = samples
+    stats = WindStatistics((2,), bin_width=0.25).update(speeds, directions, times)
+    for method in ["moments", "wasp"]:
+        k, a = stats.weibull(method)
+        np.testing.assert_allclose((k, a), fit_weibull_batch(speeds, method), rtol=5e-3)
+    freq, _, _ = sector_weibull(speeds, directions)
+    np.testing.assert_allclose(stats.sector_frequencies(), freq)
+
+    turbine = GeneralWindTurbine(126, 90, 5000, 3.0, 11.4, 25.0, "T")
+    k, a = stats.weibull()
+    np.testing.assert_allclose(stats.aep(turbine), weibull_aep(turbine, k, a))
+
+    path = tmp_path/"stats.npz"
+    stats.save(path)
+    loaded = WindStatistics.load(path)
+    np.testing.assert_array_equal(loaded.histogram, stats.histogram)
+    np.testing.assert_array_equal(loaded.periods, stats.periods)
+    np.testing.assert_allclose(loaded.weibull(), stats.weibull())
+
+
+def test_update_grid_matches_power_law():
+    rng = np.random.default_rng(13)
+    n = 500
+    u10 = rng.uniform(2, 12, size=(2, 2, n))
+    values = np.stack([u10, u10 * 1.2, rng.uniform(0, 360, (2, 2, n)),
+                       rng.uniform(0, 360, (2, 2, n))])
+    grid = WindGrid(pd.date_range("2000-01-01", periods=n, freq="h"), [8.0, 7.75],
+                    [55.5, 55.75], ["wind_speed_10m [m/s]", "wind_speed_100m [m/s]",
+                                    "wind_direction_10m [degrees]",
+                                    "wind_direction_100m [degrees]"], values)
+    stats = WindStatistics((2, 2, 2), heights=[90, 150]).update_grid(grid)
+    assert stats.count[0, 1, 0] == n
+
+    at_point = compute_power_law(interpolation(8.0, 55.75, grid), 150)
+    expected = WindStatistics((1,)).update(at_point["wind_speed_at_150[m/s]"].to_numpy()[None],
+                                           at_point["direction_at_150[degrees]"].to_numpy()[None])
+    np.testing.assert_allclose(stats.sums[0, 1, 1], expected.sums[0])
@@ -0,0 +1,53 @@
+# tests/test_ingest.py
+
+import sys, os
+import numpy as np
+import pandas as pd
+import xarray as xr
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import ingest_files, load_wind_grid
+
+
+@pytest.fixture
+def yearly_files(tmp_path):
+    times = pd.date_range("2000-01-01", periods=12, freq="h")
+    rng = np.random.default_rng(6)
+    ds = xr.Dataset(
+        {name: (("valid_time","latitude","longitude"), rng.normal(size=(12,3,3)).astype("float32"))
+         for name in ["u10", "v10", "u100", "v100"]},
+        coords={"valid_time": times, "latitude": [8.25, 8.0, 7.75],
+                "longitude": [55.25, 55.5, 55.75]}
+    )
+    paths = []
+    # written out of time order on purpose
+    for i, part in enumerate([slice(8, 12), slice(0, 3), slice(3, 8)]):
+        path = tmp_path/f"part{i}.nc"; ds.isel(valid_time=part).to_netcdf(path)
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_ingest_files_matches_serial_reader(yearly_files, workers):
+    site = (7.9, 55.6)
+    parallel = ingest_files(yearly_files, site=site, workers=workers)
+    # both readers order the files by valid_time, whatever order they are given in
+    ordered = load_wind_grid(yearly_files, site=site)
+
+    assert parallel.shape == (2, 2, 12)
+    assert np.all(np.diff(parallel.times) > np.timedelta64(0))
+    np.testing.assert_array_equal(parallel.times, ordered.times)
+    np.testing.assert_array_equal(parallel.values, ordered.values)
+    assert ordered.variables == parallel.variables
+
+
+def test_load_wind_grid_parallel_cache(yearly_files, tmp_path):
+    cache_dir = str(tmp_path/"cache")
+    first = load_wind_grid(yearly_files, cache_dir=cache_dir, workers=2)
+    entries = os.listdir(cache_dir)
+    assert len(entries) == 1
+    assert os.path.isfile(os.path.join(cache_dir, entries[0], "values.npy"))
+    again = load_wind_grid(yearly_files, cache_dir=cache_dir)
+    np.testing.assert_array_equal(first.values, again.values)
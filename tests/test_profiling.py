@@ -0,0 +1,65 @@
+# tests/test_profiling.py
+
+import sys, os
+import json
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import StageProfiler, profiled, fit_weibull, compute_power_law
+from src import profiling
+
+
+@profiled("outer")
+def outer(n):
+    inner(n)
+    return np.ones(n)
+
+
+@profiled("inner")
+def inner(n):
+    return pd.DataFrame({"x": np.zeros(n)})
+
+
+def test_disabled_calls_function_directly():
+    assert profiling._ACTIVE is None
+    assert outer(3).shape == (3,)
+
+
+def test_records_nested_stages(tmp_path):
+    seen = []
+    with StageProfiler(callback=seen.append) as profiler:
+        outer(100_000)
+        with profiler.stage("custom", rows=7):
+            pass
+    assert profiling._ACTIVE is None
+
+    report = profiler.report()
+    assert list(report["stage"]) == ["inner", "outer", "custom"]
+    assert list(report["depth"]) == [1, 0, 0]
+    assert list(report["rows"]) == [100_000, 100_000, 7]
+    # the DataFrame of the inner stage counts towards the outer peak
+    inner_peak, outer_peak = report["peak memory [MB]"][:2]
+    assert inner_peak > 0.7 and outer_peak >= inner_peak
+    assert [r["stage"] for r in seen] == ["inner", "outer", "custom"]
+
+    path = tmp_path / "profile.json"
+    profiler.to_json(path)
+    with open(path, encoding="utf-8") as f:
+        assert len(json.load(f)["stages"]) == 3
+
+
+def test_pipeline_functions_are_instrumented():
+    table = pd.DataFrame({
+        "valid_time": pd.date_range("2000-01-01", periods=4, freq="h"),
+        "wind_speed_10m [m/s]": [5.0, 6, 7, 8], "wind_speed_100m [m/s]": [6.0, 7, 8, 9],
+        "wind_direction_10m [degrees]": [0.0] * 4, "wind_direction_100m [degrees]": [10.0] * 4,
+    })
+    with StageProfiler(memory=False) as profiler:
+        speeds = compute_power_law(table, 90)["wind_speed_at_90[m/s]"]
+        fit_weibull(speeds)
+    summary = profiler.summary()
+    assert list(summary.index) == ["compute_power_law", "fit_weibull"]
+    assert profiler.records[0]["rows"] == 4
+    assert profiler.records[0]["peak memory [MB]"] is None
@@ -0,0 +1,61 @@
+# tests/test_sectors.py
+
+import sys, os
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import (GeneralWindTurbine, fit_weibull_batch, fit_weibull_grouped, weibull_aep,
+                 sector_index, sector_weibull, sector_aep)
+
+
+def test_sector_index():
+    out = sector_index([0, 14.9, 15, 359, 180, np.nan], n_sectors=12)
+    np.testing.assert_array_equal(out, [0, 0, 1, 0, 6, -1])
+
+
+def test_fit_weibull_grouped_matches_batch():
+    rng = np.random.default_rng(9)
+    data = rng.weibull(2.0, size=(2, 3000)) * 8
+    groups = np.repeat([[0], [1]], 3000, axis=1)
+    for method in ["mle", "moments", "wasp"]:
+        np.testing.assert_allclose(fit_weibull_grouped(data, groups, 2, method),
+                                   fit_weibull_batch(data, method), rtol=1e-9)
+
+
+def test_sector_weibull_and_aep():
+    rng = np.random.default_rng(10)
+    n = 40000
+    # two series; winds from the west are stronger than from the east
+    directions = rng.choice([90.0, 270.0], p=[0.25, 0.75], size=(2, n))
+    scale = np.where(directions == 270.0, 10.0, 5.0)
+    speeds = rng.weibull(2.0, size=(2, n)) * scale
+    speeds[1, :100] = np.nan
+
+    freq, k, a = sector_weibull(speeds, directions, n_sectors=4)
+    assert freq.shape == k.shape == a.shape == (2, 4)
+    np.testing.assert_allclose(freq[:, [1, 3]], [[0.25, 0.75]] * 2, atol=0.01)
+    assert np.all(freq[:, [0, 2]] == 0) and np.all(np.isnan(k[:, [0, 2]]))
+    np.testing.assert_allclose(a[:, [1, 3]], [[5.0, 10.0]] * 2, rtol=0.02)
+    np.testing.assert_allclose(k[:, [1, 3]], 2.0, rtol=0.03)
+
+    turbine = GeneralWindTurbine(126, 90, 5000, 3.0, 11.4, 25.0, "T")
+    aep = sector_aep([turbine], freq, k, a)
+    assert aep.shape == (1, 2)
+    expected = 0.25 * weibull_aep(turbine, 2.0, 5.0) + 0.75 * weibull_aep(turbine, 2.0, 10.0)
+    assert pytest.approx(expected, rel=0.03) == aep[0, 0]
+
+
+def test_sector_aep_skips_sectors_that_cannot_be_fitted():
+    rng = np.random.default_rng(11)
+    speeds = rng.weibull(2.0, size=10000) * 8
+    directions = np.full(10000, 270.0)
+    directions[0] = 90.0  # a single sample cannot be fitted
+    freq, k, a = sector_weibull(speeds, directions, n_sectors=4)
+    assert freq[1] > 0 and np.isnan(k[1])
+
+    turbine = GeneralWindTurbine(126, 90, 5000, 3.0, 11.4, 25.0, "T")
+    aep = sector_aep(turbine, freq, k, a)
+    assert aep == pytest.approx(weibull_aep(turbine, k[3], a[3]))
+    assert np.isnan(sector_aep(turbine, [0.0, 1.0], [np.nan, np.nan], [np.nan, np.nan]))
@@ -0,0 +1,96 @@
+# tests/test_service.py
+
+import sys, os
+import asyncio
+import json
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import WindGrid, GeneralWindTurbine, assess_sites
+from src.service import WindService
+
+
+@pytest.fixture
+def grid():
+    rng = np.random.default_rng(0)
+    times = pd.date_range("2000-01-01", periods=2000, freq="h").values
+    names = ["wind_speed_10m [m/s]", "wind_speed_100m [m/s]"]
+    values = np.empty((2, 2, 2, times.size))
+    values[0] = 6 * rng.weibull(2, (2, 2, times.size))
+    values[1] = values[0] * 1.2
+    return WindGrid(times, np.array([8.0, 7.75]), np.array([55.5, 55.75]), names, values)
+
+
+@pytest.fixture
+def turbine():
+    return GeneralWindTurbine(126, 90, 5000, 3.0, 11.4, 25.0, "5MW")
+
+
+def test_concurrent_queries_are_batched_and_cached(grid, turbine):
+    service = WindService(grid, [turbine])
+
+    async def run():
+        queries = [service.query(7.8, 55.6 + 0.01 * n, 90, "5MW") for n in range(5)]
+        first = await asyncio.gather(*queries, service.query(7.8, 55.6, 90, "5MW"))
+        again = await service.query(7.8, 55.6, 90, "5MW")
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert service.stats["batches"] == 1
+    assert service.stats["cache_hits"] == 1
+    assert again is first[0]
+    expected = assess_sites(grid, [(7.8, 55.62)], [90], [turbine]).iloc[0]
+    assert first[2]["aep [kWh]"] == pytest.approx(expected["aep [kWh]"])
+    assert first[2]["k"] == pytest.approx(expected["k"])
+
+
+def test_http_requests(grid, turbine):
+    service = WindService(grid, {"5MW": turbine}, cache_size=1)
+
+    async def get(port, path):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, body = response.split(b"\r\n\r\n", 1)
+        return int(head.split()[1]), json.loads(body)
+
+    async def run():
+        server = await service.start(port=0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return [await get(port, path) for path in (
+                "/aep?lat=7.9&lon=55.6&height=100&turbine=5MW",
+                "/aep?lat=7.9&lon=55.7&height=100&turbine=5MW",
+                "/aep?lat=9&lon=55.6&turbine=5MW",
+                "/aep?lat=7.9&lon=55.6&turbine=3MW",
+                "/turbines", "/nothing")]
+
+    responses = asyncio.run(run())
+    assert [status for status, _ in responses] == [200, 200, 400, 400, 200, 404]
+    assert responses[0][1]["turbine"] == "5MW" and responses[0][1]["aep [kWh]"] > 0
+    assert responses[4][1] == {"turbines": ["5MW"]}
+    assert len(service._cache) == 1
+
+
+def test_failed_batch_fails_every_query(grid, turbine, monkeypatch):
+    service = WindService(grid, [turbine])
+
+    async def run(n):
+        queries = [service.query(7.8, 55.6 + 0.01 * i, 90, "5MW") for i in range(n)]
+        return await asyncio.wait_for(asyncio.gather(*queries, return_exceptions=True), 5)
+
+    # a table without one of the sites leaves that query unanswered
+    monkeypatch.setattr("src.service.assess_sites",
+                        lambda *args: assess_sites(*args).iloc[:1])
+    first, missing = asyncio.run(run(2))
+    assert first["aep [kWh]"] > 0 and isinstance(missing, KeyError)
+
+    # errors after assess_sites reach the callers instead of leaving them waiting
+    service = WindService(grid, [turbine])
+    monkeypatch.setattr("src.service.assess_sites", lambda *args: pd.DataFrame({"k": [2.0]}))
+    assert all(isinstance(result, KeyError) for result in asyncio.run(run(2)))
@@ -0,0 +1,76 @@
+# tests/test_shear.py
+
+import sys, os
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import compute_power_law, vertical_profile
+
+
+@pytest.fixture
+def table():
+    rng = np.random.default_rng(14)
+    u10 = rng.uniform(2, 10, 50)
+    return pd.DataFrame({
+        "valid_time": pd.date_range("2000-01-01", periods=50, freq="h"),
+        "wind_speed_10m [m/s]": u10,
+        "wind_speed_100m [m/s]": u10 * rng.uniform(1.0, 1.5, 50),
+        "wind_direction_10m [degrees]": rng.uniform(0, 360, 50),
+        "wind_direction_100m [degrees]": rng.uniform(0, 360, 50),
+    })
+
+
+def test_vertical_profile_power_law(table):
+    u1 = table["wind_speed_10m [m/s]"].to_numpy()
+    u2 = table["wind_speed_100m [m/s]"].to_numpy()
+    heights = np.array([10, 50, 100, 150])
+    out = vertical_profile(u1, u2, heights)
+    assert out.shape == (50, 4)
+    alpha = np.log(u2 / u1) / np.log(10)
+    np.testing.assert_allclose(out, u2[:, None] * (heights / 100) ** alpha[:, None])
+    np.testing.assert_allclose(out[:, 0], u1)
+
+    # one constant shear per series
+    mean = vertical_profile(np.stack([u1, u1]), np.stack([u2, u2]), heights, shear="mean")
+    assert mean.shape == (2, 50, 4)
+    profile = mean[0] / mean[0][:, [2]]
+    np.testing.assert_allclose(profile, np.broadcast_to(profile[0], profile.shape))
+
+    # calm at z1 still gives u2 at z2
+    np.testing.assert_array_equal(vertical_profile([0.], [6.], [100]), [[6.]])
+
+
+def test_vertical_profile_log_law(table):
+    u1 = table["wind_speed_10m [m/s]"].to_numpy()
+    u2 = table["wind_speed_100m [m/s]"].to_numpy()
+    out = vertical_profile(u1, u2, [10, 100, 150], method="log")
+    np.testing.assert_allclose(out[:, 0], u1)
+    np.testing.assert_allclose(out[:, 1], u2)
+    z0 = vertical_profile(u1, u2, [100, 150], method="log", z0=0.0002)
+    np.testing.assert_allclose(z0[:, 1], u2 * np.log(150 / 0.0002) / np.log(100 / 0.0002))
+    with pytest.raises(ValueError):
+        vertical_profile(u1, u2, [50], method="cubic")
+
+
+def test_compute_power_law_many_heights(table):
+    many = compute_power_law(table, [50, 90, 150])
+    assert list(many.columns) == ["valid_time",
+                                  "wind_speed_at_50[m/s]", "direction_at_50[degrees]",
+                                  "wind_speed_at_90[m/s]", "direction_at_90[degrees]",
+                                  "wind_speed_at_150[m/s]", "direction_at_150[degrees]"]
+    for height in [50, 90, 150]:
+        single = compute_power_law(table, height)
+        pd.testing.assert_frame_equal(single, many[single.columns])
+    np.testing.assert_allclose(many["direction_at_150[degrees]"],
+                               table["wind_direction_100m [degrees]"])
+
+
+def test_direction_profile_veers_along_the_shorter_arc():
+    from src import direction_profile
+    out = direction_profile([350.0, 10.0, 90.0], [10.0, 350.0, 270.0], [10, 55, 100, 150])
+    np.testing.assert_allclose(out[0], [350, 0, 10, 10])
+    np.testing.assert_allclose(out[1], [10, 0, 350, 350])
+    assert ((out >= 0) & (out < 360)).all()
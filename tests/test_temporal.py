@@ -0,0 +1,63 @@
+# tests/test_temporal.py
+
+import sys, os
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import TemporalStatistics, WindTurbine, timeseries_aep
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(3)
+    times = pd.date_range("2001-03-01", "2004-12-31 23:00", freq="h")
+    speeds = rng.weibull(2, times.size) * 9
+    speeds[rng.random(times.size) < 0.01] = np.nan
+    curve = np.column_stack((np.arange(0, 26.0), np.clip(np.arange(26.0) - 3, 0, 8) ** 3 * 9.77))
+    turbine = WindTurbine(126, 90, 5000, 3, 11, 25, curve, "test")
+    return times, speeds, turbine
+
+
+def test_profiles_match_groupby(series):
+    times, speeds, turbine = series
+    stats = TemporalStatistics.from_series(times, speeds, turbine)
+    df = pd.DataFrame({"u": speeds, "p": turbine.get_power(speeds)}, index=times)
+    df.loc[np.isnan(speeds), "p"] = np.nan
+
+    expected = df.groupby([times.month, times.hour])["u"].mean().unstack().to_numpy()
+    np.testing.assert_allclose(stats.diurnal_monthly("speed"), expected)
+    yearly = stats.yearly(min_coverage=0)
+    np.testing.assert_allclose(yearly["aep [kWh]"], 8760 * df.groupby(times.year)["p"].mean())
+    np.testing.assert_allclose(yearly["mean speed [m/s]"], df.groupby(times.year)["u"].mean())
+    assert yearly.loc[2001, "coverage"] < 0.9 and yearly.loc[2002, "coverage"] > 0.98
+    assert np.isnan(stats.yearly().loc[2001, "aep [kWh]"])
+
+    monthly = df["p"].resample("MS").agg(["sum", "count"])
+    rolling = 8760 * monthly["sum"].rolling(12).sum() / monthly["count"].rolling(12).sum()
+    np.testing.assert_allclose(stats.rolling_aep()["aep [kWh]"], rolling.dropna())
+
+    # the energy matrix of a complete record is the AEP of timeseries_aep
+    full = TemporalStatistics.from_series(times[times.year > 2001], speeds[times.year > 2001],
+                                          turbine)
+    aep = timeseries_aep(turbine, times[times.year > 2001], speeds[times.year > 2001])[0]
+    assert abs(full.diurnal_monthly("energy").sum() / aep["aep [kWh]"].iloc[0] - 1) < 0.01
+
+
+def test_updates_and_sites_add_up(series):
+    times, speeds, turbine = series
+    both = TemporalStatistics.from_series(times, np.stack([speeds, speeds + 1]), turbine)
+    stats = TemporalStatistics((), turbine)
+    half = times.size // 2
+    stats.update(times[half:], speeds[half:]).update(times[:half], speeds[:half])
+    np.testing.assert_array_equal(stats.count, both.count[0])
+    np.testing.assert_allclose(stats.power_sum, both.power_sum[0])
+    assert both.yearly().index.names == ["series_0", "year"]
+    assert both.diurnal_monthly().shape == (2, 12, 24)
+
+    shifted = TemporalStatistics.from_series(times, speeds, utc_offset=1)
+    np.testing.assert_allclose(shifted.diurnal_monthly()[5, 1:], stats.diurnal_monthly()[5, :-1])
+    with pytest.raises(ValueError):
+        shifted.rolling_aep()
@@ -8,6 +8,7 @@ import pytest
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src import GeneralWindTurbine, WindTurbine, TurbineParameters, plot_power_curve, compute_aep
+from src import CurveTable, TurbineRegistry
 
 
 def test_general_turbine_get_power():
@@ -20,6 +21,20 @@ def test_general_turbine_get_power():
     assert gt.get_power(30.0) == 0
 
 
+def test_general_turbine_get_power_array():
+    gt = GeneralWindTurbine(100, 90, 1000, v_in=3, v_rated=12, v_out=25)
+    speeds = np.array([0.0, 2.999, 3.0, 6.0, 11.999, 12.0, 20.0, 25.0, 25.001, np.nan])
+    out = gt.get_power(speeds)
+    assert out.shape == speeds.shape
+    scalar = [gt.get_power(v) for v in speeds[:7]]
+    np.testing.assert_allclose(out[:7], scalar)
+    assert out[7] == 1000     # cut-out speed itself still produces rated power
+    assert out[8] == 0
+    assert np.isnan(out[9])
+    # works on 2-D arrays of samples too
+    assert gt.get_power(speeds[:8].reshape(2, 4)).shape == (2, 4)
+
+
 def test_wind_turbine_interpolation():
     curve = np.array([[0,0],[10,100],[20,200]])
     wt = WindTurbine(100, 90, 200, v_in=0, v_rated=10, v_out=20, power_curve_data=curve)
@@ -62,3 +77,38 @@ def test_plot_power_curve_and_aep():
 
     aep = compute_aep(Const(), k=2.0, a=8.0, u_in=0.0, u_out=np.inf)
     assert pytest.approx(8760, rel=1e-6) == aep
+
+
+def test_curve_table_matches_interp():
+    rng = np.random.default_rng(0)
+    speeds = np.array([3.0, 4.0, 5.5, 7.3, 12.0, 25.0])
+    values = rng.uniform(0, 100, speeds.size)
+    table = CurveTable(speeds, values)
+    assert table.exact
+    u = np.r_[rng.uniform(-2, 30, 1000), np.nan]
+    expected = np.interp(u, speeds, values)
+    np.testing.assert_allclose(table(u), expected, atol=1e-9)
+    assert np.isnan(table(u)[-1])
+    assert table(7.3) == pytest.approx(values[3])
+
+    both = CurveTable([speeds, [0.0, 30.0]], [values, [0.0, 30.0]])
+    np.testing.assert_allclose(both(u[:-1]), [expected[:-1], u[:-1].clip(0, 30)], atol=1e-9)
+
+
+def test_registry_evaluates_many_turbines():
+    inputs = os.path.join(os.path.dirname(__file__), "..", "inputs")
+    registry = TurbineRegistry().register_directory(inputs)
+    assert registry.names == ["NREL_Reference_15MW_240", "NREL_Reference_5MW_126"]
+
+    u = np.linspace(0, 30, 500)
+    power = registry.evaluate(u)
+    assert power.shape == (2, 500)
+    turbine = registry.turbine("NREL_Reference_5MW_126")
+    np.testing.assert_allclose(power[1], turbine.get_power(u))
+    assert (turbine.v_in, turbine.v_out) == (3.0, 25.0)
+    assert registry.table("NREL_Reference_5MW_126") is turbine.lookup  # compiled once
+
+    ct = registry.evaluate(u, ["NREL_Reference_5MW_126"], kind="ct")
+    assert ct.shape == (1, 500) and ct.max() > 1
+    with pytest.raises(KeyError):
+        registry.data("NREL_Reference_15MW_240", kind="ct")
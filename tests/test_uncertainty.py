@@ -0,0 +1,53 @@
+# tests/test_uncertainty.py
+
+import sys, os
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import GeneralWindTurbine, bootstrap_aep, fit_weibull_batch, timeseries_aep, weibull_aep
+
+
+@pytest.fixture
+def series():
+    times = pd.date_range("2000-01-01", "2005-12-31 23:00", freq="h")
+    rng = np.random.default_rng(3)
+    # every year has its own mean speed, so the years differ
+    scale = 9 + rng.normal(0, 0.4, 6)[times.year - 2000]
+    speeds = scale * rng.weibull(2.1, times.size)
+    speeds[:50] = np.nan
+    return times, speeds
+
+
+@pytest.fixture
+def turbine():
+    return GeneralWindTurbine(126, 90, 5000, 3.0, 11.4, 25.0, "5MW")
+
+
+def test_point_estimates_match_full_series(series, turbine):
+    times, speeds = series
+    summary, samples = bootstrap_aep(turbine, times, speeds, n_resamples=200,
+                                     estimator="timeseries", seed=1)
+    expected = timeseries_aep(turbine, times, speeds)[0].loc["5MW", "aep [kWh]"]
+    assert summary.loc["5MW", "aep [kWh]"] == pytest.approx(expected)
+    assert samples.shape == (1, 200)
+
+    summary, _ = bootstrap_aep(turbine, times, speeds, n_resamples=10, method="moments")
+    k, a = fit_weibull_batch(speeds, "moments")
+    assert summary.loc["5MW", "aep [kWh]"] == pytest.approx(float(weibull_aep(turbine, k, a)))
+
+
+def test_percentiles_and_reproducibility(series, turbine):
+    times, speeds = series
+    summary, samples = bootstrap_aep([turbine], times, speeds, n_resamples=400, seed=7,
+                                     block="month", batch_size=150)
+    row = summary.loc["5MW"]
+    assert row["P90 [kWh]"] < row["P75 [kWh]"] < row["P50 [kWh]"]
+    assert np.mean(samples[0] >= row["P90 [kWh]"]) == pytest.approx(0.9, abs=0.01)
+    assert row["std [kWh]"] > 0
+
+    again, _ = bootstrap_aep([turbine], times, speeds, n_resamples=400, seed=7,
+                             block="month", batch_size=400, workers=2)
+    pd.testing.assert_frame_equal(summary, again)
@@ -0,0 +1,71 @@
+# tests/test_weibull.py
+
+import sys, os
+import numpy as np
+import pytest
+from scipy.special import gamma
+from scipy.stats import weibull_min
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src import fit_weibull, fit_weibull_batch, weibull_from_moments, weibull_from_energy
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(8)
+    data = rng.weibull([[1.7], [2.2], [3.1]], size=(3, 20000)) * [[5.0], [8.5], [11.0]]
+    data[0, ::7] = np.nan
+    return data
+
+
+def test_fit_weibull_matches_scipy(samples):
+    series = samples[1]
+    k_ref, _, a_ref = weibull_min.fit(series, floc=0)
+    k, a = fit_weibull(series)
+    assert isinstance(k, float)
+    assert pytest.approx(k_ref, rel=1e-4) == k
+    assert pytest.approx(a_ref, rel=1e-4) == a
+
+
+def test_fit_weibull_batch_matches_scipy():
+    rng = np.random.default_rng(3)
+    data = rng.weibull([[1.8], [2.4], [3.0]], size=(3, 2000)) * [[6.0], [8.0], [10.0]]
+    data[1, :100] = np.nan
+    k, a = fit_weibull_batch(data)
+    assert k.shape == a.shape == (3,)
+    for n in range(3):
+        series = data[n][~np.isnan(data[n])]
+        k_ref, _, a_ref = weibull_min.fit(series, floc=0)
+        assert pytest.approx(k_ref, rel=1e-4) == k[n]
+        assert pytest.approx(a_ref, rel=1e-4) == a[n]
+
+    # too few samples
+    k, a = fit_weibull_batch(np.array([[np.nan, 3.0, np.nan]]))
+    assert np.isnan(k[0]) and np.isnan(a[0])
+
+
+@pytest.mark.parametrize("method", ["mle", "moments", "wasp"])
+def test_fit_weibull_batch_methods(samples, method):
+    k, a = fit_weibull_batch(samples, method=method)
+    np.testing.assert_allclose(k, [1.7, 2.2, 3.1], rtol=0.05)
+    np.testing.assert_allclose(a, [5.0, 8.5, 11.0], rtol=0.02)
+    # a 3-D stack of series keeps its leading shape
+    k3, _ = fit_weibull_batch(samples[None, 1:], method=method)
+    assert k3.shape == (1, 2)
+
+
+def test_moment_estimators_are_exact():
+    k, a = np.array([1.5, 2.0, 3.5]), np.array([6.0, 9.0, 12.0])
+    mean = a * gamma(1 + 1 / k)
+    std = a * np.sqrt(gamma(1 + 2 / k) - gamma(1 + 1 / k) ** 2)
+    np.testing.assert_allclose(weibull_from_moments(mean, std), (k, a), rtol=1e-9)
+
+    mean_cube = a ** 3 * gamma(1 + 3 / k)
+    p_exceed = np.exp(-(mean / a) ** k)
+    np.testing.assert_allclose(weibull_from_energy(mean, mean_cube, p_exceed), (k, a), rtol=1e-9)
+
+
+def test_fit_weibull_batch_unknown_method(samples):
+    with pytest.raises(ValueError):
+        fit_weibull_batch(samples, method="lsq")